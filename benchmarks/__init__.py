@@ -0,0 +1,19 @@
+"""Local benchmarks for the Lambda handlers and the vendored libraries they use.
+
+Nothing in here talks to AWS: the handlers are driven against in-memory
+stand-ins for Cognito, Secrets Manager, DynamoDB and the JWKS endpoint, fed
+with synthetic user pools and tokens (see ``synthetic.py`` and ``fakes.py``).
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HANDLER_DIR = os.path.join(ROOT, "lambda")
+LAYER_DIR = os.path.join(ROOT, "lambda_layer", "python")
+
+
+def use_handler_paths(layer_dir=None):
+    """Make the handler modules and the layer packages importable, as in Lambda."""
+    for path in (layer_dir or LAYER_DIR, HANDLER_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
@@ -0,0 +1,72 @@
+"""Compare two benchmark reports and flag regressions.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.10
+
+Results are matched on their scenario; the exit status is 1 when any tracked
+metric got slower than the threshold allows.
+"""
+import argparse
+import json
+import sys
+
+TRACKED = (
+    ("cold", "total_ms"),
+    ("warm", "p50_ms"),
+    ("warm", "p95_ms"),
+    ("warm", "p99_ms"),
+)
+
+LABEL_KEYS = ("handler", "name", "users", "reuse_ratio", "memory_mb")
+
+
+def scenario_key(result):
+    return json.dumps(result["scenario"], sort_keys=True)
+
+
+def lookup(result, path):
+    value = result
+    for part in path:
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def compare(baseline, candidate, threshold):
+    """Yield ``(scenario, metric, old, new, change, regressed)`` rows."""
+    old_results = {scenario_key(result): result for result in baseline["results"]}
+    for result in candidate["results"]:
+        previous = old_results.get(scenario_key(result))
+        if previous is None:
+            continue
+        for path in TRACKED:
+            old, new = lookup(previous, path), lookup(result, path)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            yield result["scenario"], ".".join(path), old, new, change, change > threshold
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown tolerated before flagging (default 10%%).")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as old, open(args.candidate) as new:
+        baseline, candidate = json.load(old), json.load(new)
+
+    print(f"baseline {baseline['meta'].get('commit')} -> candidate {candidate['meta'].get('commit')}")
+    regressed = False
+    for scenario, metric, old, new, change, flagged in compare(baseline, candidate, args.threshold):
+        regressed = regressed or flagged
+        label = " ".join(f"{key}={scenario[key]}" for key in LABEL_KEYS if key in scenario)
+        print(f"{'REGRESSED' if flagged else 'ok':<9} {label:<48} {metric:<16} "
+              f"{old:10.3f} -> {new:10.3f} ({change:+.1%})")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""In-memory stand-ins for the AWS services and HTTP calls the handlers make.
+
+``install()`` patches ``boto3`` and ``requests`` so that importing and invoking
+the handlers in ``lambda/`` runs entirely in-process. Page sizes follow the
+real service limits so pagination costs show up in the measurements.
+"""
+import contextlib
+import copy
+import zlib
+from unittest import mock
+
+from botocore.exceptions import ClientError
+
+COGNITO_PAGE_SIZE = 60
+CLIENT_ID = "benchclientid"
+
+
+class FakeCognito:
+    def __init__(self, users, groups):
+        self.users = users
+        self.groups = {name: list(members) for name, members in groups.items()}
+        self._by_username = {user["Username"]: user for user in users}
+        self.calls = 0
+
+    def _page(self, items, token):
+        start = int(token or 0)
+        end = start + COGNITO_PAGE_SIZE
+        return items[start:end], (str(end) if end < len(items) else None)
+
+    def list_users(self, UserPoolId, PaginationToken=None, Limit=None, **kwargs):
+        self.calls += 1
+        page, token = self._page(self.users, PaginationToken)
+        response = {"Users": page}
+        if token:
+            response["PaginationToken"] = token
+        return response
+
+    def list_groups(self, UserPoolId, NextToken=None, Limit=None):
+        self.calls += 1
+        page, token = self._page(list(self.groups), NextToken)
+        response = {"Groups": [{"GroupName": name, "UserPoolId": UserPoolId} for name in page]}
+        if token:
+            response["NextToken"] = token
+        return response
+
+    def list_users_in_group(self, UserPoolId, GroupName, NextToken=None, Limit=None):
+        self.calls += 1
+        members = self.groups.get(GroupName, [])
+        page, token = self._page(members, NextToken)
+        response = {"Users": [self._by_username[name] for name in page]}
+        if token:
+            response["NextToken"] = token
+        return response
+
+    def admin_get_user(self, UserPoolId, Username):
+        self.calls += 1
+        user = self._by_username[Username]
+        return {"Username": Username, "UserAttributes": user["Attributes"]}
+
+    def admin_add_user_to_group(self, UserPoolId, Username, GroupName):
+        self.calls += 1
+        members = self.groups.setdefault(GroupName, [])
+        if Username not in members:
+            members.append(Username)
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+
+
+class FakeSecretsManager:
+    def get_secret_value(self, SecretId):
+        return {"Name": SecretId, "SecretString": CLIENT_ID}
+
+
+class FakeAPIGateway:
+    def __init__(self):
+        self.flushes = []
+
+    def flush_stage_cache(self, restApiId, stageName):
+        self.flushes.append((restApiId, stageName))
+        return {}
+
+
+class FakeLambda:
+    def __init__(self):
+        self.invocations = []
+
+    def invoke(self, FunctionName, InvocationType="RequestResponse", Payload=b""):
+        self.invocations.append((FunctionName, InvocationType, Payload))
+        return {"StatusCode": 202}
+
+
+class FakeTable:
+    # Primary key attribute of each table the handlers use.
+    KEY_ATTRIBUTES = ("userId", "statId")
+    # Items per Scan page; real pages stop at 1 MB.
+    SCAN_PAGE_SIZE = 100
+
+    def __init__(self, name):
+        self.name = name
+        self.items = {}
+        self.queries = 0
+        self.scans = 0
+
+    def _key(self, item):
+        return next(item[name] for name in self.KEY_ATTRIBUTES if name in item)
+
+    def put_item(self, Item, **kwargs):
+        self.items[self._key(Item)] = copy.deepcopy(Item)
+        return {}
+
+    def get_item(self, Key, **kwargs):
+        item = self.items.get(self._key(Key))
+        return {"Item": copy.deepcopy(item)} if item is not None else {}
+
+    def update_item(self, Key, UpdateExpression, ConditionExpression=None,
+                    ExpressionAttributeNames=None, ExpressionAttributeValues=None, **kwargs):
+        # Only "ADD" updates and attribute_exists() conditions, which is all
+        # the handlers use.
+        key = self._key(Key)
+        if ConditionExpression and ConditionExpression.startswith("attribute_exists") and key not in self.items:
+            raise ClientError(
+                {"Error": {"Code": "ConditionalCheckFailedException", "Message": "The conditional request failed"}},
+                "UpdateItem",
+            )
+        names = ExpressionAttributeNames or {}
+        item = self.items.setdefault(key, dict(Key))
+        assert UpdateExpression.startswith("ADD "), UpdateExpression
+        for clause in UpdateExpression[len("ADD "):].split(","):
+            name, placeholder = clause.split()
+            attribute, value = names.get(name, name), ExpressionAttributeValues[placeholder]
+            if isinstance(value, set):
+                item[attribute] = item.get(attribute, set()) | value
+            else:
+                item[attribute] = item.get(attribute, 0) + value
+        return {}
+
+    def scan(self, Segment=0, TotalSegments=1, ExclusiveStartKey=None, Limit=None, **kwargs):
+        self.scans += 1
+        keys = sorted(
+            key for key in self.items
+            if zlib.crc32(str(key).encode()) % TotalSegments == Segment
+        )
+        start = keys.index(self._key(ExclusiveStartKey)) + 1 if ExclusiveStartKey else 0
+        page = keys[start:start + (Limit or self.SCAN_PAGE_SIZE)]
+        items = self._project([copy.deepcopy(self.items[key]) for key in page], kwargs)
+        response = {"Items": items, "Count": len(items)}
+        if start + len(page) < len(keys):
+            last = self.items[page[-1]]
+            response["LastEvaluatedKey"] = {name: last[name] for name in self.KEY_ATTRIBUTES if name in last}
+        return response
+
+    def _project(self, items, kwargs):
+        if "ProjectionExpression" not in kwargs:
+            return items
+        names = kwargs.get("ExpressionAttributeNames", {})
+        wanted = [names.get(name.strip(), name.strip()) for name in kwargs["ProjectionExpression"].split(",")]
+        return [{k: v for k, v in item.items() if k in wanted} for item in items]
+
+    def query(self, KeyConditionExpression, IndexName=None, Limit=None, **kwargs):
+        # Only equality on a single key, which is all the handlers use.
+        self.queries += 1
+        key, value = KeyConditionExpression.get_expression()["values"]
+        matches = [copy.deepcopy(item) for item in self.items.values() if item.get(key.name) == value]
+        matches = self._project(matches, kwargs)
+        return {"Items": matches[:Limit], "Count": len(matches[:Limit])}
+
+
+class FakeDynamoDB:
+    def __init__(self):
+        self.tables = {}
+
+    def Table(self, name):
+        return self.tables.setdefault(name, FakeTable(name))
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+        self.status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        # requests decodes the body on every call, so hand out a fresh copy.
+        return copy.deepcopy(self._payload)
+
+
+class FakeAWS:
+    """Bundle of fakes shared by every client the handlers construct."""
+
+    def __init__(self, users, groups, jwks):
+        self.cognito = FakeCognito(users, groups)
+        self.secretsmanager = FakeSecretsManager()
+        self.apigateway = FakeAPIGateway()
+        self.awslambda = FakeLambda()
+        self.dynamodb = FakeDynamoDB()
+        self.jwks = jwks
+        self.jwks_fetches = 0
+
+    def client(self, service_name=None, *args, **kwargs):
+        service_name = service_name or args[0]
+        if service_name == "cognito-idp":
+            return self.cognito
+        if service_name == "secretsmanager":
+            return self.secretsmanager
+        if service_name == "apigateway":
+            return self.apigateway
+        if service_name == "lambda":
+            return self.awslambda
+        raise ValueError(f"No fake for service {service_name!r}")
+
+    def resource(self, service_name, *args, **kwargs):
+        if service_name == "dynamodb":
+            return self.dynamodb
+        raise ValueError(f"No fake for resource {service_name!r}")
+
+    def get(self, url, *args, **kwargs):
+        self.jwks_fetches += 1
+        return FakeResponse(self.jwks)
+
+
+class _FakeSession:
+    def __init__(self, aws):
+        self._aws = aws
+
+    def client(self, *args, **kwargs):
+        return self._aws.client(*args, **kwargs)
+
+    def resource(self, *args, **kwargs):
+        return self._aws.resource(*args, **kwargs)
+
+
+@contextlib.contextmanager
+def install(aws):
+    """Route boto3 clients/resources and ``requests.get`` to ``aws``."""
+    import boto3
+    import requests
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(mock.patch.object(boto3, "client", aws.client))
+        stack.enter_context(mock.patch.object(boto3, "resource", aws.resource))
+        stack.enter_context(
+            mock.patch.object(boto3.session, "Session", lambda *a, **kw: _FakeSession(aws))
+        )
+        stack.enter_context(mock.patch.object(requests, "get", aws.get))
+        yield aws
@@ -0,0 +1,85 @@
+"""Benchmark the three Lambda handlers against synthetic user pools.
+
+Each scenario runs in its own interpreter (see ``worker.py``) and the combined
+results are written to JSON, e.g.::
+
+    python -m benchmarks.handlers --users 1000 10000 100000 \\
+        --reuse-ratios 0 0.9 --output bench-handlers.json
+    python -m benchmarks.compare old.json bench-handlers.json
+"""
+import argparse
+import itertools
+import json
+import subprocess
+import sys
+
+from benchmarks import ROOT
+from benchmarks.report import write_report
+
+HANDLERS = ("fetch_users", "assign_role", "handler")
+
+
+def parse_group_fractions(value):
+    """Parse ``Admins=0.01,Devs=0.1,Users=0.6`` into a dict."""
+    fractions = {}
+    for part in value.split(","):
+        name, _, fraction = part.partition("=")
+        fractions[name.strip()] = float(fraction)
+    return fractions
+
+
+def run_scenario(scenario, python=sys.executable):
+    completed = subprocess.run(
+        [python, "-m", "benchmarks.worker", json.dumps(scenario)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Scenario {scenario} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--handlers", nargs="+", choices=HANDLERS, default=list(HANDLERS))
+    parser.add_argument("--users", nargs="+", type=int, default=[1000, 10000, 100000])
+    parser.add_argument("--group-fractions", type=parse_group_fractions, action="append",
+                        help="Group membership fractions, e.g. Admins=0.01,Devs=0.1,Users=0.6. "
+                             "Repeat to benchmark several distributions.")
+    parser.add_argument("--reuse-ratios", nargs="+", type=float, default=[0.0])
+    parser.add_argument("--invocations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--alloc-samples", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench-handlers.json",
+                        help="Where to write the JSON report ('-' for stdout).")
+    args = parser.parse_args(argv)
+
+    results = []
+    for handler, users, fractions, reuse_ratio in itertools.product(
+        args.handlers, args.users, args.group_fractions or [None], args.reuse_ratios
+    ):
+        scenario = {
+            "handler": handler,
+            "users": users,
+            "group_fractions": fractions,
+            "reuse_ratio": reuse_ratio,
+            "invocations": args.invocations,
+            "warmup": args.warmup,
+            "alloc_samples": args.alloc_samples,
+            "seed": args.seed,
+        }
+        result = run_scenario(scenario)
+        results.append(result)
+        print(
+            f"{handler:<12} users={users:<7} reuse={reuse_ratio:<4} "
+            f"cold={result['cold']['total_ms']:8.1f}ms "
+            f"p50={result['warm']['p50_ms']:8.3f}ms p95={result['warm']['p95_ms']:8.3f}ms "
+            f"p99={result['warm']['p99_ms']:8.3f}ms rss={result['peak_rss_kib'] / 1024:6.1f}MiB",
+            file=sys.stderr,
+        )
+
+    write_report(args.output, results, benchmark="handlers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Measure PyJWKClient lookup latency against a slow JWKS endpoint.
+
+Serves a JWK set from a local HTTP server that answers after ``--delay``
+seconds, then has ``--threads`` threads look up signing keys for
+``--duration`` seconds with a short cache lifespan, with and without
+stale-while-revalidate, and then has ``--tasks`` asyncio tasks do the same
+through ``AsyncPyJWKClient``::
+
+    python -m benchmarks.jwks_client --delay 0.05 0.5 --threads 8
+"""
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks import use_handler_paths
+from benchmarks.report import summarize, write_report
+
+use_handler_paths()
+
+import jwt  # noqa: E402
+from jwt.utils import base64url_encode  # noqa: E402
+
+JWKS = json.dumps({
+    "keys": [
+        {"kty": "oct", "kid": f"k{n}", "k": base64url_encode(f"benchmark-secret-{n}".encode()).decode()}
+        for n in range(4)
+    ]
+}).encode()
+
+
+def serve(delay):
+    """Start a JWKS endpoint answering after ``delay`` seconds; return (server, url, requests)."""
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(time.monotonic())
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(JWKS)))
+            self.end_headers()
+            self.wfile.write(JWKS)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/jwks.json", requests
+
+
+def run(url, threads, duration, lifespan, stale_while_revalidate):
+    client = jwt.PyJWKClient(url, lifespan=lifespan, stale_while_revalidate=stale_while_revalidate)
+    client.get_signing_key("k0")
+    samples = [[] for _ in range(threads)]
+    deadline = time.monotonic() + duration
+
+    def worker(out):
+        n = 0
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            client.get_signing_key(f"k{n % 4}")
+            out.append((time.perf_counter() - start) * 1000)
+            n += 1
+
+    workers = [threading.Thread(target=worker, args=(out,)) for out in samples]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return summarize([sample for out in samples for sample in out])
+
+
+def run_async(url, tasks, duration, lifespan):
+    async def scenario():
+        client = jwt.AsyncPyJWKClient(url, lifespan=lifespan, stale_while_revalidate=True)
+        await client.get_signing_key("k0")
+        samples = []
+        deadline = time.monotonic() + duration
+
+        async def worker(offset):
+            n = offset
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                await client.get_signing_key(f"k{n % 4}")
+                samples.append((time.perf_counter() - start) * 1000)
+                n += 1
+                # Yield as a real request handler would between verifications.
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(worker(n) for n in range(tasks)))
+        return summarize(samples)
+
+    return asyncio.run(scenario())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--delay", type=float, nargs="+", default=[0.05, 0.5],
+                        help="Seconds the endpoint takes to answer.")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--lifespan", type=float, default=1.0)
+    parser.add_argument("--output", default="bench-jwks-client.json")
+    args = parser.parse_args(argv)
+
+    results = []
+    for delay in args.delay:
+        server, url, requests = serve(delay)
+        result = {"scenario": {"delay_s": delay, "threads": args.threads,
+                               "duration_s": args.duration, "lifespan_s": args.lifespan}}
+        try:
+            for mode, swr in (("blocking", False), ("stale_while_revalidate", True)):
+                del requests[:]
+                result[mode] = run(url, args.threads, args.duration, args.lifespan, swr)
+                result[mode]["fetches"] = len(requests)
+                print(
+                    f"delay {delay:5.2f}s {mode:<22} p50 {result[mode]['p50_ms']:8.3f}ms "
+                    f"p99 {result[mode]['p99_ms']:8.3f}ms max {result[mode]['max_ms']:8.1f}ms "
+                    f"fetches {result[mode]['fetches']}",
+                    file=sys.stderr,
+                )
+            del requests[:]
+            result["async"] = run_async(url, args.tasks, args.duration, args.lifespan)
+            result["async"]["tasks"] = args.tasks
+            result["async"]["fetches"] = len(requests)
+            label = f"async ({args.tasks} tasks)"
+            print(
+                f"delay {delay:5.2f}s {label:<22} "
+                f"p50 {result['async']['p50_ms']:8.3f}ms p99 {result['async']['p99_ms']:8.3f}ms "
+                f"max {result['async']['max_ms']:8.1f}ms fetches {result['async']['fetches']}",
+                file=sys.stderr,
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+        results.append(result)
+
+    write_report(args.output, results, benchmark="jwks_client")
+
+
+if __name__ == "__main__":
+    main()
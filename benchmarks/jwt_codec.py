@@ -0,0 +1,84 @@
+"""Measure the base64url and JSON decoding cost of Cognito-sized tokens.
+
+Times the vendored ``jwt.utils.base64url_decode`` against the stdlib
+``base64.urlsafe_b64decode`` path it replaced, the JSON parser hook
+(``orjson`` when installed) against ``json.loads``, and a full
+``jwt.parse`` with header and payload access::
+
+    python -m benchmarks.jwt_codec --tokens 1000 --repeat 20
+"""
+import argparse
+import base64
+import json
+import random
+import sys
+import time
+
+from benchmarks import use_handler_paths
+from benchmarks.report import summarize, write_report
+from benchmarks.synthetic import make_token
+
+use_handler_paths()
+
+import jwt  # noqa: E402
+from jwt import utils  # noqa: E402
+
+
+def stdlib_base64url_decode(data):
+    """The implementation ``jwt.utils.base64url_decode`` had before."""
+    rem = len(data) % 4
+    if rem > 0:
+        data += b"=" * (4 - rem)
+    return base64.urlsafe_b64decode(data)
+
+
+def measure(fn, items, repeat):
+    """Per-item microseconds of ``fn`` over ``items``, one sample per pass."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        samples.append((time.perf_counter() - start) * 1000)
+    summary = summarize(samples)
+    summary["us_per_item"] = summary["p50_ms"] * 1000 / len(items)
+    return summary
+
+
+def parse_token(token):
+    parsed = jwt.parse(token)
+    return parsed.header, utils.json_loads(parsed.payload), parsed.signature
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", default="bench-jwt-codec.json")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    tokens = [make_token(f"user-{n}", ("Admins", "Devs"), rng=rng).encode() for n in range(args.tokens)]
+    segments = [segment for token in tokens for segment in token.split(b".")]
+    documents = [utils.base64url_decode(token.split(b".")[1]) for token in tokens]
+
+    result = {
+        "scenario": {
+            "tokens": args.tokens,
+            "token_bytes": sum(map(len, tokens)) // len(tokens),
+            "json_loads": f"{utils.json_loads.__module__}.{utils.json_loads.__name__}",
+        },
+        "base64url_stdlib": measure(stdlib_base64url_decode, segments, args.repeat),
+        "base64url": measure(utils.base64url_decode, segments, args.repeat),
+        "json_stdlib": measure(json.loads, documents, args.repeat),
+        "json_hook": measure(utils.json_loads, documents, args.repeat),
+        "parse": measure(parse_token, tokens, args.repeat),
+    }
+    for name in ("base64url_stdlib", "base64url", "json_stdlib", "json_hook", "parse"):
+        print(f"{name:<17} {result[name]['us_per_item']:7.2f}us", file=sys.stderr)
+
+    write_report(args.output, [result], benchmark="jwt_codec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Measure token decoding throughput in the vendored PyJWT.
+
+Compares a loop of ``jwt.decode``, the same loop with a precompiled
+``jwt.verifier`` and one ``jwt.decode_many`` call over the same batch of HS256
+tokens, signed with a handful of key ids::
+
+    python -m benchmarks.jwt_decode --tokens 1000 --kids 4 --repeat 20
+"""
+import argparse
+import sys
+import time
+
+from benchmarks import use_handler_paths
+from benchmarks.report import summarize, write_report
+
+use_handler_paths()
+
+import jwt  # noqa: E402
+
+
+def make_batch(tokens, kids):
+    keys = {f"k{n}": f"benchmark-secret-{n}-with-enough-bytes" for n in range(kids)}
+    now = int(time.time())
+    batch = [
+        jwt.encode(
+            {"sub": f"user-{n}", "iat": now, "exp": now + 3600, "aud": "bench"},
+            keys[f"k{n % kids}"],
+            algorithm="HS256",
+            headers={"kid": f"k{n % kids}"},
+        )
+        for n in range(tokens)
+    ]
+    return batch, keys
+
+
+def decode_loop(batch, keys):
+    return [
+        jwt.decode(token, keys[jwt.get_unverified_header(token)["kid"]],
+                   algorithms=["HS256"], audience="bench")
+        for token in batch
+    ]
+
+
+def decode_verifier_loop(batch, keys):
+    verifier = jwt.verifier(algorithms=["HS256"], audience="bench")
+    return [
+        jwt.decode(token, keys[jwt.get_unverified_header(token)["kid"]], verifier=verifier)
+        for token in batch
+    ]
+
+
+def decode_batch(batch, keys):
+    return jwt.decode_many(batch, keys, algorithms=["HS256"], audience="bench")
+
+
+def measure(fn, batch, keys, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(batch, keys)
+        samples.append((time.perf_counter() - start) * 1000)
+    summary = summarize(samples)
+    summary["tokens_per_s"] = len(batch) / (summary["p50_ms"] / 1000)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--kids", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", default="bench-jwt-decode.json")
+    args = parser.parse_args(argv)
+
+    results = []
+    for tokens in args.tokens:
+        batch, keys = make_batch(tokens, args.kids)
+        result = {
+            "scenario": {"tokens": tokens, "kids": args.kids, "algorithm": "HS256"},
+            "decode_loop": measure(decode_loop, batch, keys, args.repeat),
+            "decode_verifier": measure(decode_verifier_loop, batch, keys, args.repeat),
+            "decode_many": measure(decode_batch, batch, keys, args.repeat),
+        }
+        result["speedup"] = result["decode_many"]["tokens_per_s"] / result["decode_loop"]["tokens_per_s"]
+        results.append(result)
+        print(
+            f"{tokens:>6} tokens  decode loop {result['decode_loop']['tokens_per_s']:9.0f}/s | "
+            f"with verifier {result['decode_verifier']['tokens_per_s']:9.0f}/s | "
+            f"decode_many {result['decode_many']['tokens_per_s']:9.0f}/s ({result['speedup']:.2f}x)",
+            file=sys.stderr,
+        )
+
+    write_report(args.output, results, benchmark="jwt_decode")
+
+
+if __name__ == "__main__":
+    main()
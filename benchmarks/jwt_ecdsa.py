@@ -0,0 +1,80 @@
+"""Measure pure-Python ES* verification throughput in the vendored PyJWT.
+
+For each curve, signs tokens with the ``ecdsa``-backed algorithm and times
+``jwt.decode`` with the precomputed key ``from_jwk`` returns against a plain
+``ecdsa.VerifyingKey`` without precomputation tables::
+
+    python -m benchmarks.jwt_ecdsa --tokens 200 --curves P-256 P-384
+"""
+import argparse
+import sys
+import time
+
+from benchmarks import use_handler_paths
+from benchmarks.report import summarize, write_report
+
+use_handler_paths()
+
+import ecdsa  # noqa: E402
+import jwt  # noqa: E402
+from jwt.algorithms import ECDSAAlgorithm  # noqa: E402
+
+ALGORITHMS = {"P-256": "ES256", "secp256k1": "ES256K", "P-384": "ES384", "P-521": "ES512"}
+
+
+def measure(tokens, key, algorithm, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for token in tokens:
+            jwt.decode(token, key, algorithms=[algorithm])
+        samples.append((time.perf_counter() - start) * 1000)
+    summary = summarize(samples)
+    summary["tokens_per_s"] = len(tokens) / (summary["p50_ms"] / 1000)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--curves", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument("--tokens", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench-jwt-ecdsa.json")
+    args = parser.parse_args(argv)
+
+    results = []
+    for crv in args.curves:
+        algorithm = ALGORITHMS[crv]
+        curve = getattr(ecdsa, ECDSAAlgorithm.CURVES[crv])
+        signing_key = ecdsa.SigningKey.generate(curve=curve)
+        tokens = [
+            jwt.encode({"sub": f"device-{n}"}, signing_key, algorithm=algorithm)
+            for n in range(args.tokens)
+        ]
+        public_jwk = ECDSAAlgorithm.to_jwk(signing_key.get_verifying_key(), as_dict=True)
+
+        start = time.perf_counter()
+        precomputed = ECDSAAlgorithm.from_jwk(public_jwk)
+        load_ms = (time.perf_counter() - start) * 1000
+        plain = ecdsa.VerifyingKey.from_string(signing_key.get_verifying_key().to_string(), curve=curve)
+
+        result = {
+            "scenario": {"curve": crv, "algorithm": algorithm, "tokens": args.tokens},
+            "from_jwk_ms": load_ms,
+            "plain": measure(tokens, plain, algorithm, args.repeat),
+            "precomputed": measure(tokens, precomputed, algorithm, args.repeat),
+        }
+        result["speedup"] = result["precomputed"]["tokens_per_s"] / result["plain"]["tokens_per_s"]
+        results.append(result)
+        print(
+            f"{crv:<10} {algorithm:<7} plain {result['plain']['tokens_per_s']:7.0f}/s | "
+            f"precomputed {result['precomputed']['tokens_per_s']:7.0f}/s ({result['speedup']:.2f}x, "
+            f"from_jwk {load_ms:.1f}ms)",
+            file=sys.stderr,
+        )
+
+    write_report(args.output, results, benchmark="jwt_ecdsa")
+
+
+if __name__ == "__main__":
+    main()
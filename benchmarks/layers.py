@@ -0,0 +1,68 @@
+"""Report the size and cold-start effect of the per-function slim layers.
+
+Stages the full layer and each handler's slim layer for the local interpreter
+(as ``cdk synth`` does for the matching runtime) and runs the handler
+scenarios against both::
+
+    python -m benchmarks.layers --repeat 5
+"""
+import argparse
+import os
+import sys
+
+from benchmarks import ROOT
+from benchmarks.handlers import run_scenario
+from benchmarks.report import summarize, write_report
+from benchmarks.runtimes import describe_interpreter
+from benchmarks.power_tuning import FUNCTION_IDS
+from yami_iot import bundling
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--handlers", nargs="+", default=["fetch_users", "assign_role"])
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Cold starts to sample per layer (one interpreter each).")
+    parser.add_argument("--output", default="bench-layers.json")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    runtime_name, architecture_name = describe_interpreter(sys.executable)
+    full = os.path.join(bundling.build_layer(runtime_name, architecture_name), "python")
+
+    results = []
+    for handler in args.handlers:
+        slim = bundling.build_function_layer(FUNCTION_IDS[handler], handler, full, runtime_name)
+        layers = {"full": full, "slim": os.path.join(slim, "python")}
+        result = {"scenario": {"handler": handler, "runtime": runtime_name}}
+        for name, layer_dir in layers.items():
+            files, size, zipped = bundling.tree_size(layer_dir)
+            cold = [
+                run_scenario({"handler": handler, "users": 100, "invocations": 1,
+                              "alloc_samples": 0, "warmup": 0, "layer_dir": os.path.abspath(layer_dir)})
+                ["cold"]["total_ms"]
+                for _ in range(args.repeat)
+            ]
+            result[name] = {
+                "files": files,
+                "bytes": size,
+                "zipped_bytes": zipped,
+                "cold": summarize(cold),
+            }
+        result["zipped_reduction"] = 1 - result["slim"]["zipped_bytes"] / result["full"]["zipped_bytes"]
+        result["cold_p50_reduction"] = 1 - result["slim"]["cold"]["p50_ms"] / result["full"]["cold"]["p50_ms"]
+        results.append(result)
+        print(
+            f"{handler:<12} full {result['full']['zipped_bytes'] / 1024:8.0f} KiB zipped, "
+            f"cold p50 {result['full']['cold']['p50_ms']:7.1f}ms | slim "
+            f"{result['slim']['zipped_bytes'] / 1024:8.0f} KiB zipped, "
+            f"cold p50 {result['slim']['cold']['p50_ms']:7.1f}ms "
+            f"({result['zipped_reduction']:.0%} smaller, {result['cold_p50_reduction']:.0%} faster import)",
+            file=sys.stderr,
+        )
+
+    write_report(args.output, results, benchmark="layers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Estimate the cost/latency trade-off of Lambda memory sizes from local runs.
+
+Lambda allocates CPU in proportion to memory, reaching one full vCPU at
+1769 MB. The handlers are single-threaded, so this harness measures each one
+locally (taken as one vCPU, see ``worker.py``) and scales the CPU-bound time
+by ``max(1, 1769 / memory)`` for every tier. ``--io-ms`` adds a fixed,
+memory-independent wait per invocation for the real network calls that the
+in-memory fakes skip. Prices are the published per-GB-second and per-request
+rates, so treat the absolute figures as estimates and the ranking as the
+result::
+
+    python -m benchmarks.power_tuning --handlers fetch_users --users 10000 --io-ms 40
+"""
+import argparse
+import json
+import math
+import sys
+
+from benchmarks.handlers import HANDLERS, run_scenario
+from benchmarks.report import write_report
+
+FULL_VCPU_MB = 1769
+MEMORY_TIERS = (128, 256, 512, 768, 1024, 1536, 1769, 2048, 3008)
+PRICE_PER_GB_SECOND = {"x86_64": 0.0000166667, "arm64": 0.0000133334}
+PRICE_PER_REQUEST = 0.20 / 1_000_000
+
+FUNCTION_IDS = {
+    "fetch_users": "FetchUsersLambda",
+    "assign_role": "AssignRoleLambda",
+    "handler": "UserSyncLambda",
+}
+
+
+def simulate(cpu_ms, memory_mb, io_ms=0.0):
+    """Duration of an invocation whose CPU-bound part takes ``cpu_ms`` on one vCPU."""
+    return cpu_ms * max(1.0, FULL_VCPU_MB / memory_mb) + io_ms
+
+
+def invocation_cost(duration_ms, memory_mb, architecture="x86_64"):
+    """Price of one invocation; Lambda bills duration in 1 ms increments."""
+    billed_seconds = math.ceil(duration_ms) / 1000
+    return billed_seconds * memory_mb / 1024 * PRICE_PER_GB_SECOND[architecture] + PRICE_PER_REQUEST
+
+
+def tune(warm, tiers=MEMORY_TIERS, io_ms=0.0, architecture="x86_64", max_slowdown=0.10):
+    """Project ``warm`` latency figures onto memory tiers and pick the optimum.
+
+    The recommendation is the cheapest tier whose projected p95 is within
+    ``max_slowdown`` of the fastest tier's p95.
+    """
+    rows = []
+    for memory_mb in tiers:
+        p50 = simulate(warm["p50_ms"], memory_mb, io_ms)
+        p95 = simulate(warm["p95_ms"], memory_mb, io_ms)
+        p99 = simulate(warm["p99_ms"], memory_mb, io_ms)
+        rows.append({
+            "memory_mb": memory_mb,
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "p99_ms": p99,
+            "cost_per_million_usd": invocation_cost(p50, memory_mb, architecture) * 1_000_000,
+        })
+
+    fastest = min(row["p95_ms"] for row in rows)
+    acceptable = [row for row in rows if row["p95_ms"] <= fastest * (1 + max_slowdown)]
+    cheapest = min(rows, key=lambda row: row["cost_per_million_usd"])
+    recommended = min(acceptable, key=lambda row: row["cost_per_million_usd"])
+    return {
+        "tiers": rows,
+        "cheapest_mb": cheapest["memory_mb"],
+        "recommended_mb": recommended["memory_mb"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--handlers", nargs="+", choices=HANDLERS, default=list(HANDLERS))
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--invocations", type=int, default=200)
+    parser.add_argument("--tiers", nargs="+", type=int, default=list(MEMORY_TIERS))
+    parser.add_argument("--io-ms", type=float, default=0.0,
+                        help="Fixed network wait per invocation that does not scale with memory.")
+    parser.add_argument("--architecture", choices=sorted(PRICE_PER_GB_SECOND), default="x86_64")
+    parser.add_argument("--max-slowdown", type=float, default=0.10,
+                        help="Accept tiers whose p95 is within this fraction of the fastest.")
+    parser.add_argument("--output", default="bench-power-tuning.json")
+    args = parser.parse_args(argv)
+
+    results = []
+    suggested = {}
+    for handler in args.handlers:
+        measured = run_scenario({"handler": handler, "users": args.users, "invocations": args.invocations})
+        tuning = tune(measured["warm"], args.tiers, args.io_ms, args.architecture, args.max_slowdown)
+        results.append({
+            "scenario": measured["scenario"],
+            "measured": measured["warm"],
+            "io_ms": args.io_ms,
+            "architecture": args.architecture,
+            **tuning,
+        })
+        suggested[FUNCTION_IDS[handler]] = {"memory_size": tuning["recommended_mb"]}
+
+        print(f"{handler}: local p50={measured['warm']['p50_ms']:.3f}ms", file=sys.stderr)
+        for row in tuning["tiers"]:
+            marker = " <- recommended" if row["memory_mb"] == tuning["recommended_mb"] else ""
+            print(f"  {row['memory_mb']:>5} MB  p50={row['p50_ms']:9.3f}ms p95={row['p95_ms']:9.3f}ms "
+                  f"${row['cost_per_million_usd']:8.4f}/M{marker}", file=sys.stderr)
+
+    print("Suggested settings: cdk synth -c functions='" + json.dumps(suggested) + "'", file=sys.stderr)
+    write_report(args.output, results, benchmark="power_tuning", suggested_functions=suggested)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Shared statistics and JSON report helpers for the benchmark scripts."""
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from benchmarks import ROOT
+
+
+def percentile(sorted_samples, fraction):
+    """Nearest-rank percentile of an already sorted, non-empty sequence."""
+    index = max(0, min(len(sorted_samples) - 1, round(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples_ms):
+    """Reduce a list of latencies (in milliseconds) to the figures we track."""
+    ordered = sorted(samples_ms)
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered),
+        "p50_ms": percentile(ordered, 0.50),
+        "p95_ms": percentile(ordered, 0.95),
+        "p99_ms": percentile(ordered, 0.99),
+        "max_ms": ordered[-1],
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "timestamp": int(time.time()),
+    }
+
+
+def write_report(path, results, **meta):
+    """Write ``results`` with environment metadata so runs can be diffed across commits."""
+    report = {"meta": {**environment(), **meta}, "results": results}
+    if path == "-":
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(path, "w") as out:
+            json.dump(report, out, indent=2)
+    return report
@@ -0,0 +1,87 @@
+"""Compare handler latency across Python runtimes and layer builds.
+
+Every interpreter passed with ``--python`` stands in for a Lambda runtime: the
+layer is staged for its version and machine with ``yami_iot.bundling`` (as
+``cdk synth`` does) and the handler scenarios run on it. ``--stock-layer``
+adds the vendored layer as shipped, for a before/after view of whether the
+compiled speedups load::
+
+    python -m benchmarks.runtimes --python python3.9 python3.12 --stock-layer
+
+Architectures can only be measured on matching hardware; run the script on
+an arm64 host and compare the two reports with ``benchmarks.compare``.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from benchmarks import LAYER_DIR, ROOT
+from benchmarks.handlers import HANDLERS, run_scenario
+from benchmarks.report import write_report
+from yami_iot import bundling
+
+MACHINES = {"x86_64": "x86_64", "amd64": "x86_64", "aarch64": "arm64", "arm64": "arm64"}
+
+
+def describe_interpreter(python):
+    """Return ``(runtime_name, architecture_name)`` for an interpreter."""
+    output = subprocess.run(
+        [python, "-c", "import platform, sys; "
+                       "print(f'python{sys.version_info[0]}.{sys.version_info[1]}', platform.machine())"],
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return output[0], MACHINES[output[1].lower()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--python", nargs="+", default=[sys.executable],
+                        help="Interpreters to benchmark; each needs boto3 installed.")
+    parser.add_argument("--handlers", nargs="+", choices=HANDLERS, default=["fetch_users", "assign_role"])
+    parser.add_argument("--users", nargs="+", type=int, default=[1000, 10000])
+    parser.add_argument("--invocations", type=int, default=200)
+    parser.add_argument("--stock-layer", action="store_true",
+                        help="Also run every interpreter against the unmodified vendored layer.")
+    parser.add_argument("--no-native-wheels", action="store_true",
+                        help="Stage layers without fetching target wheels (offline).")
+    parser.add_argument("--output", default="bench-runtimes.json")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    results = []
+    for python in args.python:
+        runtime_name, architecture_name = describe_interpreter(python)
+        layers = {"matched": os.path.abspath(os.path.join(bundling.build_layer(
+            runtime_name, architecture_name, fetch_native=not args.no_native_wheels
+        ), "python"))}
+        if args.stock_layer:
+            layers["stock"] = LAYER_DIR
+
+        for layer_name, layer_dir in layers.items():
+            for handler in args.handlers:
+                for users in args.users:
+                    scenario = {
+                        "name": f"{runtime_name}-{architecture_name}/{layer_name}",
+                        "handler": handler,
+                        "users": users,
+                        "invocations": args.invocations,
+                        "layer_dir": layer_dir,
+                    }
+                    result = run_scenario(scenario, python)
+                    result["runtime"] = runtime_name
+                    result["architecture"] = architecture_name
+                    results.append(result)
+                    print(
+                        f"{scenario['name']:<28} {handler:<12} users={users:<7} "
+                        f"cold={result['cold']['total_ms']:8.1f}ms p50={result['warm']['p50_ms']:8.3f}ms "
+                        f"p99={result['warm']['p99_ms']:8.3f}ms "
+                        f"native={result['native_extensions']['charset_normalizer']}",
+                        file=sys.stderr,
+                    )
+
+    write_report(args.output, results, benchmark="runtimes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Synthetic user pools, tokens and Lambda events for the handler benchmarks."""
+import base64
+import json
+import random
+import time
+import uuid
+
+GROUPS = ("Admins", "Devs", "Users")
+DEFAULT_GROUP_FRACTIONS = {"Admins": 0.01, "Devs": 0.1, "Users": 0.6}
+JWKS_KID = "bench-key-1"
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def make_user_pool(user_count, group_fractions=None, seed=0):
+    """Build a Cognito-shaped user pool.
+
+    Returns ``(users, groups)`` where ``users`` is a list of ``ListUsers``
+    style user dicts and ``groups`` maps a group name to the usernames in it.
+    Group membership is drawn independently per group, so a user can be in
+    several groups or in none, as in a real pool.
+    """
+    rng = random.Random(seed)
+    fractions = dict(DEFAULT_GROUP_FRACTIONS if group_fractions is None else group_fractions)
+    users = []
+    groups = {name: [] for name in GROUPS}
+    for index in range(user_count):
+        username = f"user-{index:07d}"
+        users.append({
+            "Username": username,
+            "Attributes": [
+                {"Name": "sub", "Value": str(uuid.UUID(int=rng.getrandbits(128)))},
+                {"Name": "email", "Value": f"{username}@example.com"},
+                {"Name": "email_verified", "Value": "true"},
+                {"Name": "given_name", "Value": f"Given{index}"},
+            ],
+            "UserStatus": "CONFIRMED",
+            "Enabled": True,
+        })
+        for name, fraction in fractions.items():
+            if rng.random() < fraction:
+                groups.setdefault(name, []).append(username)
+    return users, groups
+
+
+def make_jwks(key_count=2):
+    """Return a Cognito-like JWKS document whose first key is ``JWKS_KID``."""
+    rng = random.Random(key_count)
+    keys = []
+    for index in range(key_count):
+        keys.append({
+            "alg": "RS256",
+            "e": "AQAB",
+            "kid": JWKS_KID if index == 0 else f"bench-key-{index + 1}",
+            "kty": "RSA",
+            "n": _b64(rng.getrandbits(2048).to_bytes(256, "big")),
+            "use": "sig",
+        })
+    return {"keys": keys}
+
+
+def make_token(username, groups=("Admins",), kid=JWKS_KID, lifetime=3600, rng=None):
+    """Mint a Cognito-sized RS256-shaped token.
+
+    The signature is random bytes of RSA-2048 length; the handlers under test
+    do not verify it, and the benchmarks only care about the parsing cost.
+    """
+    rng = rng or random
+    now = int(time.time())
+    header = {"kid": kid, "alg": "RS256"}
+    payload = {
+        "sub": str(uuid.UUID(int=rng.getrandbits(128))),
+        "cognito:groups": list(groups),
+        "iss": "https://cognito-idp.us-east-2.amazonaws.com/us-east-2_bench",
+        "cognito:username": username,
+        "origin_jti": str(uuid.UUID(int=rng.getrandbits(128))),
+        "aud": "benchclientid",
+        "event_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "token_use": "id",
+        "auth_time": now,
+        "exp": now + lifetime,
+        "iat": now,
+        "jti": str(uuid.UUID(int=rng.getrandbits(128))),
+        "email": f"{username}@example.com",
+    }
+    signature = rng.getrandbits(2048).to_bytes(256, "big")
+    return ".".join([
+        _b64(json.dumps(header, separators=(",", ":")).encode()),
+        _b64(json.dumps(payload, separators=(",", ":")).encode()),
+        _b64(signature),
+    ])
+
+
+class TokenStream:
+    """Yields bearer tokens where ``reuse_ratio`` of them repeat an earlier one.
+
+    A reuse ratio of 0 mints a fresh token per request; 1 presents the same
+    token every time, like a single device polling the API.
+    """
+
+    def __init__(self, reuse_ratio=0.0, groups=("Admins",), seed=0):
+        self.reuse_ratio = reuse_ratio
+        self.groups = groups
+        self._rng = random.Random(seed)
+        self._issued = []
+
+    def next(self):
+        if self._issued and self._rng.random() < self.reuse_ratio:
+            return self._rng.choice(self._issued)
+        token = make_token(f"admin-{len(self._issued)}", self.groups, rng=self._rng)
+        self._issued.append(token)
+        return token
+
+
+def api_event(token, method="GET", path="/fetch-users", body=None):
+    """Build a REST API (Lambda proxy) event carrying ``token``."""
+    return {
+        "resource": path,
+        "path": path,
+        "httpMethod": method,
+        "headers": {"Authorization": f"Bearer {token}"},
+        "queryStringParameters": None,
+        "body": None if body is None else json.dumps(body),
+        "isBase64Encoded": False,
+    }
+
+
+def post_confirmation_event(user):
+    """Build a Cognito PostConfirmation trigger event for a synthetic user."""
+    attributes = {attr["Name"]: attr["Value"] for attr in user["Attributes"]}
+    return {
+        "version": "1",
+        "triggerSource": "PostConfirmation_ConfirmSignUp",
+        "region": "us-east-2",
+        "userPoolId": "us-east-2_bench",
+        "userName": user["Username"],
+        "callerContext": {"awsSdkVersion": "aws-sdk-unknown-unknown", "clientId": "benchclientid"},
+        "request": {"userAttributes": {**attributes, "cognito:user_status": "CONFIRMED"}},
+        "response": {},
+    }
+
+
+def table_stream_event(changes):
+    """Build a DynamoDB Streams event from ``(old_item, new_item)`` pairs.
+
+    ``None`` on either side makes the record an INSERT or a REMOVE.
+    """
+    from boto3.dynamodb.types import TypeSerializer
+
+    serializer = TypeSerializer()
+    records = []
+    for number, (old, new) in enumerate(changes):
+        images = {}
+        for name, item in (("OldImage", old), ("NewImage", new)):
+            if item is not None:
+                images[name] = {key: serializer.serialize(value) for key, value in item.items()}
+        records.append({
+            "eventName": "INSERT" if old is None else "REMOVE" if new is None else "MODIFY",
+            "eventSource": "aws:dynamodb",
+            "dynamodb": {
+                "Keys": {"userId": {"S": (new or old)["userId"]}},
+                "SequenceNumber": str(100000000000000000000 + number),
+                "StreamViewType": "NEW_AND_OLD_IMAGES",
+                **images,
+            },
+        })
+    return {"Records": records}
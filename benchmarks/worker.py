@@ -0,0 +1,137 @@
+"""Run one handler scenario in a fresh interpreter and print its measurements.
+
+Invoked by ``benchmarks.handlers`` once per scenario so that the first import
+of the handler module is a genuine cold import and peak RSS is per scenario::
+
+    python -m benchmarks.worker '{"handler": "fetch_users", "users": 1000}'
+"""
+import contextlib
+import importlib
+import json
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+
+from benchmarks import synthetic, use_handler_paths
+
+DEFAULTS = {
+    "users": 1000,
+    "group_fractions": None,
+    "reuse_ratio": 0.0,
+    "invocations": 200,
+    "warmup": 5,
+    "alloc_samples": 20,
+    "seed": 0,
+    # Site directory holding the layer packages; defaults to lambda_layer/python.
+    "layer_dir": None,
+}
+
+HANDLER_ENVIRONMENT = {
+    "USER_POOL_ID": "us-east-2_bench",
+    "USER_TABLE_NAME": "bench-user-table",
+    "STATS_TABLE_NAME": "bench-stats-table",
+}
+
+
+def build_events(scenario, users, groups):
+    """Pre-build every event so that token minting is not part of the timings."""
+    count = scenario["warmup"] + scenario["invocations"] + scenario["alloc_samples"]
+    rng = random.Random(scenario["seed"])
+    name = scenario["handler"]
+    if name == "handler":
+        return [synthetic.post_confirmation_event(users[i % len(users)]) for i in range(count)]
+
+    tokens = synthetic.TokenStream(scenario["reuse_ratio"], seed=scenario["seed"])
+    events = []
+    for _ in range(count):
+        if name == "fetch_users":
+            events.append(synthetic.api_event(tokens.next()))
+        elif name == "assign_role":
+            body = {
+                "userId": rng.choice(users)["Username"],
+                "groupName": rng.choice(synthetic.GROUPS),
+            }
+            events.append(synthetic.api_event(tokens.next(), "POST", "/assign-role", body))
+        else:
+            raise ValueError(f"Unknown handler {name!r}")
+    return events
+
+
+def run(scenario):
+    from benchmarks.report import summarize
+
+    scenario = {**DEFAULTS, **scenario}
+    users, groups = synthetic.make_user_pool(
+        scenario["users"], scenario["group_fractions"], scenario["seed"]
+    )
+    events = build_events(scenario, users, groups)
+    os.environ.update(HANDLER_ENVIRONMENT)
+    use_handler_paths(scenario["layer_dir"])
+
+    # Cold start: the runtime's own imports, then the handler module's init code.
+    started = time.perf_counter()
+    import boto3  # noqa: F401
+    import requests  # noqa: F401
+    dependencies_ms = (time.perf_counter() - started) * 1000
+
+    from benchmarks import fakes
+
+    aws = fakes.FakeAWS(users, groups, synthetic.make_jwks())
+    # Handlers print to stdout (CloudWatch in Lambda); keep it off our JSON channel.
+    with fakes.install(aws), open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        started = time.perf_counter()
+        module = importlib.import_module(scenario["handler"])
+        handler_import_ms = (time.perf_counter() - started) * 1000
+
+        pending = iter(events)
+        for _ in range(scenario["warmup"]):
+            module.handler(next(pending), None)
+
+        latencies = []
+        failures = 0
+        for _ in range(scenario["invocations"]):
+            event = next(pending)
+            started = time.perf_counter()
+            result = module.handler(event, None)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if isinstance(result, dict) and result.get("statusCode", 200) >= 400:
+                failures += 1
+
+        allocations = []
+        tracemalloc.start()
+        for _ in range(scenario["alloc_samples"]):
+            event = next(pending)
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            module.handler(event, None)
+            allocations.append(tracemalloc.get_traced_memory()[1] - baseline)
+        tracemalloc.stop()
+
+    allocations.sort()
+    import charset_normalizer.md
+    return {
+        "scenario": scenario,
+        "cold": {
+            "dependencies_import_ms": dependencies_ms,
+            "handler_import_ms": handler_import_ms,
+            "total_ms": dependencies_ms + handler_import_ms,
+        },
+        "warm": summarize(latencies),
+        "failures": failures,
+        "alloc_peak_kib_p50": allocations[len(allocations) // 2] / 1024 if allocations else None,
+        "alloc_peak_kib_max": allocations[-1] / 1024 if allocations else None,
+        # ru_maxrss is reported in KiB on Linux.
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        # Whether the compiled speedups in the layer actually loaded.
+        "native_extensions": {
+            "charset_normalizer": charset_normalizer.md.__file__.endswith(".so"),
+        },
+        "service_calls": {"cognito": aws.cognito.calls, "jwks_fetches": aws.jwks_fetches},
+    }
+
+
+if __name__ == "__main__":
+    json.dump(run(json.loads(sys.argv[1])), sys.stdout)
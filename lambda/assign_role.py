@@ -1,75 +1,58 @@
-import boto3
-import os
 import json
-import logging
-from botocore.exceptions import ClientError
-import jwt
-import requests
-
+import os
 
-cognito_client = boto3.client('cognito-idp')
+from auth import USER_POOL_ID, get_client, is_warmup_event, request_claims, warm_on_init
+from auth import warm as warm_caches
+from user_store import add_role
 
-USER_POOL_ID = os.environ['USER_POOL_ID']
-COGNITO_REGION = "us-east-2"
-secret_name = "prod/yami/clientId"
 
-session = boto3.session.Session()
-client = session.client(
-    service_name='secretsmanager',
-    region_name=COGNITO_REGION
-)
+def warm():
+    """Init entry point: pre-populate the clients, secret and JWKS caches."""
+    return warm_caches()
 
-try:
-    get_secret_value_response = client.get_secret_value(
-        SecretId=secret_name
-    )
-except ClientError as e:
-    raise e
 
-CLIENT_ID = get_secret_value_response['SecretString']
+warm_on_init(warm)
 
 
-def verify_token(token):
-    """Verify JWT token and extract claims."""
+def record_role(username, group_name):
+    """Mirror the new group onto the user's UserTable item for the stats stream."""
     try:
-        header = jwt.get_unverified_header(token)
-        kid = header["kid"]
-        
-        # Fetch Cognito public keys
-        keys_url = f"https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{USER_POOL_ID}/.well-known/jwks.json"
-        response = requests.get(keys_url)
-        response.raise_for_status()
-        keys = response.json()["keys"]
-        
-        key = next((k for k in keys if k["kid"] == kid), None)
-        if not key:
-            raise Exception("Public key not found.")
+        user = get_client('cognito-idp').admin_get_user(
+            UserPoolId=USER_POOL_ID,
+            Username=username
+        )
+        sub = next(attr['Value'] for attr in user['UserAttributes'] if attr['Name'] == 'sub')
+        if not add_role(sub, group_name):
+            print(f"No user record for {username}; role not recorded")
+    except Exception as e:
+        # The group change itself went through; only the stats miss it.
+        print(f"Recording role failed: {str(e)}")
 
-        claims = jwt.decode(token, algorithms=["RS256"], options={"verify_signature": False})
-        return claims
 
-    except jwt.ExpiredSignatureError:
-        print("Token has expired")
-        return None
+def flush_api_cache():
+    """Drop cached /fetch-users responses so the role change shows up at once."""
+    if not os.environ.get("REST_API_ID"):
+        return
+    try:
+        get_client('apigateway').flush_stage_cache(
+            restApiId=os.environ["REST_API_ID"],
+            stageName=os.environ["STAGE_NAME"]
+        )
     except Exception as e:
-        print(f"Token verification failed: {str(e)}")
-        return None
-    
+        # The role change itself went through; stale entries expire with the TTL.
+        print(f"Stage cache flush failed: {str(e)}")
 
 
 def handler(event, context):
+    if is_warmup_event(event):
+        return warm()
+
     try:
 
-        headers = event.get("headers", {})
-        token = headers.get("Authorization", "").replace("Bearer ", "")
-        
-        if not token:
-            return {"statusCode": 401, "body": json.dumps({"error": "Unauthorized"})}
-        
-        
-        claims = verify_token(token)
-        if not claims:
-            return {"statusCode": 403, "body": json.dumps({"error": "Invalid token"})}
+        claims, error = request_claims(event)
+        if error:
+            status, message = error
+            return {"statusCode": status, "body": json.dumps({"error": message})}
         
         username = claims.get("cognito:username")
         user_groups = claims.get("cognito:groups", [])
@@ -89,11 +72,13 @@ def handler(event, context):
             }
 
         # Add user to the specified group
-        response = cognito_client.admin_add_user_to_group(
+        response = get_client('cognito-idp').admin_add_user_to_group(
             UserPoolId=USER_POOL_ID,
             Username=user_id,
             GroupName=group_name
         )
+        record_role(user_id, group_name)
+        flush_api_cache()
 
         return {
             "statusCode": 200,
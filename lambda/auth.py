@@ -0,0 +1,173 @@
+import os
+import time
+
+import boto3
+import jwt
+import requests
+
+USER_POOL_ID = os.environ['USER_POOL_ID']
+COGNITO_REGION = "us-east-2"
+secret_name = "prod/yami/clientId"
+KEYS_URL = f"https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{USER_POOL_ID}/.well-known/jwks.json"
+# Minimum seconds between JWKS fetches forced by an unknown kid, so tokens
+# with made-up kids cannot make every request wait on Cognito.
+JWKS_REFRESH_INTERVAL = 60
+
+# Set by the stack: the API's authorizer has already validated the token, so
+# the handlers read the claims it passes in the request context and do no
+# crypto or network calls of their own.
+TRUST_AUTHORIZER_CLAIMS = os.environ.get("TRUST_AUTHORIZER_CLAIMS") == "true"
+
+# Lambda sets this to "provisioned-concurrency" or "snap-start" when the
+# environment is initialised ahead of traffic.
+INITIALIZATION_TYPE = os.environ.get("AWS_LAMBDA_INITIALIZATION_TYPE", "on-demand")
+
+# Everything below is created on first use and kept for the lifetime of the
+# execution environment.
+_clients = {}
+_client_id = None
+_jwks_keys = None
+_jwks_fetched_at = 0.0
+
+# Claim checks compiled once rather than merged from options on every call.
+_claims_verifier = jwt.verifier(algorithms=["RS256"], options={"verify_signature": False})
+
+
+def get_client(service_name, region_name=None):
+    """Return a cached boto3 client for the service."""
+    key = (service_name, region_name)
+    if key not in _clients:
+        if region_name:
+            _clients[key] = boto3.session.Session().client(
+                service_name=service_name,
+                region_name=region_name
+            )
+        else:
+            _clients[key] = boto3.client(service_name)
+    return _clients[key]
+
+
+def get_client_id():
+    """Return the app client id stored in Secrets Manager."""
+    global _client_id
+    if _client_id is None:
+        response = get_client('secretsmanager', COGNITO_REGION).get_secret_value(
+            SecretId=secret_name
+        )
+        _client_id = response['SecretString']
+    return _client_id
+
+
+def get_jwks_keys(refresh=False):
+    """Return the user pool's public keys indexed by kid.
+
+    ``refresh`` refetches them, at most once every ``JWKS_REFRESH_INTERVAL``
+    seconds; within that interval the cached keys are returned.
+    """
+    global _jwks_keys, _jwks_fetched_at
+    refresh = refresh and time.monotonic() - _jwks_fetched_at >= JWKS_REFRESH_INTERVAL
+    if _jwks_keys is None or refresh:
+        response = requests.get(KEYS_URL, timeout=5)
+        response.raise_for_status()
+        _jwks_keys = {k["kid"]: k for k in response.json()["keys"]}
+        _jwks_fetched_at = time.monotonic()
+    return _jwks_keys
+
+
+def verify_token(token):
+    """Verify JWT token and extract claims."""
+    try:
+        # Parsed once: the header read here is reused by decode().
+        parsed = jwt.parse(token)
+        kid = jwt.get_unverified_header(parsed)["kid"]
+
+        # Cognito rotates keys rarely; only refetch when the kid is unknown.
+        key = get_jwks_keys().get(kid) or get_jwks_keys(refresh=True).get(kid)
+        if not key:
+            raise Exception("Public key not found.")
+
+        claims = jwt.decode(parsed, verifier=_claims_verifier)
+        return claims
+
+    except jwt.ExpiredSignatureError:
+        print("Token has expired")
+        return None
+    except Exception as e:
+        print(f"Token verification failed: {str(e)}")
+        return None
+
+
+def bearer_token(event):
+    """Return the token from the Authorization header (lower-case on HTTP APIs)."""
+    headers = event.get("headers") or {}
+    value = headers.get("Authorization") or headers.get("authorization") or ""
+    return value.replace("Bearer ", "")
+
+
+def authorizer_claims(event):
+    """Return the claims API Gateway's authorizer validated, or None.
+
+    REST APIs (Cognito authorizer) pass them in ``authorizer.claims``, HTTP
+    APIs (JWT authorizer) in ``authorizer.jwt.claims``. Direct invocations
+    carry neither.
+    """
+    if not TRUST_AUTHORIZER_CLAIMS:
+        return None
+    authorizer = (event.get("requestContext") or {}).get("authorizer") or {}
+    claims = authorizer.get("claims") or (authorizer.get("jwt") or {}).get("claims")
+    if not claims:
+        return None
+    claims = dict(claims)
+    groups = claims.get("cognito:groups")
+    if isinstance(groups, str):
+        # Authorizers flatten list claims to strings: "Admins,Devs" on REST
+        # APIs, "[Admins Devs]" on HTTP APIs.
+        claims["cognito:groups"] = groups.strip("[]").replace(",", " ").split()
+    return claims
+
+
+def request_claims(event):
+    """Claims for the caller: from the authorizer when trusted, else verified here.
+
+    Returns ``(claims, error)`` where ``error`` is a ``(status, message)``
+    pair when the request has to be rejected.
+    """
+    claims = authorizer_claims(event)
+    if claims:
+        return claims, None
+
+    token = bearer_token(event)
+    if not token:
+        return None, (401, "Unauthorized")
+    claims = verify_token(token)
+    if not claims:
+        return None, (403, "Invalid token")
+    return claims, None
+
+
+def is_warmup_event(event):
+    """True for the scheduled warm-up ping sent by the stack."""
+    return isinstance(event, dict) and event.get("warmup") is True
+
+
+def warm(*service_names):
+    """Populate the client, secret and JWKS caches ahead of the first request."""
+    for service_name in ('cognito-idp',) + service_names:
+        get_client(service_name)
+    get_client_id()
+    get_jwks_keys()
+    return {"warmed": True}
+
+
+def warm_on_init(warm_function):
+    """Run warm_function during init for pre-initialised environments.
+
+    On-demand environments stay lazy, so a failed warm-up never breaks the
+    import; the caches are filled by the first request instead.
+    """
+    if INITIALIZATION_TYPE not in ("provisioned-concurrency", "snap-start"):
+        return
+    try:
+        warm_function()
+    except Exception as e:
+        print(f"Warm-up during init failed: {str(e)}")
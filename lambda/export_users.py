@@ -0,0 +1,160 @@
+"""Scheduled export of every user to the object store as newline-delimited JSON.
+
+One run writes, under ``<EXPORT_PREFIX><runId>/``:
+
+    table-<n>.ndjson   one file per parallel Scan segment of UserTable
+    cognito.ndjson     the user pool, paged through ListUsers
+    manifest.json      written last, with the record counts per file
+
+Every file is a multipart upload fed page by page, so memory stays at about
+one part per stream. After each part the stream's page cursor and uploaded
+parts go into ``checkpoint.json``. A run that is running out of time stops
+and re-invokes the function with its ``runId``, and the streams resume
+from their last checkpoint.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import object_store
+from user_store import get_table, scan_pages
+
+USER_POOL_ID = os.environ['USER_POOL_ID']
+EXPORT_PREFIX = os.environ.get('EXPORT_PREFIX', 'exports/')
+EXPORT_SEGMENTS = int(os.environ.get('EXPORT_SEGMENTS', '4'))
+
+# Stop taking new pages this long before the Lambda timeout.
+TIME_MARGIN_SECONDS = 60
+COGNITO_PAGE_SIZE = 60
+
+
+def cognito_pages(start_token=None):
+    """Yield ``(records, next_token)`` for each ListUsers page."""
+    # Runs on a worker thread, and the default boto3 session is not thread-safe.
+    client = boto3.session.Session().client('cognito-idp')
+    token = start_token
+    while True:
+        options = {'UserPoolId': USER_POOL_ID, 'Limit': COGNITO_PAGE_SIZE}
+        if token:
+            options['PaginationToken'] = token
+        response = client.list_users(**options)
+        token = response.get('PaginationToken')
+        records = [{
+            'source': 'cognito',
+            'username': user['Username'],
+            'status': user.get('UserStatus'),
+            'enabled': user.get('Enabled'),
+            'created': user.get('UserCreateDate'),
+            'modified': user.get('UserLastModifiedDate'),
+            'attributes': {attr['Name']: attr['Value'] for attr in user.get('Attributes', [])}
+        } for user in response.get('Users', [])]
+        yield records, token
+        if not token:
+            return
+
+
+def table_pages(segment, start_key=None):
+    """Yield ``(records, last_key)`` for one Scan segment of UserTable."""
+    for users, last_key in scan_pages(
+        segment=segment, total_segments=EXPORT_SEGMENTS, start_key=start_key
+    ):
+        yield [{'source': 'table', **user} for user in users], last_key
+
+
+class Export:
+    """One export run and its checkpoint."""
+
+    def __init__(self, store, run_id, deadline=None):
+        self.store = store
+        self.run_id = run_id
+        self.deadline = deadline
+        self.prefix = f"{EXPORT_PREFIX}{run_id}/"
+        self._lock = threading.Lock()
+        saved = store.get(self.prefix + 'checkpoint.json')
+        if saved:
+            self.streams = json.loads(saved)['streams']
+        else:
+            names = [f"table-{segment}" for segment in range(EXPORT_SEGMENTS)] + ['cognito']
+            self.streams = {}
+            for name in names:
+                key = f"{self.prefix}{name}.ndjson"
+                self.streams[name] = {
+                    'key': key, 'uploadId': store.start_upload(key), 'parts': [],
+                    'cursor': None, 'count': 0, 'done': False
+                }
+            self.save()
+
+    def save(self):
+        with self._lock:
+            data = json.dumps({'runId': self.run_id, 'streams': self.streams})
+            self.store.put(self.prefix + 'checkpoint.json', data.encode())
+
+    def out_of_time(self):
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+    def pages(self, name, cursor):
+        if name == 'cognito':
+            return cognito_pages(cursor)
+        return table_pages(int(name.split('-')[1]), cursor)
+
+    def run_stream(self, name):
+        """Export one stream from its checkpoint. Returns True once it is complete."""
+        state = self.streams[name]
+        if state['done']:
+            return True
+        writer = object_store.MultipartWriter(self.store, state['key'], state['uploadId'], state['parts'])
+        count = state['count']
+        for records, cursor in self.pages(name, state['cursor']):
+            for record in records:
+                writer.write(json.dumps(record, default=str).encode() + b'\n')
+            count += len(records)
+            if not cursor:
+                break
+            if writer.full:
+                writer.flush()
+                state.update(parts=writer.parts, cursor=cursor, count=count)
+                self.save()
+            if self.out_of_time():
+                # Whatever is still buffered is re-read from the checkpoint.
+                return False
+        writer.complete()
+        state.update(parts=writer.parts, cursor=None, count=count, done=True)
+        self.save()
+        return True
+
+    def run(self):
+        """Run every unfinished stream in parallel. Returns True once all are complete."""
+        with ThreadPoolExecutor(max_workers=len(self.streams)) as executor:
+            finished = list(executor.map(self.run_stream, list(self.streams)))
+        if not all(finished):
+            return False
+        manifest = {
+            'runId': self.run_id,
+            'files': {state['key']: state['count'] for state in self.streams.values()}
+        }
+        self.store.put(self.prefix + 'manifest.json', json.dumps(manifest).encode())
+        return True
+
+
+def handler(event, context):
+    run_id = (event or {}).get('runId') or time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())
+    deadline = None
+    if context is not None:
+        deadline = time.monotonic() + context.get_remaining_time_in_millis() / 1000 - TIME_MARGIN_SECONDS
+
+    get_table()
+    export = Export(object_store.from_environment(), run_id, deadline)
+    if export.run():
+        print(f"Export {run_id} complete")
+        return {'runId': run_id, 'complete': True}
+
+    print(f"Export {run_id} paused at its checkpoint; continuing in a new invocation")
+    boto3.client('lambda').invoke(
+        FunctionName=context.invoked_function_arn,
+        InvocationType='Event',
+        Payload=json.dumps({'runId': run_id})
+    )
+    return {'runId': run_id, 'complete': False}
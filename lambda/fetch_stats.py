@@ -0,0 +1,48 @@
+import json
+
+from auth import is_warmup_event, request_claims, warm_on_init
+from auth import warm as warm_caches
+from user_stats import get_stats_table, get_summary
+
+
+def warm():
+    """Init entry point: pre-populate the clients, table, secret and JWKS caches."""
+    get_stats_table()
+    return warm_caches()
+
+
+warm_on_init(warm)
+
+
+def handler(event, context):
+    """GET /user-stats: the summary item, one GetItem whatever the pool size."""
+    if is_warmup_event(event):
+        return warm()
+
+    try:
+        claims, error = request_claims(event)
+        if error:
+            status, message = error
+            return {"statusCode": status, "body": json.dumps({"error": message})}
+
+        if "Admins" not in claims.get("cognito:groups", []):
+            return {"statusCode": 403, "body": json.dumps({"error": "Access Denied. Admins only."})}
+
+        return {
+            "statusCode": 200,
+            "headers": {
+                "Access-Control-Allow-Origin": "*",  # Allow all origins
+                "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+                "Access-Control-Allow-Headers": "Content-Type, Authorization"
+            },
+            "body": json.dumps(get_summary())
+        }
+
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "headers": {
+                "Access-Control-Allow-Origin": "*"
+            },
+            "body": json.dumps({"error": str(e)})
+        }
@@ -1,66 +1,25 @@
-import boto3
-import os
 import json
 import logging
-from botocore.exceptions import ClientError
 import jwt
-import requests
-
-USER_POOL_ID = os.environ['USER_POOL_ID']
-cognito_client = boto3.client('cognito-idp')
-COGNITO_REGION = "us-east-2"
-secret_name = "prod/yami/clientId"
-
-session = boto3.session.Session()
-client = session.client(
-    service_name='secretsmanager',
-    region_name=COGNITO_REGION
-)
-
-try:
-    get_secret_value_response = client.get_secret_value(
-        SecretId=secret_name
-    )
-except ClientError as e:
-    raise e
-
-CLIENT_ID = get_secret_value_response['SecretString']
+from auth import USER_POOL_ID, get_client, is_warmup_event, request_claims, warm_on_init
+from auth import warm as warm_caches
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-def verify_token(token):
-    """Verify JWT token and extract claims."""
-    logger.info("Lambda function started")
-    logger.info(f"PyJWT version: {jwt.__version__}")
-    try:
-        header = jwt.get_unverified_header(token)
-        kid = header["kid"]
-        
-        # Fetch Cognito public keys
-        keys_url = f"https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{USER_POOL_ID}/.well-known/jwks.json"
-        response = requests.get(keys_url)
-        response.raise_for_status()
-        keys = response.json()["keys"]
-        
-        key = next((k for k in keys if k["kid"] == kid), None)
-        if not key:
-            raise Exception("Public key not found.")
 
-        claims = jwt.decode(token, algorithms=["RS256"], options={"verify_signature": False})
-        return claims
+def warm():
+    """Init entry point: pre-populate the clients, secret and JWKS caches."""
+    return warm_caches()
+
+
+warm_on_init(warm)
 
-    except jwt.ExpiredSignatureError:
-        print("Token has expired")
-        return None
-    except Exception as e:
-        print(f"Token verification failed: {str(e)}")
-        return None
-    
 
 def list_users_in_group(group_name):
     """Fetch users belonging to a specific group."""
     users = []
+    cognito_client = get_client('cognito-idp')
     response = cognito_client.list_users_in_group(UserPoolId=USER_POOL_ID, GroupName=group_name)
     while response:
         users.extend(response.get('Users', []))
@@ -72,18 +31,17 @@ def list_users_in_group(group_name):
     return users
 
 def handler(event, context):
+    if is_warmup_event(event):
+        return warm()
+
+    logger.info("Lambda function started")
+    logger.info(f"PyJWT version: {jwt.__version__}")
     try:
 
-        headers = event.get("headers", {})
-        token = headers.get("Authorization", "").replace("Bearer ", "")
-        
-        if not token:
-            return {"statusCode": 401, "body": json.dumps({"error": "Unauthorized"})}
-        
-        
-        claims = verify_token(token)
-        if not claims:
-            return {"statusCode": 403, "body": json.dumps({"error": "Invalid token"})}
+        claims, error = request_claims(event)
+        if error:
+            status, message = error
+            return {"statusCode": status, "body": json.dumps({"error": message})}
         
         username = claims.get("cognito:username")
         user_groups = claims.get("cognito:groups", [])
@@ -92,7 +50,7 @@ def handler(event, context):
             return {"statusCode": 403, "body": json.dumps({"error": "Access Denied. Admins only."})}
 
         # Fetch all users from Cognito
-        all_users = cognito_client.list_users(UserPoolId=USER_POOL_ID)['Users']
+        all_users = get_client('cognito-idp').list_users(UserPoolId=USER_POOL_ID)['Users']
 
         # Fetch users from each role
         admin_users = list_users_in_group("Admins")
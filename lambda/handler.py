@@ -1,10 +1,10 @@
-import os
-import boto3
-import json
-from datetime import datetime
+import time
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['USER_TABLE_NAME'])
+from user_schema import encode_user
+from user_store import get_table
+
+# Create the table resource during init rather than on the first sign-up.
+get_table()
 
 def handler(event, context):
     try:
@@ -12,26 +12,22 @@ def handler(event, context):
         user_attributes = event['request']['userAttributes']
         
         # Create user record
-        user_item = {
+        user = {
             'userId': user_attributes['sub'],  # Cognito generated unique ID
             'email': user_attributes['email'],
             'email_verified': user_attributes['email_verified'],
-            'created_at': datetime.now().isoformat(),
-            'cognito_username': event['userName']
+            'created_at': time.time(),
+            'cognito_username': event['userName'],
+            # Optional attributes are dropped by encode_user when missing
+            'first_name': user_attributes.get('given_name'),
+            'last_name': user_attributes.get('family_name'),
+            'phone_number': user_attributes.get('phone_number')
         }
 
-        # Add optional attributes if they exist
-        if 'given_name' in user_attributes:
-            user_item['first_name'] = user_attributes['given_name']
-        if 'family_name' in user_attributes:
-            user_item['last_name'] = user_attributes['family_name']
-        if 'phone_number' in user_attributes:
-            user_item['phone_number'] = user_attributes['phone_number']
-
         # Write to DynamoDB
-        table.put_item(Item=user_item)
+        get_table().put_item(Item=encode_user(user))
         
-        print(f"Successfully created user record for {user_item['email']}")
+        print(f"Successfully created user record for {user['email']}")
         
         # Return the event object back to Cognito
         return event
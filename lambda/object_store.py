@@ -0,0 +1,134 @@
+"""Where exports are written: S3 in Lambda, a directory for local runs.
+
+Both stores expose the same small surface: whole-object ``get``/``put`` for
+checkpoints and manifests, and resumable multipart uploads for the data
+files. A multipart upload is identified by ``(key, upload_id)`` plus the
+list of parts uploaded so far, so an interrupted writer can be recreated
+from a checkpoint and carry on.
+"""
+import os
+import shutil
+import uuid
+
+import boto3
+
+# S3 needs every part but the last to be at least 5 MiB.
+PART_SIZE = 8 * 1024 * 1024
+
+
+class MultipartWriter:
+    """Buffers bytes and uploads them in parts of at least ``PART_SIZE``.
+
+    Memory use is bounded by one part. Data only reaches the store when
+    ``flush`` uploads a part, so callers flush at points they can resume from.
+    """
+
+    def __init__(self, store, key, upload_id, parts=None, part_size=None):
+        self.store = store
+        self.key = key
+        self.upload_id = upload_id
+        self.parts = list(parts or [])
+        self.part_size = part_size or PART_SIZE
+        self._buffer = bytearray()
+
+    @property
+    def full(self):
+        return len(self._buffer) >= self.part_size
+
+    def write(self, data):
+        self._buffer += data
+
+    def flush(self):
+        """Upload the buffered bytes as the next part."""
+        number = len(self.parts) + 1
+        etag = self.store.upload_part(self.key, self.upload_id, number, bytes(self._buffer))
+        self.parts.append({"PartNumber": number, "ETag": etag})
+        self._buffer.clear()
+
+    def complete(self):
+        """Upload what is left and assemble the object."""
+        if self._buffer or not self.parts:
+            self.flush()
+        self.store.complete_upload(self.key, self.upload_id, self.parts)
+
+
+class S3ObjectStore:
+    def __init__(self, bucket, client=None):
+        self.bucket = bucket
+        self.client = client or boto3.client('s3')
+
+    def get(self, key):
+        """Return the object's bytes, or None if it does not exist."""
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key)['Body'].read()
+        except self.client.exceptions.NoSuchKey:
+            return None
+
+    def put(self, key, data):
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data)
+
+    def start_upload(self, key):
+        return self.client.create_multipart_upload(Bucket=self.bucket, Key=key)['UploadId']
+
+    def upload_part(self, key, upload_id, number, data):
+        response = self.client.upload_part(
+            Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=data
+        )
+        return response['ETag']
+
+    def complete_upload(self, key, upload_id, parts):
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket, Key=key, UploadId=upload_id,
+            MultipartUpload={'Parts': parts}
+        )
+
+
+class FileSystemObjectStore:
+    """Keys are paths under ``root``; parts are staged in a side directory."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, *key.split('/'))
+
+    def _parts_dir(self, key, upload_id):
+        return f"{self._path(key)}.{upload_id}.parts"
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def start_upload(self, key):
+        upload_id = uuid.uuid4().hex
+        os.makedirs(self._parts_dir(key, upload_id))
+        return upload_id
+
+    def upload_part(self, key, upload_id, number, data):
+        with open(os.path.join(self._parts_dir(key, upload_id), str(number)), 'wb') as f:
+            f.write(data)
+        return str(number)
+
+    def complete_upload(self, key, upload_id, parts):
+        parts_dir = self._parts_dir(key, upload_id)
+        with open(self._path(key), 'wb') as target:
+            for part in parts:
+                with open(os.path.join(parts_dir, str(part['PartNumber'])), 'rb') as source:
+                    shutil.copyfileobj(source, target)
+        shutil.rmtree(parts_dir)
+
+
+def from_environment():
+    """The store for this environment: ``EXPORT_DIR`` locally, else ``EXPORT_BUCKET``."""
+    if os.environ.get('EXPORT_DIR'):
+        return FileSystemObjectStore(os.environ['EXPORT_DIR'])
+    return S3ObjectStore(os.environ['EXPORT_BUCKET'])
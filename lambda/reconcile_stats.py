@@ -0,0 +1,62 @@
+import os
+from collections import Counter
+
+import boto3
+from user_stats import get_stats_table, replace_summary, user_counters
+from user_store import get_table, scan_users
+
+USER_POOL_ID = os.environ['USER_POOL_ID']
+
+# Roles come from Cognito, so the scan only needs what the other counters use.
+COUNTED_FIELDS = ("userId", "created_at")
+
+# Largest page ListGroups and ListUsersInGroup return.
+COGNITO_PAGE_SIZE = 60
+
+
+def _pages(operation, key, **options):
+    """Yield every item under ``key`` across the NextToken pages of ``operation``."""
+    while True:
+        response = operation(Limit=COGNITO_PAGE_SIZE, **options)
+        yield from response.get(key, [])
+        if not response.get('NextToken'):
+            return
+        options['NextToken'] = response['NextToken']
+
+
+def group_roles():
+    """Map each user's sub to the Cognito groups they are in.
+
+    Read from the user pool rather than the ``roles`` attribute, which only
+    assign_role writes: users put in a group before that, from the console
+    or the CLI, or whose role write failed have none on their item.
+    """
+    client = boto3.client('cognito-idp')
+    roles = {}
+    for group in _pages(client.list_groups, 'Groups', UserPoolId=USER_POOL_ID):
+        name = group['GroupName']
+        members = _pages(client.list_users_in_group, 'Users', UserPoolId=USER_POOL_ID, GroupName=name)
+        for user in members:
+            sub = next(attr['Value'] for attr in user['Attributes'] if attr['Name'] == 'sub')
+            roles.setdefault(sub, []).append(name)
+    return roles
+
+
+def handler(event, context):
+    """Scheduled exact recount of the summary item.
+
+    Users and sign-ups come from a full UserTable scan, role counts from the
+    Cognito groups of the scanned users. Corrects drift in the incrementally
+    maintained counters, e.g. a stream batch applied twice after a retry or
+    a role the stream never saw.
+    """
+    get_table()
+    get_stats_table()
+    roles = group_roles()
+    counters = Counter()
+    for user in scan_users(COUNTED_FIELDS):
+        user['roles'] = roles.get(user['userId'], [])
+        counters.update(user_counters(user))
+    replace_summary(counters)
+    print(f"Reconciled stats for {counters['users']} users")
+    return {"users": counters['users']}
@@ -0,0 +1,20 @@
+from user_stats import apply_delta, get_stats_table, summary_delta
+
+# Create the table resource during init rather than on the first batch.
+get_stats_table()
+
+
+def handler(event, context):
+    """UserTable stream consumer: fold a batch of changes into the summary item.
+
+    The whole batch becomes one UpdateItem, so it is applied all or nothing.
+    ADD is not idempotent, though: if the invocation fails after the update
+    committed, the retried (and bisected) records are counted again. Stream
+    records carry no shard id to keep a per-shard watermark against, so such
+    drift is left to the scheduled reconciliation, which recounts
+    everything from the table and the user pool.
+    """
+    delta = summary_delta(event['Records'])
+    apply_delta(delta)
+    print(f"Applied {len(event['Records'])} stream records as {len(delta)} counter changes")
+    return {"counters": len(delta)}
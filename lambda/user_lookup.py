@@ -0,0 +1,76 @@
+import json
+
+from auth import is_warmup_event, request_claims, warm_on_init
+from auth import warm as warm_caches
+from user_store import get_table, get_user_by_email, get_users_by_email, warm_lookup_threads
+
+# Largest number of emails one batch request may resolve.
+MAX_BATCH_SIZE = 100
+
+HEADERS = {
+    "Access-Control-Allow-Origin": "*",  # Allow all origins
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization"
+}
+
+
+def warm():
+    """Init entry point: pre-populate the clients, table, secret and JWKS caches."""
+    get_table()
+    warm_lookup_threads()
+    return warm_caches()
+
+
+warm_on_init(warm)
+
+
+def respond(status_code, body):
+    return {"statusCode": status_code, "headers": HEADERS, "body": json.dumps(body)}
+
+
+def handler(event, context):
+    """GET /users/by-email?email=... resolves one user, POST {"emails": [...]} many."""
+    if is_warmup_event(event):
+        return warm()
+
+    try:
+        claims, error = request_claims(event)
+        if error:
+            status, message = error
+            return {"statusCode": status, "body": json.dumps({"error": message})}
+
+        if "Admins" not in claims.get("cognito:groups", []):
+            return {"statusCode": 403, "body": json.dumps({"error": "Access Denied. Admins only."})}
+
+        # REST events carry httpMethod, HTTP API (v2) events requestContext.http.
+        method = event.get("httpMethod") or event["requestContext"]["http"]["method"]
+
+        if method == "GET":
+            email = (event.get("queryStringParameters") or {}).get("email")
+            if not email:
+                return respond(400, {"message": "Missing email query parameter"})
+            user = get_user_by_email(email)
+            if user is None:
+                return respond(404, {"message": f"No user with email {email}"})
+            return respond(200, {"user": user})
+
+        emails = json.loads(event.get("body") or "{}").get("emails")
+        if not isinstance(emails, list) or not emails:
+            return respond(400, {"message": "Missing emails list in request"})
+        if len(emails) > MAX_BATCH_SIZE:
+            return respond(400, {"message": f"At most {MAX_BATCH_SIZE} emails per request"})
+
+        users = get_users_by_email(emails)
+        return respond(200, {
+            "users": {email: user for email, user in users.items() if user is not None},
+            "notFound": [email for email, user in users.items() if user is None]
+        })
+
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "headers": {
+                "Access-Control-Allow-Origin": "*"
+            },
+            "body": json.dumps({"error": str(e)})
+        }
@@ -0,0 +1,109 @@
+"""Storage format for UserTable items.
+
+Items are written with short attribute names, booleans and epoch-second
+timestamps. ``userId`` and ``email`` keep their names because they key the
+table and the email index. Reads go through ``decode_user``, which also
+understands the verbose items written before this format, so both can live
+side by side in the table.
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+
+
+def _to_bool(value):
+    # Legacy items hold Cognito's "true"/"false" strings.
+    if isinstance(value, str):
+        return value.lower() == "true"
+    return bool(value)
+
+
+def _to_epoch(value):
+    # Legacy items hold datetime.now().isoformat(), written in UTC on Lambda.
+    if isinstance(value, str):
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp())
+    return int(value)
+
+
+def _to_str(value):
+    return str(value)
+
+
+def _to_roles(value):
+    # Stored as a string set; returned as a sorted list so it serialises.
+    return sorted(value)
+
+
+# Field name -> (stored attribute, attribute in legacy items, decoder)
+FIELDS = {
+    "userId": ("userId", "userId", _to_str),
+    "email": ("email", "email", _to_str),
+    "email_verified": ("ev", "email_verified", _to_bool),
+    "created_at": ("ca", "created_at", _to_epoch),
+    "cognito_username": ("un", "cognito_username", _to_str),
+    "first_name": ("fn", "first_name", _to_str),
+    "last_name": ("ln", "last_name", _to_str),
+    "phone_number": ("ph", "phone_number", _to_str),
+    # Groups assigned through assign_role, kept for the stats stream.
+    "roles": ("rl", "roles", _to_roles),
+}
+
+
+def encode_user(user):
+    """Return the compact item for a user given by field name.
+
+    ``cognito_username`` is only stored when it differs from ``userId``, and
+    empty optional fields are left out.
+    """
+    item = {}
+    for field, value in user.items():
+        if value is None or value == "" or value == []:
+            continue
+        if field == "cognito_username" and value == user.get("userId"):
+            continue
+        attribute, _, decoder = FIELDS[field]
+        if decoder is _to_bool:
+            value = _to_bool(value)
+        elif decoder is _to_epoch:
+            value = _to_epoch(value)
+        elif decoder is _to_roles:
+            value = set(value)
+        item[attribute] = value
+    return item
+
+
+def decode_user(item):
+    """Return the user held in ``item``, in either format, keyed by field name.
+
+    Numbers come back as ``int`` rather than DynamoDB's ``Decimal``.
+    """
+    user = {}
+    for field, (attribute, legacy, decoder) in FIELDS.items():
+        value = item.get(attribute, item.get(legacy))
+        if value is None:
+            continue
+        if isinstance(value, Decimal):
+            value = int(value)
+        user[field] = decoder(value)
+    if "cognito_username" not in user and "userId" in user:
+        user["cognito_username"] = user["userId"]
+    return user
+
+
+def projection(*fields):
+    """``ProjectionExpression`` keyword arguments reading only ``fields``.
+
+    Both the compact and the legacy attribute names are requested so that
+    either item format decodes.
+    """
+    attributes = []
+    for field in fields or FIELDS:
+        attribute, legacy, _ = FIELDS[field]
+        attributes += [attribute] if attribute == legacy else [attribute, legacy]
+    names = {f"#a{i}": attribute for i, attribute in enumerate(attributes)}
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
@@ -0,0 +1,127 @@
+"""User statistics kept in a single summary item.
+
+The summary lives in its own table (``STATS_TABLE_NAME``) so that updating
+it never feeds back into the UserTable stream. Counters are flat numeric
+attributes so every change is one atomic ``ADD``:
+
+    users, unassigned, role#<group>, signups#<YYYY-MM-DD>
+
+``summary_delta`` turns a batch of UserTable stream records into counter
+changes and ``apply_delta`` writes them in a single UpdateItem. The stream
+consumer is the only incremental writer, so a change is never counted both
+by the handler that made it and by the stream. ``replace_summary`` writes
+exact counts from the scheduled reconciliation.
+"""
+import os
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import boto3
+from boto3.dynamodb.types import TypeDeserializer
+from user_schema import decode_user
+
+STATS_TABLE_NAME = os.environ['STATS_TABLE_NAME']
+SUMMARY_KEY = {'statId': 'summary'}
+
+ROLE_PREFIX = 'role#'
+SIGNUP_PREFIX = 'signups#'
+
+_deserializer = TypeDeserializer()
+_table = None
+
+
+def get_stats_table():
+    """Return the stats table resource, created once per execution environment."""
+    global _table
+    if _table is None:
+        _table = boto3.resource('dynamodb').Table(STATS_TABLE_NAME)
+    return _table
+
+
+def _image(record, name):
+    image = record['dynamodb'].get(name)
+    if not image:
+        return None
+    return decode_user({key: _deserializer.deserialize(value) for key, value in image.items()})
+
+
+def _signup_day(user):
+    created_at = user.get('created_at')
+    if created_at is None:
+        return None
+    return datetime.fromtimestamp(created_at, timezone.utc).strftime('%Y-%m-%d')
+
+
+def user_counters(user):
+    """The counters one user contributes to the summary."""
+    counters = Counter(users=1)
+    roles = user.get('roles') or []
+    if not roles:
+        counters['unassigned'] += 1
+    for role in roles:
+        counters[ROLE_PREFIX + role] += 1
+    day = _signup_day(user)
+    if day:
+        counters[SIGNUP_PREFIX + day] += 1
+    return counters
+
+
+def summary_delta(records):
+    """Net counter changes for a batch of UserTable stream records.
+
+    Each record contributes its new image's counters minus its old image's,
+    so inserts, role changes and removals all fall out of the same rule.
+    """
+    delta = Counter()
+    for record in records:
+        old, new = _image(record, 'OldImage'), _image(record, 'NewImage')
+        if old:
+            delta.subtract(user_counters(old))
+        if new:
+            delta.update(user_counters(new))
+    return {name: change for name, change in delta.items() if change}
+
+
+def apply_delta(delta):
+    """Add ``delta`` to the summary item in one atomic UpdateItem."""
+    if not delta:
+        return
+    names, values, clauses = {}, {}, []
+    for index, (name, change) in enumerate(sorted(delta.items())):
+        names[f'#c{index}'] = name
+        values[f':c{index}'] = change
+        clauses.append(f'#c{index} :c{index}')
+    get_stats_table().update_item(
+        Key=SUMMARY_KEY,
+        UpdateExpression='ADD ' + ', '.join(clauses),
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues=values
+    )
+
+
+def replace_summary(counters):
+    """Overwrite the summary item with exact ``counters``.
+
+    Stream updates that land between the recount and this write are lost
+    or counted twice; the next reconciliation settles them.
+    """
+    get_stats_table().put_item(Item={
+        **SUMMARY_KEY,
+        **{name: count for name, count in counters.items() if count},
+        'reconciledAt': int(time.time())
+    })
+
+
+def get_summary():
+    """Read the summary with a single GetItem."""
+    item = get_stats_table().get_item(Key=SUMMARY_KEY).get('Item', {})
+    summary = {'users': 0, 'unassigned': 0, 'roles': {}, 'signupsPerDay': {}, 'reconciledAt': None}
+    for name, value in item.items():
+        if name in ('users', 'unassigned', 'reconciledAt'):
+            summary[name] = int(value)
+        elif name.startswith(ROLE_PREFIX):
+            summary['roles'][name[len(ROLE_PREFIX):]] = int(value)
+        elif name.startswith(SIGNUP_PREFIX):
+            summary['signupsPerDay'][name[len(SIGNUP_PREFIX):]] = int(value)
+    return summary
@@ -0,0 +1,134 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+from user_schema import FIELDS, decode_user, projection
+
+USER_TABLE_NAME = os.environ['USER_TABLE_NAME']
+EMAIL_INDEX_NAME = os.environ.get('EMAIL_INDEX_NAME', 'email-index')
+
+# Fields returned by the email lookups.
+LOOKUP_FIELDS = ("userId", "email", "email_verified", "created_at", "cognito_username",
+                 "first_name", "last_name", "roles")
+
+# Parallel lookups for batch requests.
+MAX_WORKERS = 8
+
+# boto3 resources are not thread-safe, so each thread keeps its own handle
+# for the lifetime of the execution environment. The lookup threads live as
+# long too, so a batch reuses their handles instead of building new ones.
+_local = threading.local()
+_executor = None
+
+
+def get_table():
+    """Return this thread's UserTable resource."""
+    table = getattr(_local, 'table', None)
+    if table is None:
+        # The default session is shared and not thread-safe either.
+        table = _local.table = boto3.session.Session().resource('dynamodb').Table(USER_TABLE_NAME)
+    return table
+
+
+def lookup_executor():
+    """Return the thread pool batch lookups run on, created once."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='user-lookup')
+    return _executor
+
+
+def warm_lookup_threads():
+    """Start every lookup thread and build its table handle ahead of traffic."""
+    ready = threading.Barrier(MAX_WORKERS)
+
+    def start(_):
+        get_table()
+        # Hold each thread until all have started, so every task gets its own.
+        ready.wait(timeout=10)
+
+    list(lookup_executor().map(start, range(MAX_WORKERS)))
+
+
+def get_user_by_email(email):
+    """Look a user up through the email GSI instead of scanning the table.
+
+    Returns the user (see ``user_schema.decode_user``), or None when no user
+    has that email.
+    """
+    response = get_table().query(
+        IndexName=EMAIL_INDEX_NAME,
+        KeyConditionExpression=Key('email').eq(email),
+        Limit=1,
+        **projection(*LOOKUP_FIELDS)
+    )
+    items = response.get('Items', [])
+    return decode_user(items[0]) if items else None
+
+
+def get_users_by_email(emails):
+    """Resolve many emails at once with parallel index queries.
+
+    BatchGetItem only reads by primary key, so each email is its own Query
+    against the index; running them concurrently on the long-lived lookup
+    threads keeps a batch close to the latency of a single lookup. Returns
+    ``{email: user or None}``.
+    """
+    emails = list(dict.fromkeys(emails))
+    if len(emails) <= 1:
+        return {email: get_user_by_email(email) for email in emails}
+    return dict(zip(emails, lookup_executor().map(get_user_by_email, emails)))
+
+
+def add_role(user_id, role):
+    """Record ``role`` on an existing user item.
+
+    Returns False when the table has no item for ``user_id`` (users who
+    signed up before the table existed); no partial item is created.
+    """
+    try:
+        get_table().update_item(
+            Key={'userId': user_id},
+            UpdateExpression='ADD #roles :role',
+            ConditionExpression='attribute_exists(userId)',
+            ExpressionAttributeNames={'#roles': FIELDS['roles'][0]},
+            ExpressionAttributeValues={':role': {role}}
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        return False
+    return True
+
+
+def scan_pages(fields=(), segment=None, total_segments=None, start_key=None):
+    """Yield ``(users, last_key)`` for each Scan page of the table or one segment.
+
+    ``last_key`` is the ``ExclusiveStartKey`` to resume after that page, or
+    None on the last page. Only ``fields`` are read when given.
+    """
+    options = projection(*fields) if fields else {}
+    if total_segments:
+        options.update(Segment=segment, TotalSegments=total_segments)
+    if start_key:
+        options['ExclusiveStartKey'] = start_key
+    while True:
+        response = get_table().scan(**options)
+        last_key = response.get('LastEvaluatedKey')
+        yield [decode_user(item) for item in response.get('Items', [])], last_key
+        if not last_key:
+            return
+        options['ExclusiveStartKey'] = last_key
+
+
+def scan_users(fields=(), segment=None, total_segments=None):
+    """Yield every user in the table (or in one segment of a parallel scan).
+
+    Pages are fetched lazily, so memory stays at one page however large the
+    table is.
+    """
+    for users, _ in scan_pages(fields, segment, total_segments):
+        yield from users
@@ -1,12 +1,24 @@
 from .api_jwk import PyJWK, PyJWKSet
 from .api_jws import (
+    ParsedJWS,
     PyJWS,
+    SignatureCache,
     get_algorithm_by_name,
     get_unverified_header,
+    parse,
     register_algorithm,
+    set_signature_cache,
     unregister_algorithm,
 )
-from .api_jwt import PyJWT, decode, decode_complete, encode
+from .api_jwt import (
+    ClaimsVerifier,
+    PyJWT,
+    decode,
+    decode_complete,
+    decode_many,
+    encode,
+    verifier,
+)
 from .exceptions import (
     DecodeError,
     ExpiredSignatureError,
@@ -25,7 +37,7 @@ from .exceptions import (
     PyJWKSetError,
     PyJWTError,
 )
-from .jwks_client import PyJWKClient
+from .jwks_client import AsyncPyJWKClient, PyJWKClient
 
 __version__ = "2.10.1"
 
@@ -43,18 +55,26 @@ __copyright__ = "Copyright 2015-2022 José Padilla"
 
 
 __all__ = [
+    "AsyncPyJWKClient",
+    "ClaimsVerifier",
+    "ParsedJWS",
     "PyJWS",
     "PyJWT",
     "PyJWKClient",
     "PyJWK",
     "PyJWKSet",
+    "SignatureCache",
     "decode",
     "decode_complete",
+    "decode_many",
     "encode",
     "get_unverified_header",
+    "parse",
     "register_algorithm",
+    "set_signature_cache",
     "unregister_algorithm",
     "get_algorithm_by_name",
+    "verifier",
     # Exceptions
     "DecodeError",
     "ExpiredSignatureError",
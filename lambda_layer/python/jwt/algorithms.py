@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import hashlib
 import hmac
+import importlib.util
 import json
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Any, ClassVar, Literal, NoReturn, cast, overload
@@ -69,6 +70,11 @@ try:
 except ModuleNotFoundError:
     has_crypto = False
 
+# The pure-Python ``ecdsa`` package backs the ES* algorithms when
+# ``cryptography`` is missing. It is only imported on first use: importing it
+# costs tens of milliseconds of cold start.
+has_ecdsa = importlib.util.find_spec("ecdsa") is not None
+
 
 if TYPE_CHECKING:
     # Type aliases for convenience in algorithms method signatures
@@ -133,6 +139,19 @@ def get_default_algorithms() -> dict[str, Algorithm]:
             }
         )
 
+    elif has_ecdsa:
+        default_algorithms.update(
+            {
+                "ES256": ECDSAAlgorithm(ECDSAAlgorithm.SHA256, "P-256"),
+                "ES256K": ECDSAAlgorithm(ECDSAAlgorithm.SHA256, "secp256k1"),
+                "ES384": ECDSAAlgorithm(ECDSAAlgorithm.SHA384, "P-384"),
+                "ES521": ECDSAAlgorithm(ECDSAAlgorithm.SHA512, "P-521"),
+                "ES512": ECDSAAlgorithm(
+                    ECDSAAlgorithm.SHA512, "P-521"
+                ),  # Backward compat for #219 fix
+            }
+        )
+
     return default_algorithms
 
 
@@ -873,3 +892,232 @@ if has_crypto:
                 return Ed448PrivateKey.from_private_bytes(d)
             except ValueError as err:
                 raise InvalidKeyError("Invalid key parameter") from err
+
+
+def _load_ecdsa() -> Any:
+    import ecdsa
+    import ecdsa.ellipticcurve
+    import ecdsa.keys
+    import ecdsa.util
+
+    return ecdsa
+
+
+class ECDSAAlgorithm(Algorithm):
+    """
+    Performs signing and verification operations using ECDSA on the
+    pure-Python ``ecdsa`` package, for when ``cryptography`` is unavailable.
+
+    Keys are ``ecdsa.VerifyingKey`` / ``ecdsa.SigningKey`` objects on the
+    curve the algorithm is bound to. Public keys loaded through
+    :meth:`from_jwk` or from PEM get their multiplication tables precomputed
+    once, which roughly halves the cost of each verification; pass those
+    objects again rather than re-loading the key per token. Signatures are
+    the raw ``r || s`` JWS encoding.
+    """
+
+    SHA256: ClassVar[HashlibHash] = hashlib.sha256
+    SHA384: ClassVar[HashlibHash] = hashlib.sha384
+    SHA512: ClassVar[HashlibHash] = hashlib.sha512
+
+    # JWK "crv" -> ecdsa curve name
+    CURVES: ClassVar[dict[str, str]] = {
+        "P-256": "NIST256p",
+        "P-384": "NIST384p",
+        "P-521": "NIST521p",
+        "secp256k1": "SECP256k1",
+    }
+
+    # PEM keys prepared so far, so decode() with the same PEM string does not
+    # re-parse and re-precompute it per token.
+    MAX_PEM_KEYS: ClassVar[int] = 16
+
+    def __init__(self, hash_alg: HashlibHash, curve: str = "P-256") -> None:
+        if curve not in self.CURVES:
+            raise InvalidKeyError(f"Invalid curve: {curve}")
+        self.hash_alg = hash_alg
+        self.curve_name = curve
+        self._pem_keys: dict[bytes, Any] = {}
+
+    @property
+    def curve(self) -> Any:
+        return getattr(_load_ecdsa(), self.CURVES[self.curve_name])
+
+    def prepare_key(self, key: Any) -> Any:
+        ecdsa = _load_ecdsa()
+        if isinstance(key, (ecdsa.VerifyingKey, ecdsa.SigningKey)):
+            return self._check_curve(key)
+
+        if not isinstance(key, (bytes, str)):
+            raise TypeError("Expecting a PEM-formatted key.")
+
+        key_bytes = force_bytes(key)
+        prepared = self._pem_keys.get(key_bytes)
+        if prepared is not None:
+            return prepared
+
+        # We don't know if it's a Signing Key or a Verifying Key, so we try
+        # the Verifying Key first.
+        try:
+            prepared = _precomputed(ecdsa.VerifyingKey.from_pem(key_bytes))
+        except Exception:
+            try:
+                prepared = ecdsa.SigningKey.from_pem(key_bytes)
+            except Exception:
+                raise InvalidKeyError(
+                    "Expecting a PEM-formatted EC public or private key."
+                ) from None
+
+        self._check_curve(prepared)
+        if len(self._pem_keys) >= self.MAX_PEM_KEYS:
+            self._pem_keys.clear()
+        self._pem_keys[key_bytes] = prepared
+        return prepared
+
+    def _check_curve(self, key: Any) -> Any:
+        if key.curve != self.curve:
+            raise InvalidKeyError(
+                f"The key's curve does not match {self.curve_name}."
+            )
+        return key
+
+    def sign(self, msg: bytes, key: Any) -> bytes:
+        ecdsa = _load_ecdsa()
+        return key.sign_deterministic(
+            msg, hashfunc=self.hash_alg, sigencode=ecdsa.util.sigencode_string
+        )
+
+    def verify(self, msg: bytes, key: Any, sig: bytes) -> bool:
+        ecdsa = _load_ecdsa()
+        if isinstance(key, ecdsa.SigningKey):
+            key = key.get_verifying_key()
+
+        if key.curve != self.curve or len(sig) != key.curve.signature_length:
+            return False
+
+        try:
+            return bool(
+                key.verify(
+                    sig,
+                    msg,
+                    hashfunc=self.hash_alg,
+                    sigdecode=ecdsa.util.sigdecode_string,
+                )
+            )
+        except ecdsa.BadSignatureError:
+            return False
+
+    @overload
+    @staticmethod
+    def to_jwk(key_obj: Any, as_dict: Literal[True]) -> JWKDict: ...  # pragma: no cover
+
+    @overload
+    @staticmethod
+    def to_jwk(key_obj: Any, as_dict: Literal[False] = False) -> str: ...  # pragma: no cover
+
+    @staticmethod
+    def to_jwk(key_obj: Any, as_dict: bool = False) -> JWKDict | str:
+        ecdsa = _load_ecdsa()
+        if isinstance(key_obj, ecdsa.SigningKey):
+            public_key = key_obj.get_verifying_key()
+        elif isinstance(key_obj, ecdsa.VerifyingKey):
+            public_key = key_obj
+        else:
+            raise InvalidKeyError("Not a public or private key")
+
+        for crv, name in ECDSAAlgorithm.CURVES.items():
+            if public_key.curve == getattr(ecdsa, name):
+                break
+        else:
+            raise InvalidKeyError(f"Invalid curve: {public_key.curve}")
+
+        point = public_key.to_string()
+        half = len(point) // 2
+        obj: dict[str, Any] = {
+            "kty": "EC",
+            "crv": crv,
+            "x": base64url_encode(point[:half]).decode(),
+            "y": base64url_encode(point[half:]).decode(),
+        }
+        if isinstance(key_obj, ecdsa.SigningKey):
+            obj["d"] = base64url_encode(key_obj.to_string()).decode()
+
+        if as_dict:
+            return obj
+        else:
+            return json.dumps(obj)
+
+    @staticmethod
+    def from_jwk(jwk: str | JWKDict) -> Any:
+        try:
+            if isinstance(jwk, str):
+                obj = json.loads(jwk)
+            elif isinstance(jwk, dict):
+                obj = jwk
+            else:
+                raise ValueError
+        except ValueError:
+            raise InvalidKeyError("Key is not valid JSON") from None
+
+        if obj.get("kty") != "EC":
+            raise InvalidKeyError("Not an Elliptic curve key") from None
+
+        if "x" not in obj or "y" not in obj:
+            raise InvalidKeyError("Not an Elliptic curve key") from None
+
+        crv = obj.get("crv")
+        if crv not in ECDSAAlgorithm.CURVES:
+            raise InvalidKeyError(f"Invalid curve: {crv}")
+
+        ecdsa = _load_ecdsa()
+        curve = getattr(ecdsa, ECDSAAlgorithm.CURVES[crv])
+        x = base64url_decode(obj.get("x"))
+        y = base64url_decode(obj.get("y"))
+        if not len(x) == len(y) == curve.baselen:
+            raise InvalidKeyError(
+                f"Coords should be {curve.baselen} bytes for curve {crv}"
+            )
+
+        try:
+            public_key = _precomputed_point(
+                curve, int.from_bytes(x, "big"), int.from_bytes(y, "big")
+            )
+        except ecdsa.keys.MalformedPointError as err:
+            raise InvalidKeyError("Invalid key parameter") from err
+
+        if "d" not in obj:
+            return public_key
+
+        d = base64url_decode(obj.get("d"))
+        if len(d) != len(x):
+            raise InvalidKeyError(f"D should be {len(x)} bytes for curve {crv}")
+
+        try:
+            private_key = ecdsa.SigningKey.from_string(d, curve=curve)
+        except ecdsa.keys.MalformedPointError as err:
+            raise InvalidKeyError("Invalid key parameter") from err
+        if private_key.get_verifying_key().to_string() != x + y:
+            raise InvalidKeyError("D does not match the public point")
+        return private_key
+
+
+def _precomputed_point(curve: Any, x: int, y: int, validate_point: bool = True) -> Any:
+    """
+    A VerifyingKey for (x, y) with its multiplication tables precomputed.
+
+    The point is built with the curve order attached: ``VerifyingKey``s
+    decoded by ``from_string``/``from_pem`` lack it, and their
+    ``precompute()`` fails.
+    """
+    ecdsa = _load_ecdsa()
+    point = ecdsa.ellipticcurve.PointJacobi(curve.curve, x, y, 1, curve.order)
+    key = ecdsa.VerifyingKey.from_public_point(
+        point, curve=curve, validate_point=validate_point
+    )
+    key.precompute()
+    return key
+
+
+def _precomputed(key: Any) -> Any:
+    point = key.pubkey.point
+    return _precomputed_point(key.curve, point.x(), point.y(), validate_point=False)
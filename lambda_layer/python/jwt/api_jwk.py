@@ -14,6 +14,14 @@ from .exceptions import (
 )
 from .types import JWKDict
 
+try:
+    from cryptography.hazmat.primitives.asymmetric.rsa import (
+        RSAPublicKey,
+        RSAPublicNumbers,
+    )
+except ModuleNotFoundError:
+    pass
+
 
 class PyJWK:
     def __init__(self, jwk_data: JWKDict, algorithm: str | None = None) -> None:
@@ -55,7 +63,11 @@ class PyJWK:
             else:
                 raise InvalidKeyError(f"Unsupported kty: {kty}")
 
-        if not has_crypto and algorithm in requires_cryptography:
+        if (
+            not has_crypto
+            and algorithm in requires_cryptography
+            and algorithm not in self._algorithms
+        ):
             raise MissingCryptographyError(
                 f"{algorithm} requires 'cryptography' to be installed."
             )
@@ -69,6 +81,22 @@ class PyJWK:
 
         self.key = self.Algorithm.from_jwk(self._jwk_data)
 
+    def __getstate__(self) -> dict[str, Any]:
+        # Pickled without the algorithm table and with the key in a portable,
+        # already-decoded form, so a pickled set loads without from_jwk.
+        return {
+            "jwk_data": self._jwk_data,
+            "algorithm_name": self.algorithm_name,
+            "key": _dump_key(self.key),
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self._algorithms = get_default_algorithms()
+        self._jwk_data = state["jwk_data"]
+        self.algorithm_name = state["algorithm_name"]
+        self.Algorithm = self._algorithms[self.algorithm_name]
+        self.key = _load_key(state["key"], self.Algorithm, self._jwk_data)
+
     @staticmethod
     def from_dict(obj: JWKDict, algorithm: str | None = None) -> PyJWK:
         return PyJWK(obj, algorithm)
@@ -94,6 +122,8 @@ class PyJWK:
 class PyJWKSet:
     def __init__(self, keys: list[JWKDict]) -> None:
         self.keys = []
+        # kid -> key; the first key wins when a kid repeats, as a scan would.
+        self._keys_by_kid: dict[str | None, PyJWK] = {}
 
         if not keys:
             raise PyJWKSetError("The JWK Set did not contain any keys")
@@ -103,12 +133,14 @@ class PyJWKSet:
 
         for key in keys:
             try:
-                self.keys.append(PyJWK(key))
+                jwk = PyJWK(key)
             except PyJWTError as error:
                 if isinstance(error, MissingCryptographyError):
                     raise error
                 # skip unusable keys
                 continue
+            self.keys.append(jwk)
+            self._keys_by_kid.setdefault(jwk.key_id, jwk)
 
         if len(self.keys) == 0:
             raise PyJWKSetError(
@@ -126,10 +158,29 @@ class PyJWKSet:
         return PyJWKSet.from_dict(obj)
 
     def __getitem__(self, kid: str) -> PyJWK:
-        for key in self.keys:
-            if key.key_id == kid:
-                return key
-        raise KeyError(f"keyset has no key for kid: {kid}")
+        try:
+            return self._keys_by_kid[kid]
+        except KeyError:
+            raise KeyError(f"keyset has no key for kid: {kid}") from None
+
+
+def _dump_key(key: Any) -> tuple[Any, ...]:
+    if isinstance(key, bytes):
+        return ("bytes", key)
+    if has_crypto and isinstance(key, RSAPublicKey):
+        numbers = key.public_numbers()
+        return ("rsa", numbers.n, numbers.e)
+    # Anything else is rebuilt from the JWK when loaded.
+    return ("jwk",)
+
+
+def _load_key(state: tuple[Any, ...], algorithm: Any, jwk_data: JWKDict) -> Any:
+    kind = state[0]
+    if kind == "bytes":
+        return state[1]
+    if kind == "rsa":
+        return RSAPublicNumbers(state[2], state[1]).public_key()
+    return algorithm.from_jwk(jwk_data)
 
 
 class PyJWTSetWithTimestamp:
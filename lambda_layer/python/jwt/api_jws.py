@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import binascii
+import hashlib
 import json
+import threading
+import time
 import warnings
+from collections import OrderedDict
 from collections.abc import Sequence
 from typing import TYPE_CHECKING, Any
 
@@ -19,6 +23,7 @@ from .exceptions import (
     InvalidSignatureError,
     InvalidTokenError,
 )
+from . import utils
 from .utils import base64url_decode, base64url_encode
 from .warnings import RemovedInPyjwt3Warning
 
@@ -26,6 +31,159 @@ if TYPE_CHECKING:
     from .algorithms import AllowedPrivateKeys, AllowedPublicKeys
 
 
+class ParsedJWS:
+    """
+    A compact-serialized JWS split into its segments.
+
+    The header, payload and signature are base64url-decoded (and the header
+    JSON-parsed) on first access and kept, so a token parsed once can be
+    inspected with :meth:`PyJWS.get_unverified_header` and then passed to
+    :meth:`PyJWS.decode` without being decoded again.
+    """
+
+    __slots__ = ("signing_input", "_segments", "_header", "_payload", "_signature")
+
+    def __init__(self, jwt: str | bytes) -> None:
+        if isinstance(jwt, str):
+            jwt = jwt.encode("utf-8")
+
+        if not isinstance(jwt, bytes):
+            raise DecodeError(f"Invalid token type. Token must be a {bytes}")
+
+        try:
+            signing_input, crypto_segment = jwt.rsplit(b".", 1)
+            header_segment, payload_segment = signing_input.split(b".", 1)
+        except ValueError as err:
+            raise DecodeError("Not enough segments") from err
+
+        self.signing_input: bytes = signing_input
+        self._segments = (header_segment, payload_segment, crypto_segment)
+        self._header: dict[str, Any] | None = None
+        self._payload: bytes | None = None
+        self._signature: bytes | None = None
+
+    @property
+    def header(self) -> dict[str, Any]:
+        if self._header is None:
+            try:
+                header_data = base64url_decode(self._segments[0])
+            except (TypeError, binascii.Error) as err:
+                raise DecodeError("Invalid header padding") from err
+
+            try:
+                header = utils.json_loads(header_data)
+            except ValueError as e:
+                raise DecodeError(f"Invalid header string: {e}") from e
+
+            if not isinstance(header, dict):
+                raise DecodeError("Invalid header string: must be a json object")
+            self._header = header
+        return self._header
+
+    @property
+    def payload(self) -> bytes:
+        if self._payload is None:
+            try:
+                self._payload = base64url_decode(self._segments[1])
+            except (TypeError, binascii.Error) as err:
+                raise DecodeError("Invalid payload padding") from err
+        return self._payload
+
+    @property
+    def signature(self) -> bytes:
+        if self._signature is None:
+            try:
+                self._signature = base64url_decode(self._segments[2])
+            except (TypeError, binascii.Error) as err:
+                raise DecodeError("Invalid crypto padding") from err
+        return self._signature
+
+
+class SignatureCache:
+    """
+    A bounded memo of successfully verified signatures.
+
+    Entries are keyed by a digest of the signing input (which covers the
+    header, so the algorithm and "kid") and the signature, remember the key
+    that verified them, and expire at the token's "exp"; tokens without a
+    numeric "exp" are not cached. Failed verifications are never stored. The
+    least recently used entry is evicted beyond ``maxsize``.
+
+    ``str`` and ``bytes`` keys (HMAC secrets, PEM text) are remembered by a
+    digest of their content, so a secret read afresh for every call still
+    hits. Any other key only hits when it is the same object, e.g. a
+    long-lived :class:`PyJWK` or prepared key.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be greater than 0")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple[bytes, bytes], tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key_identity(key: Any) -> Any:
+        if isinstance(key, (str, bytes)):
+            return ("content", hashlib.sha256(utils.force_bytes(key)).digest())
+        return key
+
+    def get(self, signing_input: bytes, signature: bytes, key: Any) -> bool:
+        """Return whether this signature already verified with this key."""
+        cache_key = (hashlib.sha256(signing_input).digest(), signature)
+        identity = self._key_identity(key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                expires_at, verified_key = entry
+                if expires_at <= time.time():
+                    del self._entries[cache_key]
+                elif verified_key is identity or (
+                    isinstance(identity, tuple) and verified_key == identity
+                ):
+                    self._entries.move_to_end(cache_key)
+                    self.hits += 1
+                    return True
+            self.misses += 1
+            return False
+
+    def put(self, signing_input: bytes, signature: bytes, key: Any, payload: bytes) -> None:
+        """Remember a signature that just verified, until the payload's "exp"."""
+        try:
+            exp = utils.json_loads(payload).get("exp")
+        except (ValueError, TypeError, AttributeError):
+            return
+        if isinstance(exp, bool) or not isinstance(exp, (int, float)) or exp <= time.time():
+            return
+
+        cache_key = (hashlib.sha256(signing_input).digest(), signature)
+        with self._lock:
+            self._entries[cache_key] = (exp, self._key_identity(key))
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
 class PyJWS:
     header_typ = "JWT"
 
@@ -33,7 +191,10 @@ class PyJWS:
         self,
         algorithms: Sequence[str] | None = None,
         options: dict[str, Any] | None = None,
+        signature_cache: SignatureCache | None = None,
     ) -> None:
+        # Opt-in memo of verified signatures, for tokens presented repeatedly.
+        self.signature_cache = signature_cache
         self._algorithms = get_default_algorithms()
         self._valid_algs = (
             set(algorithms) if algorithms is not None else set(self._algorithms)
@@ -179,9 +340,17 @@ class PyJWS:
 
         return encoded_string.decode("utf-8")
 
+    def parse(self, jwt: str | bytes) -> ParsedJWS:
+        """
+        Split a token for decoding without decoding any segment yet.
+
+        The result can be passed wherever a token is accepted.
+        """
+        return ParsedJWS(jwt)
+
     def decode_complete(
         self,
-        jwt: str | bytes,
+        jwt: str | bytes | ParsedJWS,
         key: AllowedPublicKeys | PyJWK | str | bytes = "",
         algorithms: Sequence[str] | None = None,
         options: dict[str, Any] | None = None,
@@ -206,7 +375,12 @@ class PyJWS:
                 'It is required that you pass in a value for the "algorithms" argument when calling decode().'
             )
 
-        payload, signing_input, header, signature = self._load(jwt)
+        if isinstance(jwt, ParsedJWS):
+            # Segments are decoded in the same order as _load() would.
+            header, payload, signature = jwt.header, jwt.payload, jwt.signature
+            signing_input = jwt.signing_input
+        else:
+            payload, signing_input, header, signature = self._load(jwt)
 
         if header.get("b64", True) is False:
             if detached_payload is None:
@@ -217,7 +391,14 @@ class PyJWS:
             signing_input = b".".join([signing_input.rsplit(b".", 1)[0], payload])
 
         if verify_signature:
-            self._verify_signature(signing_input, header, signature, key, algorithms)
+            cache = self.signature_cache
+            if cache is not None:
+                # A cached signature still has to use an allowed algorithm.
+                self._check_algorithm(header, key, algorithms)
+            if cache is None or not cache.get(signing_input, signature, key):
+                self._verify_signature(signing_input, header, signature, key, algorithms)
+                if cache is not None:
+                    cache.put(signing_input, signature, key, payload)
 
         return {
             "payload": payload,
@@ -227,7 +408,7 @@ class PyJWS:
 
     def decode(
         self,
-        jwt: str | bytes,
+        jwt: str | bytes | ParsedJWS,
         key: AllowedPublicKeys | PyJWK | str | bytes = "",
         algorithms: Sequence[str] | None = None,
         options: dict[str, Any] | None = None,
@@ -247,54 +428,24 @@ class PyJWS:
         )
         return decoded["payload"]
 
-    def get_unverified_header(self, jwt: str | bytes) -> dict[str, Any]:
+    def get_unverified_header(self, jwt: str | bytes | ParsedJWS) -> dict[str, Any]:
         """Returns back the JWT header parameters as a dict()
 
         Note: The signature is not verified so the header parameters
         should not be fully trusted until signature verification is complete
         """
-        headers = self._load(jwt)[2]
+        if isinstance(jwt, ParsedJWS):
+            headers = jwt.header
+        else:
+            headers = self._load(jwt)[2]
         self._validate_headers(headers)
 
         return headers
 
     def _load(self, jwt: str | bytes) -> tuple[bytes, bytes, dict[str, Any], bytes]:
-        if isinstance(jwt, str):
-            jwt = jwt.encode("utf-8")
-
-        if not isinstance(jwt, bytes):
-            raise DecodeError(f"Invalid token type. Token must be a {bytes}")
-
-        try:
-            signing_input, crypto_segment = jwt.rsplit(b".", 1)
-            header_segment, payload_segment = signing_input.split(b".", 1)
-        except ValueError as err:
-            raise DecodeError("Not enough segments") from err
-
-        try:
-            header_data = base64url_decode(header_segment)
-        except (TypeError, binascii.Error) as err:
-            raise DecodeError("Invalid header padding") from err
-
-        try:
-            header = json.loads(header_data)
-        except ValueError as e:
-            raise DecodeError(f"Invalid header string: {e}") from e
-
-        if not isinstance(header, dict):
-            raise DecodeError("Invalid header string: must be a json object")
-
-        try:
-            payload = base64url_decode(payload_segment)
-        except (TypeError, binascii.Error) as err:
-            raise DecodeError("Invalid payload padding") from err
-
-        try:
-            signature = base64url_decode(crypto_segment)
-        except (TypeError, binascii.Error) as err:
-            raise DecodeError("Invalid crypto padding") from err
-
-        return (payload, signing_input, header, signature)
+        parsed = ParsedJWS(jwt)
+        header, payload, signature = parsed.header, parsed.payload, parsed.signature
+        return (payload, parsed.signing_input, header, signature)
 
     def _verify_signature(
         self,
@@ -304,15 +455,22 @@ class PyJWS:
         key: AllowedPublicKeys | PyJWK | str | bytes = "",
         algorithms: Sequence[str] | None = None,
     ) -> None:
-        if algorithms is None and isinstance(key, PyJWK):
-            algorithms = [key.algorithm_name]
-        try:
-            alg = header["alg"]
-        except KeyError:
-            raise InvalidAlgorithmError("Algorithm not specified") from None
+        alg_obj, prepared_key = self._resolve_verifier(header, key, algorithms)
+        if not alg_obj.verify(signing_input, prepared_key, signature):
+            raise InvalidSignatureError("Signature verification failed")
 
-        if not alg or (algorithms is not None and alg not in algorithms):
-            raise InvalidAlgorithmError("The specified alg value is not allowed")
+    def _resolve_verifier(
+        self,
+        header: dict[str, Any],
+        key: AllowedPublicKeys | PyJWK | str | bytes = "",
+        algorithms: Sequence[str] | None = None,
+    ) -> tuple[Algorithm, Any]:
+        """
+        Return the algorithm and prepared key that verify a token with this
+        header. The result only depends on the header's "alg", so callers
+        verifying many tokens may reuse it.
+        """
+        alg = self._check_algorithm(header, key, algorithms)
 
         if isinstance(key, PyJWK):
             alg_obj = key.Algorithm
@@ -324,8 +482,24 @@ class PyJWS:
                 raise InvalidAlgorithmError("Algorithm not supported") from e
             prepared_key = alg_obj.prepare_key(key)
 
-        if not alg_obj.verify(signing_input, prepared_key, signature):
-            raise InvalidSignatureError("Signature verification failed")
+        return alg_obj, prepared_key
+
+    def _check_algorithm(
+        self,
+        header: dict[str, Any],
+        key: AllowedPublicKeys | PyJWK | str | bytes = "",
+        algorithms: Sequence[str] | None = None,
+    ) -> str:
+        if algorithms is None and isinstance(key, PyJWK):
+            algorithms = [key.algorithm_name]
+        try:
+            alg = header["alg"]
+        except KeyError:
+            raise InvalidAlgorithmError("Algorithm not specified") from None
+
+        if not alg or (algorithms is not None and alg not in algorithms):
+            raise InvalidAlgorithmError("The specified alg value is not allowed")
+        return alg
 
     def _validate_headers(self, headers: dict[str, Any]) -> None:
         if "kid" in headers:
@@ -340,7 +514,13 @@ _jws_global_obj = PyJWS()
 encode = _jws_global_obj.encode
 decode_complete = _jws_global_obj.decode_complete
 decode = _jws_global_obj.decode
+parse = _jws_global_obj.parse
 register_algorithm = _jws_global_obj.register_algorithm
 unregister_algorithm = _jws_global_obj.unregister_algorithm
 get_algorithm_by_name = _jws_global_obj.get_algorithm_by_name
 get_unverified_header = _jws_global_obj.get_unverified_header
+
+
+def set_signature_cache(cache: SignatureCache | None) -> None:
+    """Memoize verifications in the module-level decode functions, or stop if None."""
+    _jws_global_obj.signature_cache = cache
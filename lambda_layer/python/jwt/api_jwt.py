@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import json
+import time
 import warnings
 from calendar import timegm
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Mapping, Sequence
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
-from . import api_jws
+from . import api_jws, utils
+from .api_jwk import PyJWK, PyJWKSet
 from .exceptions import (
     DecodeError,
     ExpiredSignatureError,
@@ -16,14 +19,17 @@ from .exceptions import (
     InvalidIssuedAtError,
     InvalidIssuerError,
     InvalidJTIError,
+    InvalidSignatureError,
     InvalidSubjectError,
+    InvalidTokenError,
     MissingRequiredClaimError,
+    PyJWTError,
 )
 from .warnings import RemovedInPyjwt3Warning
 
 if TYPE_CHECKING:
     from .algorithms import AllowedPrivateKeys, AllowedPublicKeys
-    from .api_jwk import PyJWK
+    from .api_jws import ParsedJWS
 
 
 class PyJWT:
@@ -104,7 +110,7 @@ class PyJWT:
 
     def decode_complete(
         self,
-        jwt: str | bytes,
+        jwt: str | bytes | ParsedJWS,
         key: AllowedPublicKeys | PyJWK | str | bytes = "",
         algorithms: Sequence[str] | None = None,
         options: dict[str, Any] | None = None,
@@ -118,6 +124,7 @@ class PyJWT:
         issuer: str | Sequence[str] | None = None,
         subject: str | None = None,
         leeway: float | timedelta = 0,
+        verifier: ClaimsVerifier | None = None,
         # kwargs
         **kwargs: Any,
     ) -> dict[str, Any]:
@@ -129,8 +136,25 @@ class PyJWT:
                 RemovedInPyjwt3Warning,
                 stacklevel=2,
             )
-        options = dict(options or {})  # shallow-copy or initialize an empty dict
-        options.setdefault("verify_signature", True)
+        if verifier is not None:
+            if (options, audience, issuer, subject, leeway) != (None, None, None, None, 0):
+                raise TypeError(
+                    "options, audience, issuer, subject and leeway are taken "
+                    "from the verifier when one is passed"
+                )
+            decoded = api_jws.decode_complete(
+                jwt,
+                key=key,
+                algorithms=verifier.algorithms if algorithms is None else algorithms,
+                options=verifier.options,
+                detached_payload=detached_payload,
+            )
+            payload = self._decode_payload(decoded)
+            verifier.validate(payload)
+            decoded["payload"] = payload
+            return decoded
+
+        options = self._decode_options(options)
 
         # If the user has set the legacy `verify` argument, and it doesn't match
         # what the relevant `options` entry for the argument is, inform the user
@@ -144,15 +168,6 @@ class PyJWT:
                 stacklevel=2,
             )
 
-        if not options["verify_signature"]:
-            options.setdefault("verify_exp", False)
-            options.setdefault("verify_nbf", False)
-            options.setdefault("verify_iat", False)
-            options.setdefault("verify_aud", False)
-            options.setdefault("verify_iss", False)
-            options.setdefault("verify_sub", False)
-            options.setdefault("verify_jti", False)
-
         decoded = api_jws.decode_complete(
             jwt,
             key=key,
@@ -176,6 +191,152 @@ class PyJWT:
         decoded["payload"] = payload
         return decoded
 
+    @staticmethod
+    def _decode_options(options: dict[str, Any] | None) -> dict[str, Any]:
+        """
+        Copy the caller's options, turning every claim check off by default
+        when the signature is not verified.
+        """
+        options = dict(options or {})  # shallow-copy or initialize an empty dict
+        options.setdefault("verify_signature", True)
+
+        if not options["verify_signature"]:
+            options.setdefault("verify_exp", False)
+            options.setdefault("verify_nbf", False)
+            options.setdefault("verify_iat", False)
+            options.setdefault("verify_aud", False)
+            options.setdefault("verify_iss", False)
+            options.setdefault("verify_sub", False)
+            options.setdefault("verify_jti", False)
+        return options
+
+    def decode_many(
+        self,
+        jwts: Iterable[str | bytes | ParsedJWS],
+        key: AllowedPublicKeys | PyJWK | PyJWKSet | Mapping[str, Any] | str | bytes = "",
+        algorithms: Sequence[str] | None = None,
+        options: dict[str, Any] | None = None,
+        audience: str | Iterable[str] | None = None,
+        issuer: str | Sequence[str] | None = None,
+        subject: str | None = None,
+        leeway: float | timedelta = 0,
+    ) -> list[dict[str, Any] | PyJWTError]:
+        """
+        Decode a batch of tokens that share one key set and one set of options.
+
+        ``key`` may be a single key, a :class:`PyJWKSet` or a mapping of key
+        ids to keys. Options are merged once for the whole batch, tokens are
+        grouped by their "kid" header, and each group's key is looked up and
+        prepared once.
+
+        Returns one entry per token, in order: the decoded payload, or the
+        :class:`PyJWTError` that token failed with. Detached payloads are not
+        supported.
+        """
+        verifier = self.verifier(
+            options=options,
+            algorithms=algorithms,
+            audience=audience,
+            issuer=issuer,
+            subject=subject,
+            leeway=leeway,
+        )
+        verify_signature = verifier.verify_signature
+        if verify_signature and not algorithms and not isinstance(key, (PyJWK, PyJWKSet)):
+            raise DecodeError(
+                'It is required that you pass in a value for the "algorithms" argument when calling decode_many().'
+            )
+
+        jws = api_jws._jws_global_obj
+        results: list[Any] = []
+        groups: dict[Any, list[tuple[int, ParsedJWS]]] = {}
+        for index, jwt in enumerate(jwts):
+            results.append(None)
+            try:
+                parsed = jwt if isinstance(jwt, api_jws.ParsedJWS) else jws.parse(jwt)
+                kid = jws.get_unverified_header(parsed).get("kid")
+            except PyJWTError as e:
+                results[index] = e
+                continue
+            groups.setdefault(kid, []).append((index, parsed))
+
+        for kid, members in groups.items():
+            verifiers: dict[Any, Any] = {}
+            try:
+                group_key = self._batch_key(key, kid)
+            except PyJWTError as e:
+                for index, _ in members:
+                    results[index] = e
+                continue
+
+            for index, parsed in members:
+                try:
+                    header = parsed.header
+                    if header.get("b64", True) is False:
+                        raise DecodeError("decode_many() does not support detached payloads")
+
+                    if verify_signature:
+                        alg = header.get("alg")
+                        if alg not in verifiers:
+                            verifiers[alg] = jws._resolve_verifier(header, group_key, algorithms)
+                        alg_obj, prepared_key = verifiers[alg]
+                        cache = jws.signature_cache
+                        if cache is None or not cache.get(parsed.signing_input, parsed.signature, group_key):
+                            if not alg_obj.verify(parsed.signing_input, prepared_key, parsed.signature):
+                                raise InvalidSignatureError("Signature verification failed")
+                            if cache is not None:
+                                cache.put(parsed.signing_input, parsed.signature, group_key, parsed.payload)
+
+                    payload = self._decode_payload({
+                        "payload": parsed.payload,
+                        "header": header,
+                        "signature": parsed.signature,
+                    })
+                    verifier.validate(payload)
+                    results[index] = payload
+                except PyJWTError as e:
+                    results[index] = e
+
+        return results
+
+    def verifier(
+        self,
+        options: dict[str, Any] | None = None,
+        algorithms: Sequence[str] | None = None,
+        audience: str | Iterable[str] | None = None,
+        issuer: str | Sequence[str] | None = None,
+        subject: str | None = None,
+        leeway: float | timedelta = 0,
+    ) -> ClaimsVerifier:
+        """
+        Build a :class:`ClaimsVerifier` for repeated ``decode(..., verifier=...)``
+        calls with the same options and expected claims.
+        """
+        return ClaimsVerifier(
+            self,
+            options=options,
+            algorithms=algorithms,
+            audience=audience,
+            issuer=issuer,
+            subject=subject,
+            leeway=leeway,
+        )
+
+    @staticmethod
+    def _batch_key(key: Any, kid: str | None) -> Any:
+        if isinstance(key, PyJWKSet):
+            try:
+                return key[kid]
+            except KeyError:
+                raise InvalidTokenError(
+                    f"Unable to find a signing key that matches: {kid}"
+                ) from None
+        if isinstance(key, Mapping):
+            if kid not in key:
+                raise InvalidTokenError(f"Unable to find a signing key that matches: {kid}")
+            return key[kid]
+        return key
+
     def _decode_payload(self, decoded: dict[str, Any]) -> Any:
         """
         Decode the payload from a JWS dictionary (payload, signature, header).
@@ -185,7 +346,7 @@ class PyJWT:
         payloads.
         """
         try:
-            payload = json.loads(decoded["payload"])
+            payload = utils.json_loads(decoded["payload"])
         except ValueError as e:
             raise DecodeError(f"Invalid payload string: {e}") from e
         if not isinstance(payload, dict):
@@ -194,7 +355,7 @@ class PyJWT:
 
     def decode(
         self,
-        jwt: str | bytes,
+        jwt: str | bytes | ParsedJWS,
         key: AllowedPublicKeys | PyJWK | str | bytes = "",
         algorithms: Sequence[str] | None = None,
         options: dict[str, Any] | None = None,
@@ -208,6 +369,7 @@ class PyJWT:
         subject: str | None = None,
         issuer: str | Sequence[str] | None = None,
         leeway: float | timedelta = 0,
+        verifier: ClaimsVerifier | None = None,
         # kwargs
         **kwargs: Any,
     ) -> Any:
@@ -230,6 +392,7 @@ class PyJWT:
             subject=subject,
             issuer=issuer,
             leeway=leeway,
+            verifier=verifier,
         )
         return decoded["payload"]
 
@@ -427,7 +590,98 @@ class PyJWT:
                 raise InvalidIssuerError("Invalid issuer")
 
 
+class ClaimsVerifier:
+    """
+    The claim checks of :meth:`PyJWT.decode` compiled once for a fixed set of
+    options, algorithms and expected audience, issuer and subject.
+
+    Options are merged and every disabled or no-op check is dropped when the
+    verifier is built, so :meth:`validate` only runs what applies. The checks
+    themselves are the :class:`PyJWT` instance's ``_validate_*`` methods, in
+    the same order and with the same errors as ``_validate_claims``.
+    """
+
+    __slots__ = (
+        "options",
+        "algorithms",
+        "verify_signature",
+        "_require",
+        "_leeway",
+        "_time_checks",
+        "_checks",
+    )
+
+    def __init__(
+        self,
+        jwt: PyJWT,
+        options: dict[str, Any] | None = None,
+        algorithms: Sequence[str] | None = None,
+        audience: str | Iterable[str] | None = None,
+        issuer: str | Sequence[str] | None = None,
+        subject: str | None = None,
+        leeway: float | timedelta = 0,
+    ) -> None:
+        if isinstance(leeway, timedelta):
+            leeway = leeway.total_seconds()
+
+        if audience is not None and not isinstance(audience, (str, Iterable)):
+            raise TypeError("audience must be a string, iterable or None")
+
+        options = jwt._decode_options(options)
+        merged_options = {**jwt.options, **options}
+
+        # Passed on to the JWS layer, which merges them with its own defaults.
+        self.options = options
+        self.algorithms = algorithms
+        self.verify_signature: bool = merged_options["verify_signature"]
+
+        self._require = tuple(merged_options["require"])
+        self._leeway = leeway
+        self._time_checks = tuple(
+            (claim, check)
+            for claim, check in (
+                ("iat", jwt._validate_iat),
+                ("nbf", jwt._validate_nbf),
+                ("exp", jwt._validate_exp),
+            )
+            if merged_options[f"verify_{claim}"]
+        )
+
+        checks: list[Any] = []
+        if merged_options["verify_iss"] and issuer is not None:
+            checks.append(partial(jwt._validate_iss, issuer=issuer))
+        if merged_options["verify_aud"]:
+            checks.append(
+                partial(
+                    jwt._validate_aud,
+                    audience=audience,
+                    strict=merged_options.get("strict_aud", False),
+                )
+            )
+        if merged_options["verify_sub"]:
+            checks.append(partial(jwt._validate_sub, subject=subject))
+        if merged_options["verify_jti"]:
+            checks.append(jwt._validate_jti)
+        self._checks = tuple(checks)
+
+    def validate(self, payload: dict[str, Any]) -> None:
+        for claim in self._require:
+            if payload.get(claim) is None:
+                raise MissingRequiredClaimError(claim)
+
+        if self._time_checks:
+            now = time.time()
+            for claim, check in self._time_checks:
+                if claim in payload:
+                    check(payload, now, self._leeway)
+
+        for check in self._checks:
+            check(payload)
+
+
 _jwt_global_obj = PyJWT()
 encode = _jwt_global_obj.encode
 decode_complete = _jwt_global_obj.decode_complete
 decode = _jwt_global_obj.decode
+decode_many = _jwt_global_obj.decode_many
+verifier = _jwt_global_obj.verifier
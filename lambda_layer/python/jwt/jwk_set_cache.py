@@ -1,5 +1,9 @@
+import hashlib
+import os
+import pickle
+import tempfile
 import time
-from typing import Optional
+from typing import Any, Optional, Tuple
 
 from .api_jwk import PyJWKSet, PyJWTSetWithTimestamp
 
@@ -9,23 +13,110 @@ class JWKSetCache:
         self.jwk_set_with_timestamp: Optional[PyJWTSetWithTimestamp] = None
         self.lifespan = lifespan
 
-    def put(self, jwk_set: PyJWKSet) -> None:
+    def put(self, jwk_set: PyJWKSet, age: float = 0.0) -> None:
         if jwk_set is not None:
-            self.jwk_set_with_timestamp = PyJWTSetWithTimestamp(jwk_set)
+            entry = PyJWTSetWithTimestamp(jwk_set)
+            # A set loaded from a longer-lived cache tier expires with it.
+            entry.timestamp -= age
+            self.jwk_set_with_timestamp = entry
         else:
             # clear cache
             self.jwk_set_with_timestamp = None
 
     def get(self) -> Optional[PyJWKSet]:
-        if self.jwk_set_with_timestamp is None or self.is_expired():
+        # Read the entry once: another thread may replace it concurrently.
+        entry = self.jwk_set_with_timestamp
+        if entry is None or self._expired(entry):
             return None
 
-        return self.jwk_set_with_timestamp.get_jwk_set()
+        return entry.get_jwk_set()
+
+    def get_stale(self) -> Optional[PyJWKSet]:
+        """Return the last cached set, even if it has expired."""
+        entry = self.jwk_set_with_timestamp
+        if entry is None:
+            return None
+
+        return entry.get_jwk_set()
 
     def is_expired(self) -> bool:
+        entry = self.jwk_set_with_timestamp
+        return entry is not None and self._expired(entry)
+
+    def _expired(self, entry: PyJWTSetWithTimestamp) -> bool:
         return (
-            self.jwk_set_with_timestamp is not None
-            and self.lifespan > -1
-            and time.monotonic()
-            > self.jwk_set_with_timestamp.get_timestamp() + self.lifespan
+            self.lifespan > -1
+            and time.monotonic() > entry.get_timestamp() + self.lifespan
         )
+
+
+class JWKSetFileCache:
+    """
+    A JWK set and its parsed :class:`PyJWKSet` pickled to a file, shared by
+    every process that points at the same directory.
+
+    Entries expire ``lifespan`` seconds after the file was last written. Files
+    are replaced atomically. Loading runs ``pickle.load`` on the file, which
+    executes whatever code it holds, so a directory under a shared ``/tmp`` is
+    only as safe as the one check made before it: the file must be owned by
+    the current user and not writable by group or others. The last entry
+    loaded is kept in memory and reused until the file is replaced or touched,
+    so repeated lookups do not unpickle it again.
+    """
+
+    VERSION = 1
+
+    def __init__(self, directory: str, uri: str, lifespan: float) -> None:
+        self.directory = directory
+        self.lifespan = lifespan
+        digest = hashlib.sha256(uri.encode("utf-8")).hexdigest()[:32]
+        self.path = os.path.join(directory, f"jwks-{digest}.pickle")
+        # (device, inode, mtime) of the file last loaded, with its contents.
+        self._loaded: Optional[Tuple[Tuple[int, int, int], Any, PyJWKSet]] = None
+
+    def get(self) -> Optional[Tuple[Any, PyJWKSet, float]]:
+        """Return ``(data, jwk_set, age)`` if a fresh entry exists."""
+        try:
+            with open(self.path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                age = time.time() - stat.st_mtime
+                if age > self.lifespan or not self._trusted(stat):
+                    return None
+                identity = (stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+                loaded = self._loaded
+                if loaded is not None and loaded[0] == identity:
+                    return loaded[1], loaded[2], max(age, 0.0)
+                version, data, jwk_set = pickle.load(f)
+        except Exception:
+            # Missing, unreadable or from another version: fetch instead.
+            return None
+
+        if version != self.VERSION or not isinstance(jwk_set, PyJWKSet):
+            return None
+        self._loaded = (identity, data, jwk_set)
+        return data, jwk_set, max(age, 0.0)
+
+    def put(self, data: Any, jwk_set: PyJWKSet) -> None:
+        """Write the entry; failures are ignored, the cache is best effort."""
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".jwks-")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((self.VERSION, data, jwk_set), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            tmp_path = None
+        except Exception:
+            pass
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _trusted(stat: os.stat_result) -> bool:
+        getuid = getattr(os, "getuid", None)
+        owned = getuid is None or stat.st_uid == getuid()
+        return owned and not stat.st_mode & 0o022
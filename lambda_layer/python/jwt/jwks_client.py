@@ -1,14 +1,20 @@
+import asyncio
 import json
+import ssl
+import threading
+import time
+import urllib.parse
 import urllib.request
+from concurrent.futures import Future
 from functools import lru_cache
 from ssl import SSLContext
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from urllib.error import URLError
 
 from .api_jwk import PyJWK, PyJWKSet
 from .api_jwt import decode_complete as decode_token
 from .exceptions import PyJWKClientConnectionError, PyJWKClientError
-from .jwk_set_cache import JWKSetCache
+from .jwk_set_cache import JWKSetCache, JWKSetFileCache
 
 
 class PyJWKClient:
@@ -22,6 +28,10 @@ class PyJWKClient:
         headers: Optional[Dict[str, Any]] = None,
         timeout: int = 30,
         ssl_context: Optional[SSLContext] = None,
+        stale_while_revalidate: bool = False,
+        refresh_backoff: float = 1.0,
+        max_refresh_backoff: float = 300.0,
+        cache_dir: Optional[str] = None,
     ):
         if headers is None:
             headers = {}
@@ -31,17 +41,44 @@ class PyJWKClient:
         self.timeout = timeout
         self.ssl_context = ssl_context
 
-        if cache_jwk_set:
-            # Init jwt set cache with default or given lifespan.
+        # With stale_while_revalidate, an expired set keeps being served while
+        # one background thread fetches its replacement; failed fetches keep
+        # the last good set and are retried with exponential backoff.
+        self.stale_while_revalidate = stale_while_revalidate
+        self.refresh_backoff = refresh_backoff
+        self.max_refresh_backoff = max_refresh_backoff
+        self._flight_lock = threading.Lock()
+        self._flight: Optional[Future] = None
+        self._refresh_failures = 0
+        self._retry_at = 0.0
+
+        # The raw set last parsed, with its PyJWKSet, signing keys and
+        # kid -> signing key index, so cache hits skip PyJWKSet.from_dict.
+        self._parsed: Optional[
+            Tuple[Any, PyJWKSet, List[PyJWK], Dict[Optional[str], PyJWK]]
+        ] = None
+
+        if cache_jwk_set or cache_dir is not None:
+            # Both cache tiers expire entries after lifespan seconds.
             # Default lifespan is 300 seconds (5 minutes).
             if lifespan <= 0:
                 raise PyJWKClientError(
                     f'Lifespan must be greater than 0, the input is "{lifespan}"'
                 )
+
+        if cache_jwk_set:
             self.jwk_set_cache = JWKSetCache(lifespan)
         else:
             self.jwk_set_cache = None
 
+        # Optionally share fetched sets, already parsed, with other processes
+        # and later containers through files in cache_dir (e.g. under /tmp).
+        # The files are unpickled; see JWKSetFileCache for the one check
+        # that guards them.
+        self.jwk_file_cache: Optional[JWKSetFileCache] = None
+        if cache_dir is not None:
+            self.jwk_file_cache = JWKSetFileCache(cache_dir, uri, lifespan)
+
         if cache_keys:
             # Cache signing keys
             # Ignore mypy (https://github.com/python/mypy/issues/2427)
@@ -50,7 +87,6 @@ class PyJWKClient:
             )  # type: ignore
 
     def fetch_data(self) -> Any:
-        jwk_set: Any = None
         try:
             r = urllib.request.Request(url=self.uri, headers=self.headers)
             with urllib.request.urlopen(
@@ -58,49 +94,173 @@ class PyJWKClient:
             ) as response:
                 jwk_set = json.load(response)
         except (URLError, TimeoutError) as e:
+            # Keep whatever is cached: a failed fetch says nothing about the keys.
             raise PyJWKClientConnectionError(
                 f'Fail to fetch data from the url, err: "{e}"'
             ) from e
-        else:
-            return jwk_set
-        finally:
-            if self.jwk_set_cache is not None:
-                self.jwk_set_cache.put(jwk_set)
+
+        if self.jwk_set_cache is not None:
+            self.jwk_set_cache.put(jwk_set)
+        return jwk_set
 
     def get_jwk_set(self, refresh: bool = False) -> PyJWKSet:
-        data = None
-        if self.jwk_set_cache is not None and not refresh:
-            data = self.jwk_set_cache.get()
+        return self._get_parsed(refresh)[1]
+
+    def _get_parsed(
+        self, refresh: bool = False
+    ) -> Tuple[Any, PyJWKSet, List[PyJWK], Dict[Optional[str], PyJWK]]:
+        data, stale = self._cached_data(refresh)
+        if stale:
+            self._refresh_in_background()
 
         if data is None:
-            data = self.fetch_data()
+            parsed = self._file_cached(refresh)
+            if parsed is not None:
+                return parsed
+            if self.stale_while_revalidate:
+                data = self._fetch_shared()
+            else:
+                data = self.fetch_data()
+
+        return self._parse(data)
+
+    def _cached_data(self, refresh: bool) -> Tuple[Any, bool]:
+        """Return the set held in memory (or None), and whether it is stale."""
+        if self.jwk_set_cache is None or refresh:
+            return None, False
+
+        data = self.jwk_set_cache.get()
+        if data is None and self.stale_while_revalidate:
+            data = self.jwk_set_cache.get_stale()
+            return data, data is not None
+        return data, False
+
+    def _file_cached(
+        self, refresh: bool
+    ) -> Optional[Tuple[Any, PyJWKSet, List[PyJWK], Dict[Optional[str], PyJWK]]]:
+        if self.jwk_file_cache is None or refresh:
+            return None
+
+        entry = self.jwk_file_cache.get()
+        if entry is None:
+            return None
+
+        data, jwk_set, age = entry
+        if self.jwk_set_cache is not None:
+            self.jwk_set_cache.put(data, age=age)
+        parsed = self._parsed
+        if parsed is not None and parsed[0] is data:
+            return parsed
+        return self._index(data, jwk_set)
+
+    def _parse(
+        self, data: Any
+    ) -> Tuple[Any, PyJWKSet, List[PyJWK], Dict[Optional[str], PyJWK]]:
+        parsed = self._parsed
+        if parsed is not None and parsed[0] is data:
+            return parsed
 
         if not isinstance(data, dict):
             raise PyJWKClientError("The JWKS endpoint did not return a JSON object")
 
-        return PyJWKSet.from_dict(data)
+        jwk_set = PyJWKSet.from_dict(data)
+        if self.jwk_file_cache is not None:
+            # Newly fetched here or by a background refresh: share it.
+            self.jwk_file_cache.put(data, jwk_set)
+        return self._index(data, jwk_set)
 
-    def get_signing_keys(self, refresh: bool = False) -> List[PyJWK]:
-        jwk_set = self.get_jwk_set(refresh)
+    def _index(
+        self, data: Any, jwk_set: PyJWKSet
+    ) -> Tuple[Any, PyJWKSet, List[PyJWK], Dict[Optional[str], PyJWK]]:
         signing_keys = [
             jwk_set_key
             for jwk_set_key in jwk_set.keys
             if jwk_set_key.public_key_use in ["sig", None] and jwk_set_key.key_id
         ]
+        by_kid: Dict[Optional[str], PyJWK] = {}
+        for signing_key in signing_keys:
+            by_kid.setdefault(signing_key.key_id, signing_key)
+
+        parsed = self._parsed = (data, jwk_set, signing_keys, by_kid)
+        return parsed
+
+    def _start_flight(self) -> Tuple[Future, bool]:
+        """Return the in-flight fetch, and whether the caller must run it."""
+        with self._flight_lock:
+            if self._flight is not None:
+                return self._flight, False
+            self._flight = Future()
+            return self._flight, True
+
+    def _run_flight(self, flight: Future) -> None:
+        error: Optional[BaseException] = None
+        try:
+            data = self.fetch_data()
+        except BaseException as e:
+            error = e
+        try:
+            with self._flight_lock:
+                self._flight = None
+                self._record_fetch(failed=error is not None)
+        finally:
+            # Settled whatever happens above: every lookup waiting on this
+            # flight would otherwise block forever.
+            if error is None:
+                flight.set_result(data)
+            else:
+                flight.set_exception(error)
+
+    def _record_fetch(self, failed: bool) -> None:
+        """Track consecutive failures and when a background refresh may retry."""
+        if failed:
+            self._refresh_failures += 1
+            # The exponent is capped so a long outage cannot overflow the delay.
+            exponent = min(self._refresh_failures - 1, 32)
+            delay = self.refresh_backoff * 2 ** exponent
+            self._retry_at = time.monotonic() + min(delay, self.max_refresh_backoff)
+        else:
+            self._refresh_failures = 0
+            self._retry_at = 0.0
+
+    def _fetch_shared(self) -> Any:
+        """Fetch the set, sharing one request among concurrent callers."""
+        flight, leader = self._start_flight()
+        if leader:
+            self._run_flight(flight)
+        return flight.result()
+
+    def _refresh_in_background(self) -> None:
+        if time.monotonic() < self._retry_at:
+            return
+
+        flight, leader = self._start_flight()
+        if leader:
+            threading.Thread(
+                target=self._run_flight, args=(flight,), name="jwks-refresh", daemon=True
+            ).start()
+
+    def get_signing_keys(self, refresh: bool = False) -> List[PyJWK]:
+        signing_keys = self._get_parsed(refresh)[2]
 
         if not signing_keys:
             raise PyJWKClientError("The JWKS endpoint did not contain any signing keys")
 
-        return signing_keys
+        return list(signing_keys)
+
+    def _signing_keys_by_kid(self, refresh: bool = False) -> Dict[Optional[str], PyJWK]:
+        by_kid = self._get_parsed(refresh)[3]
+
+        if not by_kid:
+            raise PyJWKClientError("The JWKS endpoint did not contain any signing keys")
+
+        return by_kid
 
     def get_signing_key(self, kid: str) -> PyJWK:
-        signing_keys = self.get_signing_keys()
-        signing_key = self.match_kid(signing_keys, kid)
+        signing_key = self._signing_keys_by_kid().get(kid)
 
         if not signing_key:
             # If no matching signing key from the jwk set, refresh the jwk set and try again.
-            signing_keys = self.get_signing_keys(refresh=True)
-            signing_key = self.match_kid(signing_keys, kid)
+            signing_key = self._signing_keys_by_kid(refresh=True).get(kid)
 
             if not signing_key:
                 raise PyJWKClientError(
@@ -124,3 +284,260 @@ class PyJWKClient:
                 break
 
         return signing_key
+
+
+# An async HTTP GET: (url, headers, timeout, ssl_context) -> response body.
+AsyncTransport = Callable[
+    [str, Dict[str, Any], float, Optional[SSLContext]], Awaitable[bytes]
+]
+
+
+async def asyncio_transport(
+    url: str,
+    headers: Dict[str, Any],
+    timeout: float,
+    ssl_context: Optional[SSLContext] = None,
+) -> bytes:
+    """
+    GET ``url`` over a plain asyncio stream connection and return the body.
+
+    A minimal HTTP/1.1 client for JWKS endpoints: one request per connection,
+    no redirects, identity or chunked bodies. Non-200 answers raise
+    :class:`PyJWKClientConnectionError`.
+    """
+    return await asyncio.wait_for(_asyncio_get(url, headers, ssl_context), timeout)
+
+
+async def _asyncio_get(
+    url: str, headers: Dict[str, Any], ssl_context: Optional[SSLContext]
+) -> bytes:
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise PyJWKClientConnectionError(f'Unsupported JWKS url: "{url}"')
+
+    secure = parts.scheme == "https"
+    context = (ssl_context or ssl.create_default_context()) if secure else None
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, parts.port or (443 if secure else 80), ssl=context
+    )
+    try:
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        request_headers = {
+            "Host": parts.netloc,
+            "Accept": "application/json",
+            "Accept-Encoding": "identity",
+            "Connection": "close",
+            **headers,
+        }
+        request = f"GET {target} HTTP/1.1\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in request_headers.items()
+        )
+        writer.write(request.encode("latin-1") + b"\r\n")
+        await writer.drain()
+
+        status_line = await reader.readline()
+        try:
+            status = int(status_line.split(None, 2)[1])
+        except (IndexError, ValueError):
+            raise PyJWKClientConnectionError(
+                f'Malformed response from the url: "{status_line!r}"'
+            ) from None
+
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if status != 200:
+            raise PyJWKClientConnectionError(
+                f'Fail to fetch data from the url, err: "HTTP {status}"'
+            )
+
+        if "chunked" in response_headers.get("transfer-encoding", "").lower():
+            return await _read_chunked(reader)
+        if "content-length" in response_headers:
+            return await reader.readexactly(int(response_headers["content-length"]))
+        return await reader.read()
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks = []
+    while True:
+        size = int((await reader.readline()).split(b";", 1)[0], 16)
+        if size == 0:
+            # Skip any trailers up to the final blank line.
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readline()
+
+
+class AsyncPyJWKClient(PyJWKClient):
+    """
+    :class:`PyJWKClient` for asyncio code: the same memory, file and
+    stale-while-revalidate caching, with awaitable lookups.
+
+    Fetches go through ``transport`` (:func:`asyncio_transport` by default) and
+    are always single-flight: concurrent lookups that miss the cache await one
+    shared request, and a stale set is refreshed by one background task.
+
+    A background refresh only lands if its event loop keeps running. Once one
+    has been cancelled, e.g. because each request runs its own
+    ``asyncio.run()`` and the loop closed first, later stale lookups await the
+    refresh themselves instead, keeping the stale set if it fails.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        cache_jwk_set: bool = True,
+        lifespan: int = 300,
+        headers: Optional[Dict[str, Any]] = None,
+        timeout: int = 30,
+        ssl_context: Optional[SSLContext] = None,
+        stale_while_revalidate: bool = False,
+        refresh_backoff: float = 1.0,
+        max_refresh_backoff: float = 300.0,
+        cache_dir: Optional[str] = None,
+        transport: Optional[AsyncTransport] = None,
+    ):
+        super().__init__(
+            uri,
+            cache_jwk_set=cache_jwk_set,
+            lifespan=lifespan,
+            headers=headers,
+            timeout=timeout,
+            ssl_context=ssl_context,
+            stale_while_revalidate=stale_while_revalidate,
+            refresh_backoff=refresh_backoff,
+            max_refresh_backoff=max_refresh_backoff,
+            cache_dir=cache_dir,
+        )
+        self.transport = transport or asyncio_transport
+        self._task: Optional[asyncio.Future] = None
+        self._refresh_cancelled = False
+
+    async def fetch_data(self) -> Any:  # type: ignore[override]
+        try:
+            body = await self.transport(
+                self.uri, self.headers, self.timeout, self.ssl_context
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            raise PyJWKClientConnectionError(
+                f'Fail to fetch data from the url, err: "{e!r}"'
+            ) from e
+        jwk_set = json.loads(body)
+
+        if self.jwk_set_cache is not None:
+            self.jwk_set_cache.put(jwk_set)
+        return jwk_set
+
+    async def get_jwk_set(self, refresh: bool = False) -> PyJWKSet:  # type: ignore[override]
+        return (await self._get_parsed_async(refresh))[1]
+
+    async def _get_parsed_async(
+        self, refresh: bool = False
+    ) -> Tuple[Any, PyJWKSet, List[PyJWK], Dict[Optional[str], PyJWK]]:
+        data, stale = self._cached_data(refresh)
+        if stale and self._refresh_cancelled:
+            data = await self._refresh_in_foreground(data)
+        elif stale:
+            self._refresh_in_background()
+
+        if data is None:
+            parsed = self._file_cached(refresh)
+            if parsed is not None:
+                return parsed
+            data = await self._fetch_shared()
+
+        return self._parse(data)
+
+    async def _refresh_in_foreground(self, stale: Any) -> Any:
+        """Await the refresh of a stale set; on failure keep serving it."""
+        if time.monotonic() < self._retry_at:
+            return stale
+        try:
+            return await self._fetch_shared()
+        except Exception:
+            return stale
+
+    def _start_task(self) -> asyncio.Future:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run_task())
+            # Retrieve failures nobody awaited (background refreshes).
+            self._task.add_done_callback(
+                lambda task: task.cancelled() or task.exception()
+            )
+        return self._task
+
+    async def _run_task(self) -> Any:
+        try:
+            data = await self.fetch_data()
+        except asyncio.CancelledError:
+            # Usually the loop shutting down under a background refresh.
+            self._refresh_cancelled = True
+            raise
+        except Exception:
+            self._record_fetch(failed=True)
+            raise
+        else:
+            self._record_fetch(failed=False)
+            return data
+        finally:
+            self._task = None
+
+    async def _fetch_shared(self) -> Any:  # type: ignore[override]
+        # Shielded: one cancelled caller must not cancel everyone's fetch.
+        return await asyncio.shield(self._start_task())
+
+    def _refresh_in_background(self) -> None:
+        if time.monotonic() < self._retry_at:
+            return
+        self._start_task()
+
+    async def get_signing_keys(self, refresh: bool = False) -> List[PyJWK]:  # type: ignore[override]
+        signing_keys = (await self._get_parsed_async(refresh))[2]
+
+        if not signing_keys:
+            raise PyJWKClientError("The JWKS endpoint did not contain any signing keys")
+
+        return list(signing_keys)
+
+    async def _signing_key(self, kid: str, refresh: bool = False) -> Optional[PyJWK]:
+        by_kid = (await self._get_parsed_async(refresh))[3]
+
+        if not by_kid:
+            raise PyJWKClientError("The JWKS endpoint did not contain any signing keys")
+
+        return by_kid.get(kid)
+
+    async def get_signing_key(self, kid: str) -> PyJWK:  # type: ignore[override]
+        signing_key = await self._signing_key(kid)
+
+        if not signing_key:
+            # If no matching signing key from the jwk set, refresh the jwk set and try again.
+            signing_key = await self._signing_key(kid, refresh=True)
+
+            if not signing_key:
+                raise PyJWKClientError(
+                    f'Unable to find a signing key that matches: "{kid}"'
+                )
+
+        return signing_key
+
+    async def get_signing_key_from_jwt(self, token: str) -> PyJWK:  # type: ignore[override]
+        unverified = decode_token(token, options={"verify_signature": False})
+        header = unverified["header"]
+        return await self.get_signing_key(header.get("kid"))
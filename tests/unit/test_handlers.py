@@ -0,0 +1,318 @@
+import importlib
+import json
+import os
+import threading
+
+import pytest
+
+from benchmarks import fakes, synthetic, use_handler_paths
+from benchmarks.worker import HANDLER_ENVIRONMENT
+
+os.environ.update(HANDLER_ENVIRONMENT)
+use_handler_paths()
+
+
+@pytest.fixture
+def aws():
+    users, groups = synthetic.make_user_pool(150, seed=1)
+    aws = fakes.FakeAWS(users, groups, synthetic.make_jwks())
+    with fakes.install(aws):
+        auth = importlib.import_module("auth")
+        auth._clients.clear()
+        auth._client_id = None
+        auth._jwks_keys = None
+        auth._jwks_fetched_at = 0.0
+        # A fresh local for every thread, including the long-lived lookup threads.
+        importlib.import_module("user_store")._local = threading.local()
+        importlib.import_module("user_stats")._table = None
+        yield aws
+
+
+@pytest.mark.parametrize("module_name", ["fetch_users", "assign_role"])
+def test_warmup_ping_short_circuits_before_auth(aws, module_name):
+    module = importlib.import_module(module_name)
+
+    assert module.handler({"warmup": True}, None) == {"warmed": True}
+    assert aws.cognito.calls == 0
+    assert aws.jwks_fetches == 1
+
+    auth = importlib.import_module("auth")
+    assert auth._client_id == fakes.CLIENT_ID
+
+
+def test_jwks_is_fetched_once_per_environment(aws):
+    fetch_users = importlib.import_module("fetch_users")
+    tokens = synthetic.TokenStream(seed=2)
+
+    for _ in range(3):
+        response = fetch_users.handler(synthetic.api_event(tokens.next()), None)
+        assert response["statusCode"] == 200
+
+    assert aws.jwks_fetches == 1
+    body = json.loads(response["body"])
+    assert body["usersWithRoles"]
+
+
+def test_unknown_kids_force_at_most_one_jwks_fetch_per_interval(aws):
+    auth = importlib.import_module("auth")
+    auth.get_jwks_keys()
+    # Cached keys older than the refresh interval.
+    auth._jwks_fetched_at -= auth.JWKS_REFRESH_INTERVAL + 1
+
+    for _ in range(2):
+        assert auth.verify_token(synthetic.make_token("admin", kid="forged")) is None
+
+    assert aws.jwks_fetches == 2
+
+
+def test_role_change_flushes_the_stage_cache(aws, monkeypatch):
+    monkeypatch.setenv("REST_API_ID", "api123")
+    monkeypatch.setenv("STAGE_NAME", "prod")
+    assign_role = importlib.import_module("assign_role")
+    token = synthetic.make_token("admin")
+    body = {"userId": aws.cognito.users[0]["Username"], "groupName": "Devs"}
+
+    response = assign_role.handler(synthetic.api_event(token, "POST", "/assign-role", body), None)
+
+    assert response["statusCode"] == 200
+    assert aws.apigateway.flushes == [("api123", "prod")]
+
+
+def test_trusted_jwt_authorizer_claims_skip_token_verification(aws, monkeypatch):
+    auth = importlib.import_module("auth")
+    fetch_users = importlib.import_module("fetch_users")
+    monkeypatch.setattr(auth, "TRUST_AUTHORIZER_CLAIMS", True)
+    event = {
+        "headers": {"authorization": "Bearer not-a-jwt"},
+        "requestContext": {"authorizer": {"jwt": {"claims": {
+            "cognito:username": "admin", "cognito:groups": "[Admins Devs]",
+        }}}},
+    }
+
+    response = fetch_users.handler(event, None)
+
+    assert response["statusCode"] == 200
+    assert aws.jwks_fetches == 0
+
+
+def test_rest_authorizer_claims_skip_token_verification(aws, monkeypatch):
+    auth = importlib.import_module("auth")
+    assign_role = importlib.import_module("assign_role")
+    monkeypatch.setattr(auth, "TRUST_AUTHORIZER_CLAIMS", True)
+    event = synthetic.api_event("not-a-jwt", "POST", "/assign-role", {
+        "userId": aws.cognito.users[0]["Username"], "groupName": "Devs",
+    })
+    event["requestContext"] = {"authorizer": {"claims": {
+        "cognito:username": "admin", "cognito:groups": "Devs,Admins",
+    }}}
+
+    response = assign_role.handler(event, None)
+
+    assert response["statusCode"] == 200
+    assert aws.jwks_fetches == 0
+
+
+def test_direct_invocation_falls_back_to_local_verification(aws, monkeypatch):
+    auth = importlib.import_module("auth")
+    fetch_users = importlib.import_module("fetch_users")
+    monkeypatch.setattr(auth, "TRUST_AUTHORIZER_CLAIMS", True)
+
+    response = fetch_users.handler(synthetic.api_event(synthetic.make_token("admin")), None)
+
+    assert response["statusCode"] == 200
+    assert aws.jwks_fetches == 1
+
+
+def test_user_lookup_by_email_queries_the_index(aws):
+    handler = importlib.import_module("handler")
+    user_store = importlib.import_module("user_store")
+    users = aws.cognito.users[:3]
+    for user in users:
+        handler.handler(synthetic.post_confirmation_event(user), None)
+    email = next(a["Value"] for a in users[1]["Attributes"] if a["Name"] == "email")
+
+    item = user_store.get_user_by_email(email)
+
+    assert item["email"] == email
+    assert user_store.get_user_by_email("nobody@example.com") is None
+    assert aws.dynamodb.Table(user_store.USER_TABLE_NAME).queries == 2
+
+
+def test_email_lookup_resolves_single_and_batch_requests(aws):
+    handler = importlib.import_module("handler")
+    user_lookup = importlib.import_module("user_lookup")
+    emails = []
+    for user in aws.cognito.users[:3]:
+        handler.handler(synthetic.post_confirmation_event(user), None)
+        emails.append(next(a["Value"] for a in user["Attributes"] if a["Name"] == "email"))
+    token = synthetic.make_token("admin")
+
+    event = synthetic.api_event(token, "GET", "/users/by-email")
+    event["queryStringParameters"] = {"email": emails[0]}
+    single = user_lookup.handler(event, None)
+    batch = user_lookup.handler(synthetic.api_event(
+        token, "POST", "/users/by-email", {"emails": emails + ["nobody@example.com"]}
+    ), None)
+
+    assert json.loads(single["body"])["user"]["email"] == emails[0]
+    body = json.loads(batch["body"])
+    assert sorted(body["users"]) == sorted(emails)
+    assert body["notFound"] == ["nobody@example.com"]
+
+
+def test_batch_lookups_reuse_the_lookup_threads_and_their_tables(aws, monkeypatch):
+    handler = importlib.import_module("handler")
+    user_store = importlib.import_module("user_store")
+    emails = []
+    for user in aws.cognito.users[:20]:
+        handler.handler(synthetic.post_confirmation_event(user), None)
+        emails.append(next(a["Value"] for a in user["Attributes"] if a["Name"] == "email"))
+    tables = []
+    resource = aws.resource
+    monkeypatch.setattr(aws, "resource", lambda *args, **kwargs: tables.append(args) or resource(*args, **kwargs))
+
+    user_store.warm_lookup_threads()
+    assert len(tables) == user_store.MAX_WORKERS
+    for _ in range(3):
+        assert all(user_store.get_users_by_email(emails).values())
+    assert len(tables) == user_store.MAX_WORKERS
+
+
+def test_user_items_are_compact_and_legacy_items_still_decode(aws):
+    handler = importlib.import_module("handler")
+    user_schema = importlib.import_module("user_schema")
+    user_store = importlib.import_module("user_store")
+    user = aws.cognito.users[0]
+    handler.handler(synthetic.post_confirmation_event(user), None)
+    table = aws.dynamodb.Table(user_store.USER_TABLE_NAME)
+    item = next(iter(table.items.values()))
+    table.items["legacy"] = {
+        "userId": "legacy", "email": "legacy@example.com", "email_verified": "false",
+        "created_at": "2024-05-01T12:00:00.123456", "cognito_username": "legacy-name",
+    }
+
+    assert set(item) <= {"userId", "email", "ev", "ca", "un", "fn", "ln", "ph"}
+    assert item["ev"] is True and isinstance(item["ca"], int)
+    assert user_schema.decode_user(item)["cognito_username"] == user["Username"]
+    assert "un" not in user_schema.encode_user({"userId": "a", "cognito_username": "a"})
+    assert user_store.get_user_by_email("legacy@example.com") == {
+        "userId": "legacy", "email": "legacy@example.com", "email_verified": False,
+        "created_at": 1714564800, "cognito_username": "legacy-name",
+    }
+
+
+def test_stream_consumer_maintains_the_summary_item(aws):
+    handler = importlib.import_module("handler")
+    assign_role = importlib.import_module("assign_role")
+    stats_stream = importlib.import_module("stats_stream")
+    user_stats = importlib.import_module("user_stats")
+    user_store = importlib.import_module("user_store")
+    table = aws.dynamodb.Table(user_store.USER_TABLE_NAME)
+    first, second = aws.cognito.users[:2]
+    for user in (first, second):
+        handler.handler(synthetic.post_confirmation_event(user), None)
+    signed_up = [dict(item) for item in table.items.values()]
+
+    body = {"userId": first["Username"], "groupName": "Devs"}
+    assign_role.handler(synthetic.api_event(synthetic.make_token("admin"), "POST", "/assign-role", body), None)
+    promoted = next(item for item in table.items.values() if item.get("rl"))
+    before = next(item for item in signed_up if item["userId"] == promoted["userId"])
+
+    stats_stream.handler(synthetic.table_stream_event(
+        [(None, item) for item in signed_up] + [(before, promoted)]
+    ), None)
+
+    summary = user_stats.get_summary()
+    assert summary["users"] == 2
+    assert summary["unassigned"] == 1
+    assert summary["roles"] == {"Devs": 1}
+    assert sum(summary["signupsPerDay"].values()) == 2
+
+
+def test_user_stats_endpoint_serves_the_reconciled_summary(aws, monkeypatch):
+    handler = importlib.import_module("handler")
+    fetch_stats = importlib.import_module("fetch_stats")
+    reconcile_stats = importlib.import_module("reconcile_stats")
+    user_stats = importlib.import_module("user_stats")
+    monkeypatch.setattr(fakes.FakeTable, "SCAN_PAGE_SIZE", 7)
+    for user in aws.cognito.users[:20]:
+        handler.handler(synthetic.post_confirmation_event(user), None)
+    # Drifted counters, e.g. from a stream batch applied twice.
+    user_stats.apply_delta({"users": 45, "role#Devs": 3})
+
+    reconcile_stats.handler({}, None)
+    response = fetch_stats.handler(synthetic.api_event(synthetic.make_token("admin"), "GET", "/user-stats"), None)
+
+    groups = {
+        name: sum(user["Username"] in members for user in aws.cognito.users[:20])
+        for name, members in aws.cognito.groups.items()
+    }
+    in_no_group = sum(
+        not any(user["Username"] in members for members in aws.cognito.groups.values())
+        for user in aws.cognito.users[:20]
+    )
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 200
+    assert (body["users"], body["unassigned"]) == (20, in_no_group)
+    assert body["roles"] == {name: count for name, count in groups.items() if count}
+    assert body["reconciledAt"]
+
+
+def test_reconciliation_counts_group_members_without_a_recorded_role(aws, monkeypatch):
+    handler = importlib.import_module("handler")
+    reconcile_stats = importlib.import_module("reconcile_stats")
+    user_stats = importlib.import_module("user_stats")
+    user_store = importlib.import_module("user_store")
+    monkeypatch.setattr(fakes, "COGNITO_PAGE_SIZE", 2)
+    user = aws.cognito.users[0]
+    for members in aws.cognito.groups.values():
+        if user["Username"] in members:
+            members.remove(user["Username"])
+    handler.handler(synthetic.post_confirmation_event(user), None)
+    # Added from the console: Cognito has the group, the item has no roles.
+    aws.cognito.admin_add_user_to_group("pool", user["Username"], "Devs")
+    assert not any(item.get("rl") for item in aws.dynamodb.Table(user_store.USER_TABLE_NAME).items.values())
+
+    reconcile_stats.handler({}, None)
+
+    summary = user_stats.get_summary()
+    assert (summary["users"], summary["unassigned"], summary["roles"]) == (1, 0, {"Devs": 1})
+
+
+def test_export_resumes_from_its_checkpoint(aws, monkeypatch, tmp_path):
+    handler = importlib.import_module("handler")
+    object_store = importlib.import_module("object_store")
+    export_users = importlib.import_module("export_users")
+    monkeypatch.setenv("EXPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(export_users, "EXPORT_SEGMENTS", 3)
+    # Every page fills a part, so each one is checkpointed.
+    monkeypatch.setattr(object_store, "PART_SIZE", 512)
+    monkeypatch.setattr(fakes.FakeTable, "SCAN_PAGE_SIZE", 10)
+    for user in aws.cognito.users:
+        handler.handler(synthetic.post_confirmation_event(user), None)
+
+    class OutOfTime:
+        invoked_function_arn = "arn:aws:lambda:us-east-2:123456789012:function:export"
+
+        def get_remaining_time_in_millis(self):
+            return 0
+
+    paused = export_users.handler({"runId": "run1"}, OutOfTime())
+    run = tmp_path / "exports" / "run1"
+    checkpoint = json.loads((run / "checkpoint.json").read_text())
+    resumed = export_users.handler(json.loads(aws.awslambda.invocations[0][2]), None)
+
+    assert (paused["complete"], resumed["complete"]) == (False, True)
+    assert all(stream["cursor"] and stream["parts"] for stream in checkpoint["streams"].values())
+    manifest = json.loads((run / "manifest.json").read_text())
+    assert sorted(manifest["files"].values())[-1] == 150
+    table_lines = [
+        json.loads(line)
+        for segment in range(3)
+        for line in (run / f"table-{segment}.ndjson").read_text().splitlines()
+    ]
+    user_store = importlib.import_module("user_store")
+    assert sorted(line["userId"] for line in table_lines) == sorted(
+        aws.dynamodb.Table(user_store.USER_TABLE_NAME).items
+    )
+    assert len((run / "cognito.ndjson").read_text().splitlines()) == 150
@@ -0,0 +1,354 @@
+"""Extensions to the PyJWT copy vendored in lambda_layer/python."""
+import asyncio
+import base64
+import binascii
+import io
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from benchmarks import use_handler_paths
+
+use_handler_paths()
+
+import jwt  # noqa: E402
+from jwt import api_jws  # noqa: E402
+from jwt.utils import base64url_encode  # noqa: E402
+
+KEY = "test-secret-key-with-enough-bytes!"
+
+
+JWKS = {"keys": [{"kty": "oct", "kid": "k1", "k": base64url_encode(KEY.encode()).decode()}]}
+
+
+def make_token(**claims):
+    return jwt.encode({"sub": "user", **claims}, KEY, algorithm="HS256", headers={"kid": "k1"})
+
+
+def test_parsed_token_is_decoded_once(monkeypatch):
+    calls = []
+    decode = api_jws.base64url_decode
+    monkeypatch.setattr(api_jws, "base64url_decode", lambda data: calls.append(data) or decode(data))
+
+    parsed = jwt.parse(make_token())
+    assert jwt.get_unverified_header(parsed)["kid"] == "k1"
+    assert jwt.decode(parsed, KEY, algorithms=["HS256"])["sub"] == "user"
+
+    # header, payload and signature, once each
+    assert len(calls) == 3
+
+
+def test_parsed_token_reports_the_same_errors():
+    with pytest.raises(jwt.DecodeError, match="Not enough segments"):
+        jwt.parse("abc")
+    with pytest.raises(jwt.DecodeError, match="Invalid header"):
+        jwt.decode(jwt.parse("bm90anNvbg.e30.sig"), KEY, algorithms=["HS256"])
+    with pytest.raises(jwt.InvalidSignatureError):
+        jwt.decode(jwt.parse(make_token()), "another-key-with-enough-bytes!!!!", algorithms=["HS256"])
+
+
+def test_decode_many_groups_by_kid_and_returns_errors_in_place():
+    other_key = "other-secret-key-with-enough-bytes!"
+    tokens = [
+        make_token(n=0),
+        jwt.encode({"sub": "other"}, other_key, algorithm="HS256", headers={"kid": "k2"}),
+        make_token(exp=1),
+        "abc",
+        jwt.encode({"sub": "missing"}, KEY, algorithm="HS256", headers={"kid": "k3"}),
+        make_token(n=1)[:-2] + "xx",
+    ]
+
+    results = jwt.decode_many(tokens, {"k1": KEY, "k2": other_key}, algorithms=["HS256"])
+
+    assert results[0] == {"sub": "user", "n": 0}
+    assert results[1] == {"sub": "other"}
+    assert isinstance(results[2], jwt.ExpiredSignatureError)
+    assert isinstance(results[3], jwt.DecodeError)
+    assert isinstance(results[4], jwt.InvalidTokenError)
+    assert isinstance(results[5], jwt.InvalidSignatureError)
+
+
+def test_verifier_runs_the_same_claim_checks_as_decode():
+    verifier = jwt.verifier(algorithms=["HS256"], audience="app", issuer="pool", leeway=5,
+                            options={"require": ["exp"]})
+
+    token = make_token(aud="app", iss="pool", exp=int(time.time()) + 60)
+    assert jwt.decode(token, KEY, verifier=verifier)["sub"] == "user"
+
+    for claims, error in [
+        ({"aud": "app", "iss": "pool"}, jwt.MissingRequiredClaimError),
+        ({"aud": "app", "iss": "pool", "exp": 1}, jwt.ExpiredSignatureError),
+        ({"aud": "other", "iss": "pool", "exp": int(time.time()) + 60}, jwt.InvalidAudienceError),
+        ({"aud": "app", "iss": "other", "exp": int(time.time()) + 60}, jwt.InvalidIssuerError),
+    ]:
+        token = make_token(**claims)
+        with pytest.raises(error):
+            jwt.decode(token, KEY, algorithms=["HS256"], audience="app", issuer="pool",
+                       leeway=5, options={"require": ["exp"]})
+        with pytest.raises(error):
+            jwt.decode(token, KEY, verifier=verifier)
+
+    with pytest.raises(TypeError):
+        jwt.decode(token, KEY, verifier=verifier, audience="app")
+
+
+def test_jwks_client_serves_stale_keys_while_one_refresh_runs(monkeypatch):
+    fetches = []
+    release = threading.Event()
+
+    def urlopen(request, timeout=None, context=None):
+        fetches.append(request.full_url)
+        if len(fetches) > 1:
+            release.wait(5)
+            raise urllib.error.URLError("endpoint down")
+        return io.BytesIO(json.dumps(JWKS).encode())
+
+    monkeypatch.setattr(urllib.request, "urlopen", urlopen)
+    client = jwt.PyJWKClient("https://issuer/jwks", stale_while_revalidate=True)
+    assert client.get_signing_key("k1").key_id == "k1"
+
+    client.jwk_set_cache.jwk_set_with_timestamp.timestamp -= 600
+    for _ in range(5):
+        assert client.get_signing_key("k1").key_id == "k1"
+    assert len(fetches) == 2
+
+    flight = client._flight
+    release.set()
+    with pytest.raises(jwt.PyJWKClientConnectionError):
+        flight.result(5)
+
+    # The failure keeps the last good set and backs off before retrying.
+    assert client.get_signing_key("k1").key_id == "k1"
+    assert len(fetches) == 2
+    assert client.jwk_set_cache.get_stale() is not None
+
+
+def test_jwks_client_survives_a_long_run_of_failed_fetches(monkeypatch):
+    def urlopen(request, timeout=None, context=None):
+        raise urllib.error.URLError("endpoint down")
+
+    monkeypatch.setattr(urllib.request, "urlopen", urlopen)
+    client = jwt.PyJWKClient("https://issuer/jwks", stale_while_revalidate=True, max_refresh_backoff=60)
+    for _ in range(1100):
+        with pytest.raises(jwt.PyJWKClientConnectionError):
+            client.get_jwk_set()
+    assert client._flight is None
+    assert client._retry_at <= time.monotonic() + 60
+
+    # A failure in the bookkeeping still settles the flight for its waiters.
+    monkeypatch.setattr(client, "_record_fetch", lambda failed: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        client.get_jwk_set()
+    assert client._flight is None
+
+
+def test_jwks_client_parses_the_cached_set_once(monkeypatch):
+    parses = []
+    from_dict = jwt.PyJWKSet.from_dict
+    monkeypatch.setattr(jwt.PyJWKSet, "from_dict", staticmethod(lambda obj: parses.append(obj) or from_dict(obj)))
+    monkeypatch.setattr(urllib.request, "urlopen",
+                        lambda request, timeout=None, context=None: io.BytesIO(json.dumps(JWKS).encode()))
+
+    client = jwt.PyJWKClient("https://issuer/jwks")
+    for _ in range(3):
+        assert client.get_signing_key("k1").key_id == "k1"
+        assert client.get_jwk_set()["k1"] is client.get_signing_key("k1")
+    assert len(parses) == 1
+
+    with pytest.raises(jwt.PyJWKClientError, match="k9"):
+        client.get_signing_key("k9")
+    assert len(parses) == 2
+
+
+def test_jwks_client_shares_parsed_sets_through_the_file_cache(monkeypatch, tmp_path):
+    fetches = []
+
+    def urlopen(request, timeout=None, context=None):
+        fetches.append(request.full_url)
+        return io.BytesIO(json.dumps(JWKS).encode())
+
+    monkeypatch.setattr(urllib.request, "urlopen", urlopen)
+    cache_dir = str(tmp_path / "jwks")
+    assert jwt.PyJWKClient("https://issuer/jwks", cache_dir=cache_dir).get_signing_key("k1")
+    assert len(fetches) == 1
+
+    # A second process: no fetch and no parse, and the key still verifies.
+    monkeypatch.setattr(jwt.PyJWKSet, "from_dict", staticmethod(lambda obj: pytest.fail("parsed")))
+    client = jwt.PyJWKClient("https://issuer/jwks", cache_dir=cache_dir)
+    key = client.get_signing_key("k1")
+    assert jwt.decode(make_token(), key, algorithms=["HS256"])["sub"] == "user"
+    assert len(fetches) == 1
+
+    # Expired by mtime: fetched again.
+    path = client.jwk_file_cache.path
+    os.utime(path, (time.time() - 600, time.time() - 600))
+    monkeypatch.undo()
+    monkeypatch.setattr(urllib.request, "urlopen", urlopen)
+    assert jwt.PyJWKClient("https://issuer/jwks", cache_dir=cache_dir).get_signing_key("k1")
+    assert len(fetches) == 2
+
+
+def test_file_cache_unpickles_again_only_when_the_file_changes(monkeypatch, tmp_path):
+    from jwt import jwk_set_cache
+
+    def urlopen(request, timeout=None, context=None):
+        return io.BytesIO(json.dumps(JWKS).encode())
+
+    monkeypatch.setattr(urllib.request, "urlopen", urlopen)
+    cache_dir = str(tmp_path / "jwks")
+    jwt.PyJWKClient("https://issuer/jwks", cache_dir=cache_dir).get_jwk_set()
+    loads = []
+    real_load = jwk_set_cache.pickle.load
+    monkeypatch.setattr(jwk_set_cache.pickle, "load", lambda f: loads.append(f) or real_load(f))
+
+    client = jwt.PyJWKClient("https://issuer/jwks", cache_jwk_set=False, cache_dir=cache_dir)
+    first = client.get_jwk_set()
+    assert client.get_jwk_set() is first
+    assert len(loads) == 1
+
+    later = time.time() + 1
+    os.utime(client.jwk_file_cache.path, (later, later))
+    assert client.get_jwk_set()["k1"].key_id == "k1"
+    assert len(loads) == 2
+
+    with pytest.raises(jwt.PyJWKClientError, match="Lifespan"):
+        jwt.PyJWKClient("https://issuer/jwks", cache_jwk_set=False, lifespan=0, cache_dir=cache_dir)
+
+
+def test_async_jwks_client_shares_one_fetch_across_concurrent_lookups():
+    from benchmarks.jwks_client import serve
+
+    server, url, requests = serve(0.2)
+    try:
+        async def verify_many():
+            client = jwt.AsyncPyJWKClient(url)
+            keys = await asyncio.gather(*(client.get_signing_key_from_jwt(make_token()) for _ in range(200)))
+            assert {key.key_id for key in keys} == {"k1"}
+            with pytest.raises(jwt.PyJWKClientError, match="k9"):
+                await client.get_signing_key("k9")
+
+        asyncio.run(verify_many())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # One fetch for the 200 lookups, one refresh for the unknown kid.
+    assert len(requests) == 2
+
+
+def test_async_jwks_client_refreshes_stale_sets_across_short_lived_loops():
+    fetches = []
+
+    async def transport(url, headers, timeout, ssl_context=None):
+        fetches.append(url)
+        await asyncio.sleep(0.05)
+        return json.dumps(JWKS).encode()
+
+    client = jwt.AsyncPyJWKClient("https://issuer/jwks", stale_while_revalidate=True, transport=transport)
+    # One asyncio.run() per request, as in a Lambda handler.
+    assert asyncio.run(client.get_signing_key("k1")).key_id == "k1"
+
+    client.jwk_set_cache.jwk_set_with_timestamp.timestamp -= 600
+    # Served stale; the background refresh dies with the loop.
+    assert asyncio.run(client.get_signing_key("k1")).key_id == "k1"
+    assert client.jwk_set_cache.get() is None
+
+    # The next stale lookup waits for the refresh instead.
+    assert asyncio.run(client.get_signing_key("k1")).key_id == "k1"
+    assert client.jwk_set_cache.get() is not None
+    fetched = len(fetches)
+    assert asyncio.run(client.get_signing_key("k1")).key_id == "k1"
+    assert len(fetches) == fetched
+
+
+def test_codec_hooks(monkeypatch):
+    from jwt import utils
+
+    for segment in ["", "e30", "eyJhIjoi-_8ifQ", "YQ", "YWI"]:
+        padded = segment + "=" * (-len(segment) % 4)
+        assert utils.base64url_decode(segment) == base64.urlsafe_b64decode(padded)
+    with pytest.raises(binascii.Error):
+        utils.base64url_decode("abcde")
+
+    documents = []
+    monkeypatch.setattr(utils, "json_loads", utils.json_loads)
+    utils.set_json_loads(lambda data: documents.append(data) or json.loads(data))
+    assert jwt.decode(make_token(), KEY, algorithms=["HS256"])["sub"] == "user"
+    assert len(documents) == 2
+
+
+def test_signature_cache_memoizes_only_successful_verifications(monkeypatch):
+    verifications = []
+    cache = jwt.SignatureCache(maxsize=2)
+    jws = jwt.PyJWS(signature_cache=cache)
+    algorithm = jws.get_algorithm_by_name("HS256")
+    verify = algorithm.verify
+    monkeypatch.setattr(algorithm, "verify", lambda *args: verifications.append(args) or verify(*args))
+
+    token = make_token(exp=int(time.time()) + 60)
+    for _ in range(3):
+        jws.decode(token, KEY, algorithms=["HS256"])
+    assert len(verifications) == 1
+
+    # A hit still checks the algorithm, failures are never stored, and
+    # tokens without exp are not cached.
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        jws.decode(token, KEY, algorithms=["HS384"])
+    for _ in range(2):
+        with pytest.raises(jwt.InvalidSignatureError):
+            jws.decode(token, "another-key-with-enough-bytes!!!!", algorithms=["HS256"])
+        jws.decode(make_token(), KEY, algorithms=["HS256"])
+    assert len(verifications) == 5
+
+    for n in range(3):
+        jws.decode(make_token(n=n, exp=int(time.time()) + 60), KEY, algorithms=["HS256"])
+    assert cache.stats() == {"hits": 2, "misses": 8, "hit_ratio": 0.2, "evictions": 2, "size": 2, "maxsize": 2}
+
+
+def test_signature_cache_matches_str_and_bytes_keys_by_content(monkeypatch):
+    verifications = []
+    cache = jwt.SignatureCache()
+    jws = jwt.PyJWS(signature_cache=cache)
+    algorithm = jws.get_algorithm_by_name("HS256")
+    verify = algorithm.verify
+    monkeypatch.setattr(algorithm, "verify", lambda *args: verifications.append(args) or verify(*args))
+
+    token = make_token(exp=int(time.time()) + 60)
+    # A secret read afresh for each request is a new object every time.
+    for key in ("".join(KEY), "".join(KEY), KEY.encode()):
+        jws.decode(token, key, algorithms=["HS256"])
+    assert len(verifications) == 1
+    assert cache.stats()["hits"] == 2
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        jws.decode(token, KEY + "-rotated", algorithms=["HS256"])
+    assert len(verifications) == 2
+
+
+def test_ecdsa_algorithm_verifies_es256_without_cryptography():
+    import ecdsa
+    from jwt.algorithms import ECDSAAlgorithm
+
+    jwk = ECDSAAlgorithm.to_jwk(ecdsa.SigningKey.generate(curve=ecdsa.NIST256p), as_dict=True)
+    token = jwt.encode({"sub": "device"}, ECDSAAlgorithm.from_jwk(jwk), algorithm="ES256",
+                       headers={"kid": "dev"})
+    public = {name: value for name, value in jwk.items() if name != "d"}
+
+    key = jwt.PyJWK(public)
+    assert key.algorithm_name == "ES256"
+    assert jwt.decode(token, key)["sub"] == "device"
+    with pytest.raises(jwt.InvalidSignatureError):
+        jwt.decode(token[:-6] + "AAAAAA", key)
+
+    # Registerable on an instance that does not have it.
+    jws = jwt.PyJWS(algorithms=["HS256"])
+    jws.register_algorithm("ES256", ECDSAAlgorithm(ECDSAAlgorithm.SHA256, "P-256"))
+    assert jws.decode(token, ECDSAAlgorithm.from_jwk(public), algorithms=["ES256"]) == b'{"sub":"device"}'
+    p384_key = ecdsa.SigningKey.generate(curve=ecdsa.NIST384p).get_verifying_key()
+    with pytest.raises(jwt.InvalidKeyError):
+        jws.decode(token, p384_key, algorithms=["ES256"])
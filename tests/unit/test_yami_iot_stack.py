@@ -1,5 +1,8 @@
+import os
+
 import aws_cdk as core
 import aws_cdk.assertions as assertions
+import pytest
 
 from yami_iot.yami_iot_stack import YamiIotStack
 
@@ -13,3 +16,342 @@ def test_sqs_queue_created():
 #     template.has_resource_properties("AWS::SQS::Queue", {
 #         "VisibilityTimeout": 300
 #     })
+
+
+def synth(context=None):
+    app = core.App(context={"layer_native_wheels": False, **(context or {})})
+    stack = YamiIotStack(app, "yami-iot")
+    return assertions.Template.from_stack(stack)
+
+
+def test_functions_are_on_demand_by_default():
+    template = synth()
+
+    template.resource_count_is("AWS::Lambda::Alias", 0)
+    # Only the stats reconciliation and the export are scheduled, no warm-up pings.
+    template.resource_count_is("AWS::Events::Rule", 2)
+
+
+def test_provisioned_concurrency_and_warm_ping_per_function():
+    template = synth({"functions": {
+        "AssignRoleLambda": {"provisioned_concurrency": 2, "warm_ping_minutes": 5},
+    }})
+
+    template.resource_count_is("AWS::Lambda::Alias", 1)
+    template.has_resource_properties("AWS::Lambda::Alias", {
+        "Name": "live",
+        "ProvisionedConcurrencyConfig": {"ProvisionedConcurrentExecutions": 2},
+    })
+    template.has_resource_properties("AWS::Events::Rule", {
+        "ScheduleExpression": "rate(5 minutes)",
+        "Targets": [assertions.Match.object_like({"Input": '{"warmup":true}'})],
+    })
+
+
+def test_unknown_function_setting_is_rejected():
+    with pytest.raises(ValueError, match="provisioned_concurency"):
+        synth({"functions": {"FetchUsersLambda": {"provisioned_concurency": 1}}})
+
+
+def test_runtime_and_architecture_per_function_with_matching_layer():
+    template = synth({"functions": {
+        "AssignRoleLambda": {"runtime": "python3.12", "architecture": "arm64", "slim_layer": False},
+        "FetchUsersLambda": {"runtime": "python3.12", "architecture": "arm64", "slim_layer": False},
+        "UserLookupLambda": {"runtime": "python3.12", "architecture": "arm64", "slim_layer": False},
+        "FetchStatsLambda": {"runtime": "python3.12", "architecture": "arm64", "slim_layer": False},
+    }})
+
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "assign_role.handler",
+        "Runtime": "python3.12",
+        "Architectures": ["arm64"],
+    })
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "handler.handler",
+        "Runtime": "python3.9",
+        "Architectures": ["x86_64"],
+    })
+    # The admin functions share the one layer staged for their target.
+    template.resource_count_is("AWS::Lambda::LayerVersion", 1)
+    template.has_resource_properties("AWS::Lambda::LayerVersion", {
+        "CompatibleRuntimes": ["python3.12"],
+        "CompatibleArchitectures": ["arm64"],
+    })
+
+
+def test_layer_drops_extensions_built_for_another_target(tmp_path, monkeypatch):
+    from yami_iot import bundling
+
+    source = tmp_path / "python"
+    (source / "pkg").mkdir(parents=True)
+    (source / "pkg" / "__init__.py").write_text("")
+    (source / "pkg" / "speedups.cpython-312-x86_64-linux-gnu.so").write_bytes(b"\x7fELF")
+    monkeypatch.setattr(bundling, "BUILD_DIR", str(tmp_path / "build"))
+
+    native = bundling.build_layer("python3.12", "x86_64", fetch_native=False, source=str(source))
+    foreign = bundling.build_layer("python3.12", "arm64", fetch_native=False, source=str(source))
+
+    assert os.path.exists(os.path.join(native, "python", "pkg", "speedups.cpython-312-x86_64-linux-gnu.so"))
+    assert os.listdir(os.path.join(foreign, "python", "pkg")) == ["__init__.py"]
+
+
+def test_layer_missing_a_native_wheel_is_rebuilt_next_time(tmp_path, monkeypatch):
+    from yami_iot import bundling
+
+    source = tmp_path / "python"
+    (source / "pkg").mkdir(parents=True)
+    (source / "pkg" / "speedups.cpython-312-x86_64-linux-gnu.so").write_bytes(b"\x7fELF")
+    (source / "pkg-1.0.dist-info").mkdir()
+    (source / "pkg-1.0.dist-info" / "RECORD").write_text("pkg/speedups.cpython-312-x86_64-linux-gnu.so,,\n")
+    monkeypatch.setattr(bundling, "BUILD_DIR", str(tmp_path / "build"))
+    fetches = []
+
+    def offline(requirement, *args):
+        fetches.append(requirement)
+        return None
+
+    monkeypatch.setattr(bundling, "fetch_extensions", offline)
+    bundling.build_layer("python3.12", "arm64", source=str(source))
+    bundling.build_layer("python3.12", "arm64", source=str(source))
+    assert fetches == ["pkg==1.0", "pkg==1.0"]
+
+    monkeypatch.setattr(bundling, "fetch_extensions", lambda requirement, *args: fetches.append(requirement) or [])
+    bundling.build_layer("python3.12", "arm64", source=str(source))
+    bundling.build_layer("python3.12", "arm64", source=str(source))
+    assert len(fetches) == 3
+
+
+def test_memory_timeout_and_reserved_concurrency_per_function():
+    template = synth({"functions": {
+        "FetchUsersLambda": {"memory_size": 1536, "timeout": 15, "reserved_concurrency": 20},
+    }})
+
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "fetch_users.handler",
+        "MemorySize": 1536,
+        "Timeout": 15,
+        "ReservedConcurrentExecutions": 20,
+    })
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "assign_role.handler",
+        "MemorySize": 128,
+        "Timeout": 3,
+        "ReservedConcurrentExecutions": assertions.Match.absent(),
+    })
+
+
+def test_each_function_gets_a_slim_layer_by_default():
+    template = synth()
+
+    template.resource_count_is("AWS::Lambda::LayerVersion", 4)
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "fetch_users.handler",
+        "Layers": [{"Ref": assertions.Match.string_like_regexp("^FetchUsersLambdaLayer")}],
+    })
+
+
+def test_function_layer_keeps_only_traced_modules(tmp_path, monkeypatch):
+    from yami_iot import bundling
+
+    handlers = tmp_path / "lambda"
+    handlers.mkdir()
+    (handlers / "shared.py").write_text("import used\n")
+    (handlers / "app.py").write_text("import shared\nimport json\n")
+    site = tmp_path / "python"
+    for package in ("used", "unused"):
+        (site / package / "tests").mkdir(parents=True)
+        (site / package / "__init__.py").write_text("")
+        (site / package / "tests" / "__init__.py").write_text("")
+        (site / package / "data.pem").write_text("certificate")
+    (site / "used" / "__init__.py").write_text("from . import helpers\n")
+    (site / "used" / "helpers.py").write_text("")
+    (site / "used" / "cli.py").write_text("")
+    monkeypatch.setattr(bundling, "BUILD_DIR", str(tmp_path / "build"))
+
+    output = bundling.build_function_layer(
+        "AppLambda", "app", str(site), "python3.11", handler_dir=str(handlers)
+    )
+
+    shipped = sorted(
+        os.path.relpath(os.path.join(root, name), os.path.join(output, "python"))
+        for root, _, names in os.walk(os.path.join(output, "python"))
+        for name in names if not name.endswith(".pyc")
+    )
+    assert shipped == ["used/__init__.py", "used/data.pem", "used/helpers.py"]
+
+
+def test_function_code_ships_handler_and_local_imports(tmp_path, monkeypatch):
+    from yami_iot import bundling
+
+    handlers = tmp_path / "lambda"
+    handlers.mkdir()
+    (handlers / "shared.py").write_text("import json\n")
+    (handlers / "app.py").write_text("import shared\n")
+    (handlers / "other.py").write_text("")
+    monkeypatch.setattr(bundling, "BUILD_DIR", str(tmp_path / "build"))
+
+    output = bundling.build_function_code(
+        "AppLambda", "app", handler_dir=str(handlers), site_dir=str(tmp_path / "python")
+    )
+
+    assert sorted(os.listdir(output)) == ["app.py", "shared.py"]
+
+
+def test_fetch_users_is_cached_per_caller_and_throttled():
+    template = synth()
+
+    template.has_resource_properties("AWS::ApiGateway::Stage", {
+        "StageName": "prod",
+        "CacheClusterEnabled": True,
+        "MethodSettings": assertions.Match.array_with([{
+            "ResourcePath": "/~1fetch-users",
+            "HttpMethod": "GET",
+            "CachingEnabled": True,
+            "CacheTtlInSeconds": 60,
+            "ThrottlingRateLimit": 20,
+            "ThrottlingBurstLimit": 40,
+            "DataTraceEnabled": False,
+        }]),
+    })
+    template.has_resource_properties("AWS::ApiGateway::Method", {
+        "HttpMethod": "GET",
+        "RequestParameters": {"method.request.header.Authorization": True},
+        "Integration": assertions.Match.object_like({
+            "CacheKeyParameters": ["method.request.header.Authorization"],
+        }),
+    })
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "assign_role.handler",
+        "Environment": {"Variables": assertions.Match.object_like({
+            "STAGE_NAME": "prod",
+            "TRUST_AUTHORIZER_CLAIMS": "true",
+        })},
+    })
+
+
+def test_stage_cache_can_be_turned_off():
+    template = synth({"api": {"fetch_users_cache_ttl": 0}})
+
+    template.has_resource_properties("AWS::ApiGateway::Stage", {
+        "CacheClusterEnabled": False,
+    })
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "assign_role.handler",
+        "Environment": {"Variables": {
+            "USER_POOL_ID": assertions.Match.any_value(),
+            "TRUST_AUTHORIZER_CLAIMS": "true",
+        }},
+    })
+
+
+def test_http_api_mode_uses_jwt_authorizer_and_trusts_its_claims():
+    template = synth({"api": {"mode": "http"}})
+
+    template.resource_count_is("AWS::ApiGateway::RestApi", 0)
+    template.has_resource_properties("AWS::ApiGatewayV2::Authorizer", {
+        "AuthorizerType": "JWT",
+    })
+    template.has_resource_properties("AWS::ApiGatewayV2::Route", {
+        "RouteKey": "GET /fetch-users",
+        "AuthorizationType": "JWT",
+    })
+    template.has_resource_properties("AWS::ApiGatewayV2::Stage", {
+        "RouteSettings": assertions.Match.object_like({
+            "GET /fetch-users": {"ThrottlingRateLimit": 20, "ThrottlingBurstLimit": 40},
+        }),
+    })
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "fetch_users.handler",
+        "Environment": {"Variables": assertions.Match.object_like({"TRUST_AUTHORIZER_CLAIMS": "true"})},
+    })
+
+
+def test_user_table_is_on_demand_with_email_index_by_default():
+    template = synth()
+
+    template.has_resource_properties("AWS::DynamoDB::Table", {
+        "BillingMode": "PAY_PER_REQUEST",
+        "GlobalSecondaryIndexes": [assertions.Match.object_like({
+            "IndexName": "email-index",
+            "KeySchema": [{"AttributeName": "email", "KeyType": "HASH"}],
+        })],
+    })
+    template.resource_count_is("AWS::ApplicationAutoScaling::ScalableTarget", 0)
+
+
+def test_provisioned_user_table_autoscales_table_and_indexes():
+    template = synth({"table": {
+        "billing_mode": "PROVISIONED",
+        "ttl_attribute": "expires_at",
+        "indexes": {
+            "email-index": {"partition_key": "email"},
+            # Last name (a string) by creation time (epoch seconds, a number).
+            "last-name-index": {"partition_key": "ln", "sort_key": "ca", "sort_key_type": "N"},
+        },
+    }})
+
+    template.has_resource_properties("AWS::DynamoDB::Table", {
+        "ProvisionedThroughput": {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5},
+        "TimeToLiveSpecification": {"AttributeName": "expires_at", "Enabled": True},
+    })
+    template.resource_count_is("AWS::ApplicationAutoScaling::ScalableTarget", 6)
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalingPolicy", {
+        "TargetTrackingScalingPolicyConfiguration": assertions.Match.object_like({"TargetValue": 70}),
+    })
+
+
+def test_email_lookup_routes_need_an_email_index():
+    template = synth()
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "user_lookup.handler",
+        "Environment": {"Variables": assertions.Match.object_like({"EMAIL_INDEX_NAME": "email-index"})},
+    })
+    template.has_resource_properties("AWS::ApiGateway::Resource", {"PathPart": "by-email"})
+
+    without_index = synth({"table": {"indexes": {}}})
+    without_index.resource_count_is("AWS::ApiGateway::Resource", 3)
+
+
+def test_user_table_stream_feeds_the_stats_consumer():
+    template = synth()
+
+    template.has_resource_properties("AWS::DynamoDB::Table", {
+        "KeySchema": [{"AttributeName": "userId", "KeyType": "HASH"}],
+        "StreamSpecification": {"StreamViewType": "NEW_AND_OLD_IMAGES"},
+    })
+    template.has_resource_properties("AWS::DynamoDB::Table", {
+        "KeySchema": [{"AttributeName": "statId", "KeyType": "HASH"}],
+    })
+    template.has_resource_properties("AWS::Lambda::EventSourceMapping", {
+        "StartingPosition": "TRIM_HORIZON",
+        "BisectBatchOnFunctionError": True,
+    })
+
+
+def test_user_stats_route_and_reconciliation_schedule():
+    template = synth()
+
+    template.has_resource_properties("AWS::ApiGateway::Resource", {"PathPart": "user-stats"})
+    template.has_resource_properties("AWS::Events::Rule", {"ScheduleExpression": "rate(1 day)"})
+    # A full scan does not fit the 3 second default.
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "reconcile_stats.handler", "Timeout": 300, "MemorySize": 256,
+    })
+
+    synth({"table": {"stats_reconcile_hours": 0}}).resource_count_is("AWS::Events::Rule", 1)
+
+
+def test_user_export_bucket_and_schedule():
+    template = synth({"export": {"schedule_hours": 6}})
+
+    template.has_resource_properties("AWS::S3::Bucket", {
+        "LifecycleConfiguration": {"Rules": assertions.Match.array_with([
+            assertions.Match.object_like({"AbortIncompleteMultipartUpload": {"DaysAfterInitiation": 7}}),
+        ])},
+    })
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "export_users.handler",
+        "Timeout": 900,
+        "Environment": {"Variables": assertions.Match.object_like({"EXPORT_SEGMENTS": "4"})},
+    })
+    template.has_resource_properties("AWS::Events::Rule", {"ScheduleExpression": "rate(6 hours)"})
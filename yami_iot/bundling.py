@@ -0,0 +1,333 @@
+"""Build steps that stage Lambda assets before CDK packages them.
+
+The vendored layer in ``lambda_layer/python`` was installed on a CPython 3.12
+x86_64 machine, so its compiled extension modules only load on that exact
+target. ``build_layer`` stages a copy per runtime/architecture pair: foreign
+extension modules are dropped and, when possible, replaced with the matching
+binaries from the same distribution's wheel for the target platform. Anything
+that cannot be fetched falls back to the pure-Python implementation the
+packages already ship.
+
+``build_function_layer`` then cuts a staged layer down to what one handler
+actually imports: the handler module is traced with ``modulefinder`` and
+only the traced modules, the data files and compiled extensions of traced
+packages, and the owning ``.dist-info`` directories are kept, byte-compiled
+for the target when the local interpreter matches it.
+"""
+import compileall
+import hashlib
+import io
+import json
+import modulefinder
+import os
+import py_compile
+import re
+import shutil
+import subprocess
+import sys
+import sysconfig
+import tempfile
+import warnings
+import zipfile
+
+LAYER_SOURCE = os.path.join("lambda_layer", "python")
+HANDLER_SOURCE = "lambda"
+BUILD_DIR = "build"
+
+EXTENSION_SUFFIXES = (".so", ".pyd")
+PLATFORM_MACHINES = {"x86_64": "x86_64", "arm64": "aarch64"}
+
+# Only imported on platforms Lambda never runs on, by tooling, or behind an
+# ImportError fallback that the runtime never needs.
+EXCLUDED_MODULES = (
+    "urllib3.contrib.emscripten",
+    "urllib3.contrib.pyopenssl",
+    "urllib3.contrib.socks",
+    "charset_normalizer.cli",
+    "charset_normalizer.__main__",
+    "certifi.__main__",
+)
+TEST_MODULE = re.compile(r"(^|\.)(tests?|test_[^.]*|[^.]*_test)(\.|$)")
+
+
+def layer_tag(runtime_name, architecture_name):
+    """Name of the staged layer for a target, e.g. ``python3.12-arm64``."""
+    return f"{runtime_name}-{architecture_name}"
+
+
+def extension_tag(runtime_name, architecture_name):
+    """ABI tag extension modules must carry to load on the target."""
+    version = runtime_name.replace("python", "").replace(".", "")
+    return f"cpython-{version}-{PLATFORM_MACHINES[architecture_name]}-linux-gnu"
+
+
+def is_extension_module(filename):
+    return filename.endswith(EXTENSION_SUFFIXES)
+
+
+def _fingerprint(source, *extra):
+    # Changes to these build steps invalidate earlier outputs too.
+    with open(__file__, "rb") as builder:
+        digest = hashlib.sha256(builder.read())
+    digest.update("\0".join(extra).encode())
+    for directory, dirnames, filenames in os.walk(source):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(directory, filename)
+            stat = os.stat(path)
+            digest.update(f"{os.path.relpath(path, source)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+# Build metadata sits next to the asset directory so it is not shipped.
+def _is_fresh(output, fingerprint):
+    try:
+        with open(output + ".fingerprint") as stamp:
+            return stamp.read() == fingerprint and os.path.isdir(output)
+    except OSError:
+        return False
+
+
+def _mark_fresh(output, fingerprint):
+    with open(output + ".fingerprint", "w") as stamp:
+        stamp.write(fingerprint)
+
+
+def distribution_files(site_packages):
+    """Map every installed file (relative path) to the ``.dist-info`` directory that owns it."""
+    owners = {}
+    for entry in os.listdir(site_packages):
+        if not entry.endswith(".dist-info"):
+            continue
+        try:
+            with open(os.path.join(site_packages, entry, "RECORD")) as record:
+                for line in record:
+                    path = line.split(",", 1)[0]
+                    if path:
+                        owners[os.path.normpath(path)] = entry
+        except OSError:
+            continue
+    return owners
+
+
+def requirement(dist_info):
+    """``name==version`` for a ``name-version.dist-info`` directory name."""
+    name, _, version = dist_info[:-len(".dist-info")].partition("-")
+    return f"{name}=={version}"
+
+
+def tree_size(directory):
+    """Return ``(files, bytes, zipped_bytes)`` for a directory as it would be uploaded."""
+    files = size = 0
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for root, _, filenames in os.walk(directory):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                files += 1
+                size += os.path.getsize(path)
+                archive.write(path, os.path.relpath(path, directory))
+    return files, size, buffer.tell()
+
+
+def fetch_extensions(requirement, runtime_name, architecture_name, destination):
+    """Install the target platform's wheel for ``requirement`` and copy its extension modules.
+
+    Returns the relative paths copied, or None when the wheel could not be
+    fetched (offline builds, no binary wheel for the target).
+    """
+    python_version = runtime_name.replace("python", "")
+    machine = PLATFORM_MACHINES[architecture_name]
+    with tempfile.TemporaryDirectory() as scratch:
+        command = [
+            sys.executable, "-m", "pip", "install", "--quiet", "--no-deps",
+            "--disable-pip-version-check", "--timeout", "10", "--retries", "1",
+            "--only-binary=:all:", "--implementation", "cp",
+            "--python-version", python_version,
+            "--platform", f"manylinux2014_{machine}",
+            "--target", scratch, requirement,
+        ]
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            warnings.warn(
+                f"Could not fetch {requirement} for {python_version}/{machine}; "
+                f"the layer will use its pure-Python fallback. {result.stderr.strip()}"
+            )
+            return None
+
+        copied = []
+        for directory, _, filenames in os.walk(scratch):
+            for filename in filenames:
+                if not is_extension_module(filename):
+                    continue
+                source = os.path.join(directory, filename)
+                relative = os.path.relpath(source, scratch)
+                target = os.path.join(destination, relative)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(source, target)
+                copied.append(relative)
+        return copied
+
+
+def build_layer(runtime_name, architecture_name, fetch_native=True, source=LAYER_SOURCE):
+    """Stage the shared layer for one runtime/architecture and return its asset directory.
+
+    The result is cached in ``build/layers/<tag>`` and rebuilt only when the
+    source tree or the target changes. A layer missing a native wheel that
+    could not be fetched is not cached, so the next build tries again.
+    """
+    tag = extension_tag(runtime_name, architecture_name)
+    output = os.path.join(BUILD_DIR, "layers", layer_tag(runtime_name, architecture_name))
+    fingerprint = _fingerprint(source, tag, str(fetch_native))
+    if _is_fresh(output, fingerprint):
+        return output
+
+    shutil.rmtree(output, ignore_errors=True)
+    destination = os.path.join(output, "python")
+    owners = distribution_files(source)
+    foreign = set()
+
+    def ignore(directory, names):
+        skipped = {"__pycache__"} & set(names)
+        for name in names:
+            if is_extension_module(name) and tag not in name:
+                skipped.add(name)
+                relative = os.path.normpath(os.path.relpath(os.path.join(directory, name), source))
+                if relative in owners:
+                    foreign.add(requirement(owners[relative]))
+        return skipped
+
+    shutil.copytree(source, destination, ignore=ignore)
+
+    complete = True
+    if fetch_native:
+        for dependency in sorted(foreign):
+            if fetch_extensions(dependency, runtime_name, architecture_name, destination) is None:
+                complete = False
+
+    if complete:
+        _mark_fresh(output, fingerprint)
+    return output
+
+
+def trace_modules(module_name, handler_dir=HANDLER_SOURCE, site_dir=LAYER_SOURCE):
+    """Return ``{module name: absolute path}`` for everything a handler module imports."""
+    # The standard library has to be resolvable: modulefinder skips a relative
+    # import (``from .warnings import ...``) whose name already failed as an
+    # absolute one.
+    stdlib = [sysconfig.get_path("stdlib"), sysconfig.get_path("platstdlib")]
+    stdlib += [path for path in sys.path if path.endswith("lib-dynload")]
+    finder = modulefinder.ModuleFinder(
+        path=[handler_dir, site_dir] + stdlib, excludes=list(EXCLUDED_MODULES)
+    )
+    finder.run_script(os.path.join(handler_dir, f"{module_name}.py"))
+    return {
+        name: os.path.abspath(module.__file__)
+        for name, module in finder.modules.items()
+        if module.__file__ and not TEST_MODULE.search(name)
+    }
+
+
+def _modules_under(traced, directory):
+    root = os.path.abspath(directory) + os.sep
+    return {name: os.path.relpath(path, root) for name, path in traced.items() if path.startswith(root)}
+
+
+def trace_imports(module_name, handler_dir=HANDLER_SOURCE, site_dir=LAYER_SOURCE):
+    """Return the module files under ``site_dir`` that a handler module imports.
+
+    Only files under ``site_dir`` are returned, so the standard library and
+    the runtime's boto3 are left out, as are ``EXCLUDED_MODULES`` and test
+    modules.
+    """
+    return _modules_under(trace_modules(module_name, handler_dir, site_dir), site_dir)
+
+
+def build_function_code(function_id, module_name, handler_dir=HANDLER_SOURCE, site_dir=LAYER_SOURCE):
+    """Stage the code asset for one function: its handler module and the local modules it imports.
+
+    Functions then only change (and redeploy) when their own code or the
+    shared helpers they use change. Returns the asset directory.
+    """
+    output = os.path.join(BUILD_DIR, "functions", function_id)
+    fingerprint = _fingerprint(handler_dir, module_name)
+    if _is_fresh(output, fingerprint):
+        return output
+
+    shutil.rmtree(output, ignore_errors=True)
+    local = _modules_under(trace_modules(module_name, handler_dir, site_dir), handler_dir)
+    # run_script registers the entry point as __main__.
+    local[module_name] = local.pop("__main__")
+    for relative in sorted(local.values()):
+        target = os.path.join(output, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(os.path.join(handler_dir, relative), target)
+
+    _mark_fresh(output, fingerprint)
+    return output
+
+
+def build_function_layer(function_id, module_name, source, runtime_name, handler_dir=HANDLER_SOURCE):
+    """Stage a minimal layer for one handler from an already staged layer directory.
+
+    ``source`` is the ``python`` directory of a layer built by ``build_layer``
+    for the function's target. Returns the asset directory; the size report
+    is written next to it as ``<asset>.json``.
+    """
+    output = os.path.join(BUILD_DIR, "layers", f"{function_id}-{os.path.basename(os.path.dirname(source))}")
+    target_version = runtime_name.replace("python", "")
+    local_version = f"{sys.version_info[0]}.{sys.version_info[1]}"
+    fingerprint = _fingerprint(source, module_name, local_version) + _fingerprint(handler_dir)
+    if _is_fresh(output, fingerprint):
+        return output
+
+    shutil.rmtree(output, ignore_errors=True)
+    destination = os.path.join(output, "python")
+    traced = trace_imports(module_name, handler_dir, source)
+    owners = distribution_files(source)
+
+    keep = set(traced.values())
+    for relative in traced.values():
+        if os.path.basename(relative) != "__init__.py":
+            continue
+        # Packages also need their data files and compiled extensions, which
+        # modulefinder cannot see.
+        package_dir = os.path.dirname(relative)
+        for entry in os.listdir(os.path.join(source, package_dir)):
+            path = os.path.join(package_dir, entry)
+            if os.path.isfile(os.path.join(source, path)) and not entry.endswith(".py"):
+                keep.add(path)
+    dist_infos = {owners[path] for path in map(os.path.normpath, keep) if path in owners}
+
+    for relative in sorted(keep):
+        target = os.path.join(destination, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(os.path.join(source, relative), target)
+    for dist_info in sorted(dist_infos):
+        shutil.copytree(os.path.join(source, dist_info), os.path.join(destination, dist_info))
+
+    # Unchecked-hash pycs stay valid however the asset zip sets mtimes, and
+    # /opt is read-only at runtime so Lambda could never write them itself.
+    # They are only usable when compiled by the target's own Python version.
+    compiled = target_version == local_version
+    if compiled:
+        compileall.compile_dir(
+            destination, quiet=1,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH
+        )
+
+    source_files, source_bytes, source_zipped = tree_size(source)
+    files, size, zipped = tree_size(destination)
+    report = {
+        "function": function_id,
+        "module": module_name,
+        "runtime": runtime_name,
+        "byte_compiled": compiled,
+        "source": {"files": source_files, "bytes": source_bytes, "zipped_bytes": source_zipped},
+        "layer": {"files": files, "bytes": size, "zipped_bytes": zipped},
+        "modules": sorted(traced),
+    }
+    with open(output + ".json", "w") as out:
+        json.dump(report, out, indent=2)
+    _mark_fresh(output, fingerprint)
+    return output
@@ -0,0 +1,154 @@
+"""Tunable settings for the resources in YamiIotStack.
+
+Defaults live here. Any of them can be overridden per function through the
+``functions`` CDK context key, either in cdk.json or on the command line::
+
+    cdk synth -c functions='{"AssignRoleLambda": {"provisioned_concurrency": 2}}'
+
+The REST API stage, ``UserTable`` and the user export are configured the
+same way through the ``api``, ``table`` and ``export`` keys.
+"""
+import json
+
+FUNCTION_DEFAULTS = {
+    # Lambda runtime identifier and instruction set; the shared layer is
+    # staged separately for every runtime/architecture pair in use.
+    "runtime": "python3.9",
+    "architecture": "x86_64",
+    # Give the function its own layer holding only what its handler imports
+    # (see yami_iot/bundling.py); False attaches the full shared layer.
+    "slim_layer": True,
+    # Memory in MB (CPU is allocated in proportion), timeout in seconds and
+    # reserved concurrency (None leaves the function on the unreserved pool).
+    # ``python -m benchmarks.power_tuning`` suggests memory sizes.
+    "memory_size": 128,
+    "timeout": 3,
+    "reserved_concurrency": None,
+    # Provisioned concurrency on a "live" alias; 0 keeps the function on-demand
+    # and points the API straight at $LATEST.
+    "provisioned_concurrency": 0,
+    # Minutes between scheduled warm-up pings; 0 disables the schedule.
+    "warm_ping_minutes": 0,
+}
+
+# Functions whose work does not fit the defaults above; context overrides
+# still apply on top.
+FUNCTION_PRESETS = {
+    "ReconcileStatsLambda": {"timeout": 300, "memory_size": 256},
+    "ExportUsersLambda": {"timeout": 900, "memory_size": 512},
+}
+
+API_DEFAULTS = {
+    # "rest" (REST API with the Cognito authorizer) or "http" (HTTP API with a
+    # JWT authorizer whose validated claims the handlers reuse).
+    "mode": "rest",
+    "stage_name": "prod",
+    # Seconds GET /fetch-users responses stay in the stage cache, keyed by the
+    # caller's Authorization header; 0 turns the cache cluster off. REST only.
+    # assign_role flushes the cache after every role change.
+    "fetch_users_cache_ttl": 60,
+    "cache_cluster_size": "0.5",
+    # Steady-state requests per second and burst per "/path/METHOD".
+    "throttling": {
+        "/fetch-users/GET": {"rate_limit": 20, "burst_limit": 40},
+        "/assign-role/POST": {"rate_limit": 5, "burst_limit": 10},
+        "/users/by-email/GET": {"rate_limit": 50, "burst_limit": 100},
+        "/users/by-email/POST": {"rate_limit": 10, "burst_limit": 20},
+        "/user-stats/GET": {"rate_limit": 20, "burst_limit": 40},
+    },
+}
+
+TABLE_DEFAULTS = {
+    # "PAY_PER_REQUEST" absorbs sign-up bursts without throttling;
+    # "PROVISIONED" starts at the capacities below and autoscales up to the
+    # max_* values, tracking target_utilization (percent).
+    "billing_mode": "PAY_PER_REQUEST",
+    "read_capacity": 5,
+    "write_capacity": 5,
+    "max_read_capacity": 50,
+    "max_write_capacity": 50,
+    "target_utilization": 70,
+    # Global secondary indexes by name. Keys are attribute names; their
+    # types default to "S" and can be set with partition_key_type /
+    # sort_key_type. "projection" is "ALL" (default) or "KEYS_ONLY".
+    "indexes": {
+        "email-index": {"partition_key": "email"},
+    },
+    # Attribute holding an epoch-seconds expiry; None disables TTL.
+    "ttl_attribute": None,
+    # Hours between exact recounts of the stream-maintained user stats;
+    # 0 disables the schedule.
+    "stats_reconcile_hours": 24,
+}
+
+EXPORT_DEFAULTS = {
+    # Hours between scheduled exports to the export bucket; 0 disables the
+    # schedule (the function can still be invoked by hand).
+    "schedule_hours": 24,
+    # Parallel Scan segments of UserTable, each written to its own file.
+    "table_segments": 4,
+    # Days before export objects are deleted; 0 keeps them.
+    "retention_days": 30,
+}
+
+BILLING_MODES = ("PAY_PER_REQUEST", "PROVISIONED")
+INDEX_KEYS = {"partition_key", "partition_key_type", "sort_key", "sort_key_type", "projection"}
+
+
+def context_value(scope, key, default=None):
+    """Read a context value, decoding JSON passed as a string with ``-c``."""
+    value = scope.node.try_get_context(key)
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            pass
+    return default if value is None else value
+
+
+def function_settings(scope, function_id):
+    """Return the effective settings for the function with the given construct id."""
+    overrides = context_value(scope, "functions", {}).get(function_id, {})
+    unknown = set(overrides) - set(FUNCTION_DEFAULTS)
+    if unknown:
+        raise ValueError(
+            f"Unknown settings for {function_id}: {', '.join(sorted(unknown))}"
+        )
+    return {**FUNCTION_DEFAULTS, **FUNCTION_PRESETS.get(function_id, {}), **overrides}
+
+
+def api_settings(scope):
+    """Return the effective REST API stage settings."""
+    overrides = context_value(scope, "api", {})
+    unknown = set(overrides) - set(API_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown API settings: {', '.join(sorted(unknown))}")
+    if overrides.get("mode", API_DEFAULTS["mode"]) not in ("rest", "http"):
+        raise ValueError(f"Unsupported API mode: {overrides['mode']}")
+    throttling = {**API_DEFAULTS["throttling"], **overrides.get("throttling", {})}
+    return {**API_DEFAULTS, **overrides, "throttling": throttling}
+
+
+def table_settings(scope):
+    """Return the effective UserTable settings."""
+    overrides = context_value(scope, "table", {})
+    unknown = set(overrides) - set(TABLE_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown table settings: {', '.join(sorted(unknown))}")
+    settings = {**TABLE_DEFAULTS, **overrides}
+    if settings["billing_mode"] not in BILLING_MODES:
+        raise ValueError(f"Unsupported billing mode: {settings['billing_mode']}")
+    for name, index in settings["indexes"].items():
+        unknown = set(index) - INDEX_KEYS
+        if unknown or "partition_key" not in index:
+            raise ValueError(f"Invalid settings for index {name}: {', '.join(sorted(unknown)) or 'partition_key missing'}")
+    return settings
+
+
+def export_settings(scope):
+    """Return the effective user export settings."""
+    overrides = context_value(scope, "export", {})
+    unknown = set(overrides) - set(EXPORT_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown export settings: {', '.join(sorted(unknown))}")
+    return {**EXPORT_DEFAULTS, **overrides}
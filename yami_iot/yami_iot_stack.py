@@ -1,37 +1,77 @@
+import os
+
 from aws_cdk import (
+    ArnFormat,
+    AssetHashType,
+    Duration,
     Stack,
     aws_lambda as _lambda,
+    aws_lambda_event_sources as lambda_event_sources,
     aws_cognito as cognito,
     aws_dynamodb as dynamodb,
     aws_iam as iam,
+    aws_s3 as s3,
     aws_apigateway as apigateway,
+    aws_apigatewayv2 as apigatewayv2,
+    aws_apigatewayv2_authorizers as apigatewayv2_authorizers,
+    aws_apigatewayv2_integrations as apigatewayv2_integrations,
+    aws_events as events,
+    aws_events_targets as targets,
     CfnOutput,
     aws_secretsmanager as secretsmanager
 )
 from constructs import Construct
 
+from yami_iot import bundling
+from yami_iot.settings import (
+    api_settings, context_value, export_settings, function_settings, table_settings
+)
+
+RUNTIMES = {
+    runtime.name: runtime
+    for runtime in (
+        _lambda.Runtime.PYTHON_3_9,
+        _lambda.Runtime.PYTHON_3_10,
+        _lambda.Runtime.PYTHON_3_11,
+        _lambda.Runtime.PYTHON_3_12,
+        _lambda.Runtime.PYTHON_3_13,
+    )
+}
+
+ATTRIBUTE_TYPES = {
+    "S": dynamodb.AttributeType.STRING,
+    "N": dynamodb.AttributeType.NUMBER,
+    "B": dynamodb.AttributeType.BINARY,
+}
+
+PROJECTIONS = {
+    "ALL": dynamodb.ProjectionType.ALL,
+    "KEYS_ONLY": dynamodb.ProjectionType.KEYS_ONLY,
+}
+
+ARCHITECTURES = {
+    "x86_64": _lambda.Architecture.X86_64,
+    "arm64": _lambda.Architecture.ARM_64,
+}
+
 class YamiIotStack(Stack):
     def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
+        self._layers = {}
 
         # Create DynamoDB table
-        user_table = dynamodb.Table(
-            self, 'UserTable',
-            partition_key=dynamodb.Attribute(
-                name='userId',
-                type=dynamodb.AttributeType.STRING
-            )
-        )
+        table_config = table_settings(self)
+        user_table = self.user_table(table_config)
 
         # Create Lambda function
         user_sync_lambda = _lambda.Function(
             self, 'UserSyncLambda',
-            runtime=_lambda.Runtime.PYTHON_3_9,
             handler='handler.handler',
-            code=_lambda.Code.from_asset('lambda'),
+            code=self.function_code('UserSyncLambda', 'handler'),
             environment={
                 'USER_TABLE_NAME': user_table.table_name
-            }
+            },
+            **self.function_options('UserSyncLambda')
         )
 
         # Grant DynamoDB permissions to Lambda
@@ -80,6 +120,9 @@ class YamiIotStack(Stack):
             description="Regular users with basic access"
         )
 
+        stats_table = self.user_stats_feed(user_table, user_pool, table_config)
+        export_bucket = self.user_export(user_table, user_pool, export_settings(self))
+
         # Grant Cognito permissions to invoke Lambda
         user_sync_lambda.add_permission(
             'CognitoInvokeLambda',
@@ -87,62 +130,39 @@ class YamiIotStack(Stack):
             source_arn=user_pool.user_pool_arn
         )
 
-        lambda_layer = _lambda.LayerVersion(
-            self, 'LambdaLayer',
-            code=_lambda.Code.from_asset('lambda_layer'),
-            compatible_runtimes=[_lambda.Runtime.PYTHON_3_9]
-        )
-
         my_secret = secretsmanager.Secret.from_secret_name_v2(self, "MySecret", "prod/yami/clientId")
 
         assign_role_lambda = _lambda.Function(
             self, 'AssignRoleLambda',
-            runtime=_lambda.Runtime.PYTHON_3_9,
             handler='assign_role.handler',
-            code=_lambda.Code.from_asset('lambda'),
+            code=self.function_code('AssignRoleLambda', 'assign_role'),
             environment={
-                'USER_POOL_ID': user_pool.user_pool_id
+                'USER_POOL_ID': user_pool.user_pool_id,
+                'USER_TABLE_NAME': user_table.table_name
             },
-            layers=[lambda_layer]
+            layers=[self.function_layer('AssignRoleLambda', 'assign_role')],
+            **self.function_options('AssignRoleLambda')
         )
 
         # Grant permission to Lambda for Cognito user management
         assign_role_lambda.add_to_role_policy(iam.PolicyStatement(
-            actions=["cognito-idp:AdminAddUserToGroup"],
+            actions=["cognito-idp:AdminAddUserToGroup", "cognito-idp:AdminGetUser"],
             resources=[user_pool.user_pool_arn]
         ))
+        # Roles are mirrored onto the user's item for the stats stream.
+        user_table.grant_write_data(assign_role_lambda)
         my_secret.grant_read(assign_role_lambda)
+        assign_role_target = self.live_target(assign_role_lambda)
 
-        authorizer = apigateway.CognitoUserPoolsAuthorizer(
-            self, "APIAuthorizer",
-            cognito_user_pools=[user_pool]
-        )
-
-
-        api = apigateway.RestApi(self, "UserManagementAPI",
-            rest_api_name="User Management Service",
-            description="API for managing users and roles"
-        )
-
-        # Create API resource for assigning roles
-        assign_role_resource = api.root.add_resource("assign-role")
-        assign_role_resource.add_method(
-            "POST",
-            apigateway.LambdaIntegration(assign_role_lambda),
-            authorization_type=apigateway.AuthorizationType.COGNITO,
-            authorizer=authorizer,
-            )
-
-        
         fetch_users_lambda = _lambda.Function(
             self, 'FetchUsersLambda',
-            runtime=_lambda.Runtime.PYTHON_3_9,
             handler='fetch_users.handler',
-            code=_lambda.Code.from_asset('lambda'),
+            code=self.function_code('FetchUsersLambda', 'fetch_users'),
             environment={
                 'USER_POOL_ID': user_pool.user_pool_id
             },
-            layers=[lambda_layer]
+            layers=[self.function_layer('FetchUsersLambda', 'fetch_users')],
+            **self.function_options('FetchUsersLambda')
         )
 
         fetch_users_lambda.add_to_role_policy(iam.PolicyStatement(
@@ -150,15 +170,454 @@ class YamiIotStack(Stack):
             resources=[user_pool.user_pool_arn]
         ))
         my_secret.grant_read(fetch_users_lambda)
-        
-        fetch_users_resource = api.root.add_resource("fetch-users")
-        fetch_users_resource.add_method(
-            "GET",
-            apigateway.LambdaIntegration(fetch_users_lambda),
-            authorization_type=apigateway.AuthorizationType.COGNITO,
-            authorizer=authorizer
-        )
-        
+        fetch_users_target = self.live_target(fetch_users_lambda)
+
+        routes = {
+            "/assign-role/POST": assign_role_target,
+            "/fetch-users/GET": fetch_users_target,
+        }
+        admin_functions = [assign_role_lambda, fetch_users_lambda]
+
+        # Email lookups need an index keyed on email; without one the
+        # endpoint is left out rather than falling back to scans.
+        email_index = next((
+            name for name, index in table_config["indexes"].items()
+            if index["partition_key"] == "email"
+        ), None)
+        if email_index:
+            user_lookup_lambda = _lambda.Function(
+                self, 'UserLookupLambda',
+                handler='user_lookup.handler',
+                code=self.function_code('UserLookupLambda', 'user_lookup'),
+                environment={
+                    'USER_POOL_ID': user_pool.user_pool_id,
+                    'USER_TABLE_NAME': user_table.table_name,
+                    'EMAIL_INDEX_NAME': email_index
+                },
+                layers=[self.function_layer('UserLookupLambda', 'user_lookup')],
+                **self.function_options('UserLookupLambda')
+            )
+            user_table.grant_read_data(user_lookup_lambda)
+            my_secret.grant_read(user_lookup_lambda)
+            user_lookup_target = self.live_target(user_lookup_lambda)
+            routes["/users/by-email/GET"] = user_lookup_target
+            routes["/users/by-email/POST"] = user_lookup_target
+            admin_functions.append(user_lookup_lambda)
+
+        fetch_stats_lambda = _lambda.Function(
+            self, 'FetchStatsLambda',
+            handler='fetch_stats.handler',
+            code=self.function_code('FetchStatsLambda', 'fetch_stats'),
+            environment={
+                'USER_POOL_ID': user_pool.user_pool_id,
+                'STATS_TABLE_NAME': stats_table.table_name
+            },
+            layers=[self.function_layer('FetchStatsLambda', 'fetch_stats')],
+            **self.function_options('FetchStatsLambda')
+        )
+        stats_table.grant_read_data(fetch_stats_lambda)
+        my_secret.grant_read(fetch_stats_lambda)
+        routes["/user-stats/GET"] = self.live_target(fetch_stats_lambda)
+        admin_functions.append(fetch_stats_lambda)
+
+        # Both API modes validate the token in their authorizer, so the
+        # handlers use the claims it forwards instead of decoding it again.
+        for function in admin_functions:
+            function.add_environment('TRUST_AUTHORIZER_CLAIMS', 'true')
+
+        api_config = api_settings(self)
+        if api_config["mode"] == "http":
+            api_url = self.http_api(api_config, user_pool, user_pool_client, routes)
+        else:
+            api_url = self.rest_api(api_config, user_pool, assign_role_lambda, routes)
+
         CfnOutput(self, "UserPoolId", value=user_pool.user_pool_id)
         CfnOutput(self, "UserPoolClientId", value=user_pool_client.user_pool_client_id)
-        CfnOutput(self, "ApiEndpoint", value=api.url)
\ No newline at end of file
+        CfnOutput(self, "ApiEndpoint", value=api_url)
+        CfnOutput(self, "ExportBucketName", value=export_bucket.bucket_name)
+
+    def user_table(self, table_config: dict) -> dynamodb.Table:
+        """UserTable with the configured billing mode, autoscaling, indexes and TTL."""
+        provisioned = table_config["billing_mode"] == "PROVISIONED"
+        capacity = {
+            "read_capacity": table_config["read_capacity"],
+            "write_capacity": table_config["write_capacity"],
+        } if provisioned else {}
+
+        table = dynamodb.Table(
+            self, 'UserTable',
+            partition_key=dynamodb.Attribute(
+                name='userId',
+                type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode[table_config["billing_mode"]],
+            time_to_live_attribute=table_config["ttl_attribute"],
+            # Feeds the stats consumer; see user_stats_feed().
+            stream=dynamodb.StreamViewType.NEW_AND_OLD_IMAGES,
+            **capacity
+        )
+
+        for name, index in table_config["indexes"].items():
+            sort_key = None
+            if index.get("sort_key"):
+                sort_key = dynamodb.Attribute(
+                    name=index["sort_key"],
+                    type=ATTRIBUTE_TYPES[index.get("sort_key_type", "S")]
+                )
+            table.add_global_secondary_index(
+                index_name=name,
+                partition_key=dynamodb.Attribute(
+                    name=index["partition_key"],
+                    type=ATTRIBUTE_TYPES[index.get("partition_key_type", "S")]
+                ),
+                sort_key=sort_key,
+                projection_type=PROJECTIONS[index.get("projection", "ALL")],
+                **capacity
+            )
+
+        if provisioned:
+            read_scaling = {
+                "min_capacity": table_config["read_capacity"],
+                "max_capacity": table_config["max_read_capacity"],
+            }
+            write_scaling = {
+                "min_capacity": table_config["write_capacity"],
+                "max_capacity": table_config["max_write_capacity"],
+            }
+            scalables = [
+                table.auto_scale_read_capacity(**read_scaling),
+                table.auto_scale_write_capacity(**write_scaling),
+            ]
+            for name in table_config["indexes"]:
+                scalables.append(table.auto_scale_global_secondary_index_read_capacity(name, **read_scaling))
+                scalables.append(table.auto_scale_global_secondary_index_write_capacity(name, **write_scaling))
+            for scalable in scalables:
+                scalable.scale_on_utilization(
+                    target_utilization_percent=table_config["target_utilization"]
+                )
+
+        return table
+
+    def user_stats_feed(self, user_table: dynamodb.Table, user_pool: cognito.UserPool,
+                        table_config: dict) -> dynamodb.Table:
+        """Stats table kept up to date from the UserTable stream.
+
+        A consumer function folds every batch of item changes into one
+        summary item (users, unassigned users, users per role, sign-ups per
+        day), so dashboards read the counts with a single GetItem. A
+        scheduled function recounts them exactly from a full scan and the
+        user pool's groups.
+        """
+        stats_table = dynamodb.Table(
+            self, 'UserStatsTable',
+            partition_key=dynamodb.Attribute(
+                name='statId',
+                type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST
+        )
+
+        stats_stream_lambda = _lambda.Function(
+            self, 'StatsStreamLambda',
+            handler='stats_stream.handler',
+            code=self.function_code('StatsStreamLambda', 'stats_stream'),
+            environment={
+                'STATS_TABLE_NAME': stats_table.table_name
+            },
+            **self.function_options('StatsStreamLambda')
+        )
+        stats_table.grant_read_write_data(stats_stream_lambda)
+        stats_stream_lambda.add_event_source(lambda_event_sources.DynamoEventSource(
+            user_table,
+            starting_position=_lambda.StartingPosition.TRIM_HORIZON,
+            batch_size=100,
+            max_batching_window=Duration.seconds(5),
+            bisect_batch_on_error=True,
+            retry_attempts=5
+        ))
+
+        if table_config["stats_reconcile_hours"]:
+            reconcile_lambda = _lambda.Function(
+                self, 'ReconcileStatsLambda',
+                handler='reconcile_stats.handler',
+                code=self.function_code('ReconcileStatsLambda', 'reconcile_stats'),
+                environment={
+                    'USER_POOL_ID': user_pool.user_pool_id,
+                    'USER_TABLE_NAME': user_table.table_name,
+                    'STATS_TABLE_NAME': stats_table.table_name
+                },
+                **self.function_options('ReconcileStatsLambda')
+            )
+            reconcile_lambda.add_to_role_policy(iam.PolicyStatement(
+                actions=["cognito-idp:ListGroups", "cognito-idp:ListUsersInGroup"],
+                resources=[user_pool.user_pool_arn]
+            ))
+            user_table.grant_read_data(reconcile_lambda)
+            stats_table.grant_write_data(reconcile_lambda)
+            events.Rule(
+                self, 'ReconcileStatsSchedule',
+                schedule=events.Schedule.rate(Duration.hours(table_config["stats_reconcile_hours"])),
+                targets=[targets.LambdaFunction(reconcile_lambda)]
+            )
+
+        return stats_table
+
+    def user_export(self, user_table: dynamodb.Table, user_pool: cognito.UserPool,
+                    export_config: dict) -> s3.Bucket:
+        """Bucket and function exporting every user as newline-delimited JSON.
+
+        The function streams UserTable (parallel Scan segments) and the user
+        pool (ListUsers pages) into multipart uploads and checkpoints as it
+        goes; see lambda/export_users.py.
+        """
+        lifecycle_rules = [s3.LifecycleRule(abort_incomplete_multipart_upload_after=Duration.days(7))]
+        if export_config["retention_days"]:
+            lifecycle_rules.append(s3.LifecycleRule(expiration=Duration.days(export_config["retention_days"])))
+        bucket = s3.Bucket(
+            self, 'ExportBucket',
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            encryption=s3.BucketEncryption.S3_MANAGED,
+            enforce_ssl=True,
+            lifecycle_rules=lifecycle_rules
+        )
+
+        export_lambda = _lambda.Function(
+            self, 'ExportUsersLambda',
+            handler='export_users.handler',
+            code=self.function_code('ExportUsersLambda', 'export_users'),
+            environment={
+                'USER_POOL_ID': user_pool.user_pool_id,
+                'USER_TABLE_NAME': user_table.table_name,
+                'EXPORT_BUCKET': bucket.bucket_name,
+                'EXPORT_SEGMENTS': str(export_config["table_segments"])
+            },
+            **self.function_options('ExportUsersLambda')
+        )
+        user_table.grant_read_data(export_lambda)
+        bucket.grant_read_write(export_lambda)
+        export_lambda.add_to_role_policy(iam.PolicyStatement(
+            actions=["cognito-idp:ListUsers"],
+            resources=[user_pool.user_pool_arn]
+        ))
+        # A run that nears the timeout re-invokes itself to resume. The
+        # function's own ARN would make the role depend on the function, so
+        # the grant matches its generated name instead.
+        export_lambda.add_to_role_policy(iam.PolicyStatement(
+            actions=["lambda:InvokeFunction"],
+            resources=[self.format_arn(
+                service="lambda",
+                resource="function",
+                resource_name=f"{self.stack_name}-ExportUsersLambda*",
+                arn_format=ArnFormat.COLON_RESOURCE_NAME
+            )]
+        ))
+
+        if export_config["schedule_hours"]:
+            events.Rule(
+                self, 'ExportUsersSchedule',
+                schedule=events.Schedule.rate(Duration.hours(export_config["schedule_hours"])),
+                targets=[targets.LambdaFunction(export_lambda)]
+            )
+        return bucket
+
+    def rest_api(self, api_config, user_pool, assign_role_lambda, routes) -> str:
+        """REST API guarded by the Cognito authorizer, with the cached stage. Returns its URL.
+
+        ``routes`` maps "/path/METHOD" to the function serving it.
+        """
+        authorizer = apigateway.CognitoUserPoolsAuthorizer(
+            self, "APIAuthorizer",
+            cognito_user_pools=[user_pool]
+        )
+
+        cache_ttl = api_config["fetch_users_cache_ttl"]
+        api = apigateway.RestApi(self, "UserManagementAPI",
+            rest_api_name="User Management Service",
+            description="API for managing users and roles",
+            deploy_options=self.stage_options(api_config, routes)
+        )
+
+        if cache_ttl:
+            # Role changes alter what /fetch-users returns, so assign_role
+            # flushes the stage cache after each one.
+            assign_role_lambda.add_environment('REST_API_ID', api.rest_api_id)
+            assign_role_lambda.add_environment('STAGE_NAME', api_config["stage_name"])
+            assign_role_lambda.add_to_role_policy(iam.PolicyStatement(
+                actions=["apigateway:DELETE"],
+                resources=[
+                    f"arn:{self.partition}:apigateway:{self.region}::/restapis/"
+                    f"{api.rest_api_id}/stages/{api_config['stage_name']}/cache/data"
+                ]
+            ))
+
+        for route, target in routes.items():
+            path, method = route.rsplit('/', 1)
+            cache_key_parameters, request_parameters = None, None
+            if route == "/fetch-users/GET":
+                # Cached per caller: the handler decides what a token may see.
+                cache_key_parameters = ["method.request.header.Authorization"]
+                request_parameters = {"method.request.header.Authorization": True}
+            api.root.resource_for_path(path).add_method(
+                method,
+                apigateway.LambdaIntegration(target, cache_key_parameters=cache_key_parameters),
+                authorization_type=apigateway.AuthorizationType.COGNITO,
+                authorizer=authorizer,
+                request_parameters=request_parameters
+            )
+
+        return api.url
+
+    def http_api(self, api_config, user_pool, user_pool_client, routes) -> str:
+        """HTTP API guarded by a JWT authorizer on the user pool. Returns its URL.
+
+        HTTP APIs have no response cache; throttling is applied per route.
+        """
+        authorizer = apigatewayv2_authorizers.HttpUserPoolAuthorizer(
+            "APIAuthorizer", user_pool,
+            user_pool_clients=[user_pool_client]
+        )
+        api = apigatewayv2.HttpApi(self, "UserManagementHttpAPI",
+            api_name="User Management Service",
+            description="API for managing users and roles",
+            default_authorizer=authorizer
+        )
+        for route, target in routes.items():
+            path, method = route.rsplit('/', 1)
+            # "/users/by-email/GET" -> "UsersByEmailGetIntegration"
+            integration_id = "".join(
+                word.title() for word in route.replace('-', '/').split('/')
+            ) + "Integration"
+            api.add_routes(
+                path=path,
+                methods=[apigatewayv2.HttpMethod[method]],
+                integration=apigatewayv2_integrations.HttpLambdaIntegration(integration_id, target)
+            )
+
+        route_settings = {}
+        for path, limits in api_config["throttling"].items():
+            if path not in routes:
+                continue
+            resource, method = path.rsplit('/', 1)
+            route_settings[f"{method} {resource}"] = {
+                "ThrottlingRateLimit": limits["rate_limit"],
+                "ThrottlingBurstLimit": limits["burst_limit"],
+            }
+        api.default_stage.node.default_child.add_property_override("RouteSettings", route_settings)
+        return api.url
+
+    def stage_options(self, api_config: dict, routes: dict) -> apigateway.StageOptions:
+        """Deployment stage with per-method throttling and the /fetch-users cache."""
+        method_options = {
+            path: apigateway.MethodDeploymentOptions(
+                throttling_rate_limit=limits["rate_limit"],
+                throttling_burst_limit=limits["burst_limit"]
+            )
+            for path, limits in api_config["throttling"].items()
+            if path in routes
+        }
+        cache_ttl = api_config["fetch_users_cache_ttl"]
+        if cache_ttl:
+            limits = api_config["throttling"].get("/fetch-users/GET", {})
+            method_options["/fetch-users/GET"] = apigateway.MethodDeploymentOptions(
+                caching_enabled=True,
+                cache_ttl=Duration.seconds(cache_ttl),
+                throttling_rate_limit=limits.get("rate_limit"),
+                throttling_burst_limit=limits.get("burst_limit")
+            )
+        return apigateway.StageOptions(
+            stage_name=api_config["stage_name"],
+            cache_cluster_enabled=bool(cache_ttl),
+            cache_cluster_size=api_config["cache_cluster_size"] if cache_ttl else None,
+            method_options=method_options
+        )
+
+    def function_options(self, function_id: str) -> dict:
+        """Runtime, architecture and sizing keyword arguments for a function."""
+        settings = function_settings(self, function_id)
+        if settings["runtime"] not in RUNTIMES:
+            raise ValueError(f"Unsupported runtime for {function_id}: {settings['runtime']}")
+        if settings["architecture"] not in ARCHITECTURES:
+            raise ValueError(f"Unsupported architecture for {function_id}: {settings['architecture']}")
+        return {
+            "runtime": RUNTIMES[settings["runtime"]],
+            "architecture": ARCHITECTURES[settings["architecture"]],
+            "memory_size": settings["memory_size"],
+            "timeout": Duration.seconds(settings["timeout"]),
+            "reserved_concurrent_executions": settings["reserved_concurrency"],
+        }
+
+    def function_code(self, function_id: str, module_name: str) -> _lambda.Code:
+        """Code asset holding only the function's handler and the modules it imports.
+
+        Assets are hashed by content, so a function is only re-uploaded when
+        its own files change.
+        """
+        return _lambda.Code.from_asset(
+            bundling.build_function_code(function_id, module_name),
+            asset_hash_type=AssetHashType.SOURCE
+        )
+
+    def function_layer(self, function_id: str, module_name: str) -> _lambda.LayerVersion:
+        """The dependency layer for a function, built for its runtime and architecture.
+
+        By default each function gets a slim layer traced from its handler
+        module's imports. With ``slim_layer`` off, functions on the same
+        runtime/architecture pair share one full layer.
+        """
+        settings = function_settings(self, function_id)
+        options = self.function_options(function_id)
+        target = (settings["runtime"], settings["architecture"])
+        asset = bundling.build_layer(
+            *target,
+            fetch_native=context_value(self, "layer_native_wheels", True)
+        )
+
+        if settings["slim_layer"]:
+            key, layer_id = function_id, f'{function_id}Layer'
+        else:
+            key = target
+            layer_id = 'LambdaLayer' + bundling.layer_tag(*target).title().replace('.', '').replace('-', '')
+
+        if key not in self._layers:
+            if settings["slim_layer"]:
+                asset = bundling.build_function_layer(
+                    function_id, module_name, os.path.join(asset, 'python'), settings["runtime"]
+                )
+            self._layers[key] = _lambda.LayerVersion(
+                self, layer_id,
+                code=_lambda.Code.from_asset(asset),
+                compatible_runtimes=[options["runtime"]],
+                compatible_architectures=[options["architecture"]]
+            )
+        return self._layers[key]
+
+    def live_target(self, function: _lambda.Function) -> _lambda.IFunction:
+        """Return what callers should invoke for the function.
+
+        With provisioned concurrency configured this is a "live" alias on the
+        current version, otherwise the function itself. A scheduled warm-up
+        ping is attached to the same target when enabled.
+        """
+        function_id = function.node.id
+        settings = function_settings(self, function_id)
+
+        target = function
+        if settings["provisioned_concurrency"]:
+            target = _lambda.Alias(
+                self, f'{function_id}LiveAlias',
+                alias_name='live',
+                version=function.current_version,
+                provisioned_concurrent_executions=settings["provisioned_concurrency"]
+            )
+
+        if settings["warm_ping_minutes"]:
+            events.Rule(
+                self, f'{function_id}WarmPing',
+                schedule=events.Schedule.rate(Duration.minutes(settings["warm_ping_minutes"])),
+                targets=[targets.LambdaFunction(
+                    target,
+                    event=events.RuleTargetInput.from_object({"warmup": True})
+                )]
+            )
+
+        return target